@@ -1,11 +1,36 @@
 import os
 import subprocess
 import platform
+import time
 from pathlib import Path
+from agent.utils.concurrency import stage_limit
+from agent.utils.log_utils import read_log_tail, ANALYSIS_TAIL_LINES
+from agent.utils.tracing import span
 
 _last_error = ""
+_attempt_timings = []
+# Whether a build in this process ran in fast mode, i.e. may have left a daemon running
+_daemon_used = False
 MAX_ATTEMPTS = 3
 LOG_FILE = "gradle_build.log"
+ERROR_TAIL_LINES = ANALYSIS_TAIL_LINES
+
+# "full": cold `clean build test --debug` every attempt (historical behaviour).
+# "fast": incremental build on a warm daemon with build/configuration cache;
+#         verbose logging only on the re-run that diagnoses a failure.
+BUILD_MODE = os.getenv("GRADLE_BUILD_MODE", "full")
+FULL_TASKS = ["clean", "build", "test"]
+FAST_TASKS = ["build"]
+FULL_FLAGS = ["--stacktrace", "--debug"]
+FAST_FLAGS = ["--daemon", "--build-cache", "--parallel", "--stacktrace"]
+DIAGNOSE_FLAGS = ["--info"]
+CONFIGURATION_CACHE_FLAG = "--configuration-cache"
+# Task run per project when only part of a reactor is re-verified
+TARGETED_TASK = "build"
+
+# Projects whose build scripts turned out to be incompatible with the configuration cache
+_no_configuration_cache = set()
+
 
 def ensure_gradle_wrapper(path):
     gradlew_name = "gradlew.bat" if platform.system() == "Windows" else "gradlew"
@@ -14,7 +39,8 @@ def ensure_gradle_wrapper(path):
     if not gradlew_path.exists():
         print("📦 Gradle wrapper not found. Generating...")
         try:
-            result = subprocess.run(["gradle", "wrapper"], cwd=path, check=True, capture_output=True, text=True)
+            with span("gradle wrapper", "subprocess"):
+                result = subprocess.run(["gradle", "wrapper"], cwd=path, check=True, capture_output=True, text=True)
             print(result.stdout)
             if not gradlew_path.exists():
                 raise RuntimeError("Gradle wrapper generation failed: gradlew not found.")
@@ -22,44 +48,88 @@ def ensure_gradle_wrapper(path):
             raise RuntimeError(f"Failed to generate Gradle wrapper:\n{e.stderr.strip()}")
 
     if platform.system() != "Windows":
-        subprocess.run(["chmod", "+x", str(gradlew_path)], check=True)
+        with span("chmod gradlew", "subprocess"):
+            subprocess.run(["chmod", "+x", str(gradlew_path)], check=True)
 
     return gradlew_path
 
 
-def run_gradle_tasks(path="repo", tasks=None):
+def _gradle_args(path, tasks, mode, diagnose):
+    if mode != "fast":
+        return tasks + FULL_FLAGS
+
+    flags = list(FAST_FLAGS)
+    if os.path.abspath(path) not in _no_configuration_cache:
+        flags.append(CONFIGURATION_CACHE_FLAG)
+    if diagnose:
+        flags += DIAGNOSE_FLAGS
+    return tasks + flags
+
+
+def _configuration_cache_rejected(output):
+    output = output.lower()
+    return "configuration cache problem" in output or "unknown command-line option '--configuration-cache'" in output
+
+
+def record_build_mode(mode):
+    """Notes a build about to run in `mode`, so stop_gradle_daemon() knows whether a daemon may be up."""
+    global _daemon_used
+    _daemon_used = _daemon_used or mode == "fast"
+
+
+def run_gradle_tasks(path="repo", tasks=None, mode=None):
     global _last_error
-    tasks = tasks or ["clean", "build", "test"]
+    mode = mode or BUILD_MODE
+    record_build_mode(mode)
+    tasks = tasks or (FAST_TASKS if mode == "fast" else FULL_TASKS)
     gradlew = ensure_gradle_wrapper(path)
+    log_file = Path(path) / LOG_FILE
+    diagnose = False
 
     for attempt in range(1, MAX_ATTEMPTS + 1):
-        print(f"🔧 Attempt {attempt}: Running `{gradlew} {' '.join(tasks)}`...")
+        args = _gradle_args(path, tasks, mode, diagnose)
+        print(f"🔧 Attempt {attempt}: Running `{gradlew} {' '.join(args)}`...")
+        start = time.perf_counter()
         try:
-            result = subprocess.run(
-                ["./gradlew"] + tasks + ["--stacktrace", "--debug"],
-                cwd=path,
-                capture_output=True,
-                text=True
-            )
-
-            log_file = Path(path) / LOG_FILE
-            print(f"📄 Writing log to: {log_file}")
-            with open(log_file, "w") as log:
-                log.write(result.stdout)
-                log.write("\n--- STDERR ---\n")
-                log.write(result.stderr)
+            # Output goes straight to the log file; only a bounded tail is ever held in memory
+            print(f"📄 Streaming log to: {log_file}")
+            with open(log_file, "wb") as log, stage_limit("build"), \
+                    span("gradle build", "subprocess", attempt=attempt, mode=mode, args=" ".join(args)):
+                result = subprocess.run(
+                    ["./gradlew"] + args,
+                    cwd=path,
+                    stdout=log,
+                    stderr=subprocess.STDOUT
+                )
+            elapsed = time.perf_counter() - start
+            _attempt_timings.append({"mode": mode, "attempt": attempt, "args": args, "seconds": elapsed,
+                                     "success": result.returncode == 0})
+            print(f"⏱️ Attempt {attempt} ({mode} mode) took {elapsed:.2f}s")
+
+            tail = read_log_tail(log_file, ERROR_TAIL_LINES)
 
             # PRINT THE ERROR TO CONSOLE
-            print("🔍 Short STDERR:")
-            print(result.stderr[:500])  # print only first 500 chars
+            print("🔍 Output tail:")
+            print(tail[-500:])  # print only last 500 chars
 
             if result.returncode == 0:
                 print("✅ Gradle tasks completed successfully.")
                 return True
 
-            else:
-                print(f"❌ Task failed. Retrying... ({attempt}/{MAX_ATTEMPTS})")
-                _last_error = result.stderr + "\n" + result.stdout
+            _last_error = tail
+            if mode == "fast":
+                if CONFIGURATION_CACHE_FLAG in args and _configuration_cache_rejected(_last_error):
+                    print("ℹ️ Build is not configuration-cache compatible. Retrying without it...")
+                    _no_configuration_cache.add(os.path.abspath(path))
+                elif diagnose:
+                    # Re-running an unchanged, already diagnosed build cannot change the outcome
+                    break
+                else:
+                    print("ℹ️ Re-running with --info to capture diagnostics...")
+                    diagnose = True
+                continue
+
+            print(f"❌ Task failed. Retrying... ({attempt}/{MAX_ATTEMPTS})")
 
         except Exception as e:
             _last_error = f"Exception during build: {str(e)}"
@@ -70,8 +140,48 @@ def run_gradle_tasks(path="repo", tasks=None):
     return False
 
 
-def run_gradle_build(path="repo"):
-    return run_gradle_tasks(path, ["clean", "build", "test"])
+def run_gradle_build(path="repo", mode=None):
+    return run_gradle_tasks(path, mode=mode)
+
+
+def run_project_builds(path="repo", projects=None, mode=None):
+    """
+    Re-verifies only the given Gradle projects (e.g. [':core', ':web']) instead of the
+    whole reactor; callers pass the failing projects plus their dependents (see
+    multi_module.graph). The root project ':' or no projects means a full build.
+    """
+    if not projects or ":" in projects:
+        return run_gradle_build(path, mode)
+    tasks = [f"{project}:{TARGETED_TASK}" for project in projects]
+    print(f"🎯 Verifying {', '.join(projects)}")
+    return run_gradle_tasks(path, tasks, mode)
+
+
+def stop_gradle_daemon(path="repo"):
+    """Stops the Gradle daemon kept warm by fast-mode builds (whatever BUILD_MODE says)."""
+    global _daemon_used
+    if not _daemon_used:
+        return
+    _daemon_used = False
+    try:
+        with span("gradle --stop", "subprocess"):
+            subprocess.run(["./gradlew", "--stop"], cwd=path, capture_output=True, text=True)
+    except Exception as e:
+        print(f"⚠️ Failed to stop Gradle daemon: {e}")
+
+
+def get_attempt_timings():
+    """Returns the wall time of every Gradle attempt run in this process."""
+    return list(_attempt_timings)
+
+
+def print_attempt_timings():
+    if not _attempt_timings:
+        return
+    print("⏱️ Gradle attempt timings:")
+    for timing in _attempt_timings:
+        status = "ok" if timing["success"] else "failed"
+        print(f"   - {timing['mode']} #{timing['attempt']}: {timing['seconds']:.2f}s ({status})")
 
 
 def get_last_error():
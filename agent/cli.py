@@ -0,0 +1,220 @@
+"""
+Command-line entry point, one subcommand per migration stage:
+
+    python -m agent.cli detect   --repo-dir repo
+    python -m agent.cli parse    --repo-dir repo
+    python -m agent.cli generate --repo-dir repo --conventions subprojects
+    python -m agent.cli verify   --repo-dir repo --project :core
+    python -m agent.cli fix      --repo-dir repo --project :core
+    python -m agent.cli publish  --repo-dir repo --branch gradle-migration
+    python -m agent.cli migrate  --repo-dir repo --resume
+
+Agent modules are imported by the command that needs them, so `detect` or `parse`
+never load the OpenAI, GitPython or GitHub client libraries, which take longer to
+import than everything else together (see benchmarks/startup.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
+
+COMMANDS = ("detect", "parse", "generate", "verify", "fix", "publish", "migrate")
+
+
+def _pom_path(repo_dir):
+    pom_path = os.path.join(repo_dir, "pom.xml")
+    if not os.path.exists(pom_path):
+        sys.exit(f"❌ No pom.xml in {repo_dir}")
+    return pom_path
+
+
+def cmd_detect(args):
+    from agent.multi_module import detector
+
+    pom_path = _pom_path(args.repo_dir)
+    modules = detector.detect_modules(pom_path)
+    main_class = detector.extract_main_class(pom_path, os.path.join(args.repo_dir, "src", "main", "java"))
+    if args.json:
+        print(json.dumps({"multi_module": bool(modules), "modules": modules, "main_class": main_class}, indent=2))
+        return 0
+    if modules:
+        print(f"📦 Multi-module Maven project with {len(modules)} module(s): {', '.join(modules)}")
+    else:
+        print("📄 Single-module Maven project.")
+    print(f"🎯 Main class: {main_class or 'none found'}")
+    return 0
+
+
+def cmd_parse(args):
+    from agent.multi_module import detector
+
+    pom_path = _pom_path(args.repo_dir)
+    modules = detector.detect_modules(pom_path)
+    # Progress output would corrupt the JSON document on stdout
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        if modules:
+            from agent.multi_module import parser as mm_parser
+            from agent.multi_module.graph import build_graph
+
+            all_modules = {"root": args.repo_dir, **{m: os.path.join(args.repo_dir, m) for m in modules}}
+            data, errors = mm_parser.parse_modules(all_modules, args.workers)
+            result = {"modules": data, "errors": errors, "build_order": build_graph(data).topological_order()}
+        else:
+            from agent.planner import parse_pom
+
+            result = {"modules": {"root": parse_pom(pom_path)}, "errors": {}, "build_order": ["root"]}
+
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        for name, data in result["modules"].items():
+            print(f"📄 {name}: {len(data['deps'])} dependencies, {len(data['props'])} properties")
+        if result["errors"]:
+            print(f"⚠️ {len(result['errors'])} module(s) failed to parse: {sorted(result['errors'])}")
+        print(f"🧭 Build order: {' -> '.join(result['build_order'])}")
+    return 1 if result["errors"] else 0
+
+
+def cmd_generate(args):
+    from agent.multi_module import detector
+
+    pom_path = _pom_path(args.repo_dir)
+    if detector.is_multi_module(pom_path):
+        from agent.multi_module import migrator
+
+        reactor = migrator.migrate_multi_module_project(args.repo_dir, workers=args.workers, catalog=args.catalog,
+                                                        conventions=args.conventions)
+        return 0 if reactor else 1
+
+    from agent import planner
+
+    main_class = detector.extract_main_class(pom_path, os.path.join(args.repo_dir, "src", "main", "java"))
+    planner.write_gradle_files(args.repo_dir, planner.parse_pom(pom_path), main_class)
+    return 0
+
+
+def cmd_verify(args):
+    from agent import builder
+
+    builder.ensure_gradle_wrapper(args.repo_dir)
+    try:
+        success = builder.run_project_builds(args.repo_dir, args.project, args.mode)
+    finally:
+        builder.print_attempt_timings()
+        builder.stop_gradle_daemon(args.repo_dir)
+    return 0 if success else 1
+
+
+def cmd_fix(args):
+    from agent import fix_rules
+    from agent.log_analyzer import analyze_log, failing_projects, project_dir
+    from agent.utils.log_utils import read_log_tail, ANALYSIS_TAIL_LINES
+
+    log_path = os.path.join(args.repo_dir, "gradle_build.log")
+    if not os.path.exists(log_path):
+        sys.exit(f"❌ No gradle_build.log in {args.repo_dir}; run `verify` first")
+    error_log = read_log_tail(log_path, ANALYSIS_TAIL_LINES)
+
+    target = os.path.join(project_dir(args.repo_dir, args.project), "build.gradle") if args.project else None
+    applied, changed = fix_rules.apply_rules(args.repo_dir, error_log, target)
+    if applied and changed:
+        print(f"✅ Changed: {', '.join(changed)}")
+        return 0
+    if args.rules_only:
+        return 1
+
+    from agent import fixer
+
+    # As in a multi-module migration: every project the failure points at, else the root
+    projects = [args.project] if args.project else failing_projects(analyze_log(error_log)) or [":"]
+    changed = False
+    for project in projects:
+        changed = fixer.attempt_fix(args.repo_dir, project) or changed
+    return 0 if changed else 1
+
+
+def cmd_publish(args):
+    from agent import git_handler
+
+    if not git_handler.publish(args.repo_dir, args.branch, squash=args.squash or None):
+        return 1
+    opened = git_handler.open_pull_request(args.branch, args.base_branch, "Migrate to Gradle",
+                                           "Automated migration.")
+    return 0 if opened else 1
+
+
+def cmd_migrate(args):
+    from agent.planner import run_migration
+
+    return 0 if run_migration(args.repo_dir, args.branch, args.base_branch, resume=args.resume) else 1
+
+
+def build_parser():
+    from agent.multi_module.conventions import MODES as CONVENTION_MODES
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--repo-dir", default="repo", help="Workspace holding the repository")
+
+    parser = argparse.ArgumentParser(description="Migrate a Maven repository to Gradle.")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    detect = commands.add_parser("detect", parents=[common], help="Report modules and the main class")
+    detect.add_argument("--json", action="store_true", help="Print the result as JSON")
+    detect.set_defaults(func=cmd_detect)
+
+    parse = commands.add_parser("parse", parents=[common], help="Parse every POM and print the build order")
+    parse.add_argument("--json", action="store_true", help="Print the parsed data as JSON")
+    parse.add_argument("--workers", type=int, help="POM parser processes (default: PARSE_WORKERS)")
+    parse.set_defaults(func=cmd_parse)
+
+    generate = commands.add_parser("generate", parents=[common], help="Write the Gradle build files")
+    generate.add_argument("--workers", type=int, help="POM parser processes (default: PARSE_WORKERS)")
+    generate.add_argument("--catalog", action="store_true", default=None,
+                          help="Use gradle/libs.versions.toml (default: GRADLE_VERSION_CATALOG)")
+    generate.add_argument("--conventions", choices=CONVENTION_MODES,
+                          help="Where shared module configuration goes (default: GRADLE_CONVENTIONS)")
+    generate.set_defaults(func=cmd_generate)
+
+    verify = commands.add_parser("verify", parents=[common], help="Run the Gradle build")
+    verify.add_argument("--project", action="append",
+                        help="Build only this Gradle project (repeatable, e.g. --project :core)")
+    verify.add_argument("--mode", choices=("full", "fast"), help="Build mode (default: GRADLE_BUILD_MODE)")
+    verify.set_defaults(func=cmd_verify)
+
+    fix = commands.add_parser("fix", parents=[common], help="Fix the last failed build (rules, then OpenAI)")
+    fix.add_argument("--project",
+                     help="Gradle path of the failing project (default: the failing projects in the log, else root)")
+    fix.add_argument("--rules-only", action="store_true", help="Do not ask OpenAI when no rule matches")
+    fix.set_defaults(func=cmd_fix)
+
+    for name, help_text, func in (("publish", "Push the migration branch and open the pull request", cmd_publish),
+                                  ("migrate", "Run the whole migration (clone to pull request)", cmd_migrate)):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument("--branch", default=os.getenv("FEATURE_BRANCH_NAME", "gradle-migration"))
+        command.add_argument("--base-branch", default=os.getenv("BASE_BRANCH_NAME", "main"))
+        command.set_defaults(func=func)
+    commands.choices["publish"].add_argument("--squash", action="store_true",
+                                             help="Squash the migration commits (default: PUBLISH_SQUASH)")
+    commands.choices["migrate"].add_argument("--resume", action="store_true",
+                                             help="Continue an interrupted migration from its last completed stage")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # `main.py [--repo-dir DIR] [--resume]` predates the subcommands and means migrate
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["migrate", *argv]
+
+    # .env is read once, before any module takes its settings from the environment
+    from agent import config
+    config.load()
+
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
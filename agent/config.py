@@ -1,8 +1,24 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+_loaded = False
+
+
+def load():
+    """
+    Loads environment variables from the .env file, once per process; variables
+    already set in the environment win. Modules that read settings at import time
+    call this first, so it does not matter which of them is imported first.
+    """
+    global _loaded
+    if _loaded:
+        return
+    # Imported here so commands that never read settings do not pay for it
+    from dotenv import load_dotenv
+    load_dotenv()
+    _loaded = True
+
+
+load()
 
 # OpenAI & GitHub credentials (must be set in .env)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -16,4 +32,4 @@ REPO_FULL_NAME = f"{REPO_OWNER}/{REPO_NAME}"
 
 # Branch configuration
 FEATURE_BRANCH = os.getenv("FEATURE_BRANCH_NAME", "gradle-migration")
-BASE_BRANCH = os.getenv("BASE_BRANCH_NAME", "main")
\ No newline at end of file
+BASE_BRANCH = os.getenv("BASE_BRANCH_NAME", "main")
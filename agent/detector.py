@@ -1,5 +1,6 @@
 import os
-from lxml import etree
+from agent.pom_model import load_pom
+from agent.utils.source_scanner import find_main_class
 
 def is_multi_module(pom_path):
     """
@@ -8,17 +9,13 @@ def is_multi_module(pom_path):
     if not os.path.exists(pom_path):
         return False
 
-    tree = etree.parse(pom_path)
-    root = tree.getroot()
-    ns = root.nsmap.get(None)
-    nsmap = {"m": ns} if ns else {}
-
-    return bool(root.xpath("//m:modules/m:module", namespaces=nsmap))
+    return bool(load_pom(pom_path).modules)
 
 def extract_main_class(pom_path, src_dir):
     """
-    Tries to infer the fully qualified main class name from pom.xml and source path.
-    This is a naive implementation — it looks for a class with a `public static void main`.
+    Infers the fully qualified main class name from the source path.
+    Looks for a class with a `public static void main`, preferring @SpringBootApplication
+    classes, and reads the real `package` declaration (see agent.utils.source_scanner).
 
     Args:
         pom_path (str): Path to pom.xml (not used yet).
@@ -27,20 +24,4 @@ def extract_main_class(pom_path, src_dir):
     Returns:
         str or None: Fully qualified main class name
     """
-    if not os.path.isdir(src_dir):
-        return None
-
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(".java"):
-                path = os.path.join(root, file)
-                try:
-                    with open(path, "r") as f:
-                        content = f.read()
-                        if "public static void main" in content:
-                            rel_path = os.path.relpath(path, src_dir)
-                            class_name = rel_path.replace("/", ".").replace("\\", ".").replace(".java", "")
-                            return class_name
-                except Exception:
-                    continue
-    return None
\ No newline at end of file
+    return find_main_class(src_dir)
@@ -0,0 +1,247 @@
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from agent.pom_model import load_pom
+from agent.utils.version_index import M2_REPOSITORY
+
+PLACEHOLDER_RE = re.compile(r"\$\{([^}]+)\}")
+
+# Parents outside the repository whose managed versions are known without fetching them:
+# every org.springframework.boot artifact shares the Boot release version.
+BOOT_GROUP = "org.springframework.boot"
+BOOT_VERSION_SOURCES = {"spring-boot-starter-parent", "spring-boot-dependencies", "spring-boot-parent"}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class EffectivePom:
+    """
+    A pom.xml merged with its parent chain, with every ${...} resolved that can be.
+
+    Attributes:
+        path (str): Absolute path to the pom.xml.
+        group_id, artifact_id, version (str): Coordinates, inherited where omitted.
+        parent_chain (list): Paths of the resolved parent POMs, nearest first.
+        properties (dict): Inherited and own <properties>, interpolated.
+        dependencies (list): (groupId, artifactId, version, scope) tuples, inherited
+            and own, with versions interpolated and filled from dependencyManagement.
+        dependency_management (dict): "groupId:artifactId" -> version, interpolated.
+        plugin_management (dict): "groupId:artifactId" -> version, interpolated.
+        build_plugins (list): Inherited and own plugins; the child wins per groupId:artifactId.
+        modules (list): The POM's own <modules> (never inherited).
+        boot_version (str): Spring Boot version implied by a Boot parent or BOM import.
+    """
+    path: str
+    group_id: str = None
+    artifact_id: str = None
+    version: str = None
+    parent_chain: list = field(default_factory=list)
+    properties: dict = field(default_factory=dict)
+    dependencies: list = field(default_factory=list)
+    dependency_management: dict = field(default_factory=dict)
+    plugin_management: dict = field(default_factory=dict)
+    build_plugins: list = field(default_factory=list)
+    modules: list = field(default_factory=list)
+    boot_version: str = None
+    # Uninterpolated inherited values; children interpolate them against their own properties
+    raw_properties: dict = field(default_factory=dict, repr=False)
+    raw_dependencies: dict = field(default_factory=dict, repr=False)
+    raw_dependency_management: dict = field(default_factory=dict, repr=False)
+    raw_plugin_management: dict = field(default_factory=dict, repr=False)
+
+
+class Interpolator:
+    """
+    Resolves ${...} references recursively against a property map. Each property is
+    resolved at most once; a reference cycle (a -> b -> a) is reported and every
+    placeholder naming a property on the cycle is left as written.
+    """
+
+    def __init__(self, properties):
+        self.properties = properties
+        self.resolved = {}
+        self.cyclic = set()
+
+    def lookup(self, key, resolving=()):
+        if key in self.resolved:
+            return self.resolved[key]
+        if key in resolving:
+            cycle = resolving[resolving.index(key):] + (key,)
+            self.cyclic.update(cycle)
+            print(f"⚠️  Property cycle: {' -> '.join(cycle)}")
+            return None
+        if key.startswith("env."):
+            return os.environ.get(key[4:])
+        raw = self.properties.get(key)
+        if raw is None:
+            return None
+        value = self.interpolate(raw, resolving + (key,))
+        if key in self.cyclic:
+            value = None
+        self.resolved[key] = value
+        return value
+
+    def interpolate(self, text, resolving=()):
+        if not text or "${" not in text:
+            return text
+
+        def replace(match):
+            value = self.lookup(match.group(1).strip(), resolving)
+            return value if value is not None else match.group(0)
+
+        return PLACEHOLDER_RE.sub(replace, text)
+
+
+def _coordinates(ga):
+    group, _, artifact = ga.partition(":")
+    return group, artifact
+
+
+def find_parent_pom(model):
+    """
+    Locates the parent POM the way Maven does offline: <relativePath> (default
+    ../pom.xml) if it declares the expected artifactId, else the local repository.
+
+    Returns:
+        str: Path to the parent pom.xml, or None if the parent is not available locally.
+    """
+    parent = model.parent
+    if not parent or not parent.get("artifactId"):
+        return None
+
+    relative_path = parent.get("relativePath")
+    # An explicit empty <relativePath/> tells Maven to skip the filesystem lookup
+    if relative_path is None or relative_path.strip():
+        candidate = os.path.join(os.path.dirname(model.path), (relative_path or "../pom.xml").strip())
+        if os.path.isdir(candidate):
+            candidate = os.path.join(candidate, "pom.xml")
+        if os.path.isfile(candidate):
+            try:
+                candidate_model = load_pom(candidate)
+                if candidate_model.artifact_id == parent["artifactId"]:
+                    return candidate_model.path
+            except Exception as e:
+                print(f"⚠️  Could not read parent POM {candidate}: {e}")
+
+    group, version = parent.get("groupId"), parent.get("version")
+    if group and version and "${" not in version:
+        artifact = parent["artifactId"]
+        installed = os.path.join(M2_REPOSITORY, *group.split("."), artifact, version, f"{artifact}-{version}.pom")
+        if os.path.isfile(installed):
+            return installed
+    return None
+
+
+def _builtin_properties(model, group_id, version):
+    builtins = {
+        "project.groupId": group_id,
+        "project.artifactId": model.artifact_id,
+        "project.version": version,
+        "project.basedir": os.path.dirname(model.path),
+        "basedir": os.path.dirname(model.path)
+    }
+    if model.parent:
+        builtins["project.parent.groupId"] = model.parent.get("groupId")
+        builtins["project.parent.artifactId"] = model.parent.get("artifactId")
+        builtins["project.parent.version"] = model.parent.get("version")
+    # Maven 2 spellings still found in older POMs
+    for key in list(builtins):
+        if key.startswith("project."):
+            builtins["pom." + key[len("project."):]] = builtins[key]
+    return {key: value for key, value in builtins.items() if value is not None}
+
+
+def _merge(model, parent):
+    """Builds the EffectivePom for model on top of its (already resolved) parent."""
+    declared_parent = model.parent or {}
+    group_id = model.group_id or declared_parent.get("groupId") or (parent.group_id if parent else None)
+    version = model.version or declared_parent.get("version") or (parent.version if parent else None)
+
+    effective = EffectivePom(path=model.path, artifact_id=model.artifact_id, modules=list(model.modules))
+    effective.raw_properties = {**(parent.raw_properties if parent else {}), **model.properties}
+    effective.raw_dependencies = dict(parent.raw_dependencies) if parent else {}
+    for group, artifact, dep_version, scope in model.declared_dependencies:
+        effective.raw_dependencies[(group, artifact)] = (group, artifact, dep_version, scope)
+    effective.raw_dependency_management = {**(parent.raw_dependency_management if parent else {}),
+                                           **model.dependency_management}
+    effective.raw_plugin_management = {**(parent.raw_plugin_management if parent else {}),
+                                       **model.plugin_management}
+
+    # Builtins win over same-named <properties>, as in Maven's model interpolation
+    interpolator = Interpolator({**effective.raw_properties,
+                                 **_builtin_properties(model, group_id, version)})
+    interpolate = interpolator.interpolate
+    effective.group_id = interpolate(group_id)
+    effective.version = interpolate(version)
+    effective.parent_chain = [parent.path] + parent.parent_chain if parent else []
+    effective.properties = {key: interpolate(value) for key, value in effective.raw_properties.items()}
+    effective.dependency_management = {interpolate(ga): interpolate(v)
+                                       for ga, v in effective.raw_dependency_management.items()}
+    effective.plugin_management = {interpolate(ga): interpolate(v)
+                                   for ga, v in effective.raw_plugin_management.items()}
+
+    effective.boot_version = parent.boot_version if parent else None
+    if declared_parent.get("groupId") == BOOT_GROUP and declared_parent.get("artifactId") in BOOT_VERSION_SOURCES:
+        effective.boot_version = interpolate(declared_parent.get("version")) or effective.boot_version
+    for ga, managed_version in effective.dependency_management.items():
+        group, artifact = _coordinates(ga)
+        if group == BOOT_GROUP and artifact in BOOT_VERSION_SOURCES:
+            effective.boot_version = managed_version
+
+    for group, artifact, dep_version, scope in effective.raw_dependencies.values():
+        group, artifact = interpolate(group), interpolate(artifact)
+        dep_version = interpolate(dep_version)
+        if not dep_version:
+            dep_version = effective.dependency_management.get(f"{group}:{artifact}")
+        if not dep_version and group == BOOT_GROUP and effective.boot_version:
+            dep_version = effective.boot_version
+        effective.dependencies.append((group, artifact, dep_version, interpolate(scope)))
+
+    plugins = {}
+    for plugin in (parent.build_plugins if parent else []) + model.build_plugins:
+        plugin = dict(plugin)
+        key = f"{interpolate(plugin['groupId'])}:{interpolate(plugin['artifactId'])}"
+        plugin["version"] = interpolate(plugin.get("version")) or effective.plugin_management.get(key)
+        plugin["configuration"] = {k: interpolate(v) for k, v in plugin.get("configuration", {}).items()}
+        plugins[key] = plugin
+    effective.build_plugins = list(plugins.values())
+    return effective
+
+
+def _resolve(pom_path, visiting):
+    model = load_pom(pom_path)
+    if model.path in visiting:
+        print(f"⚠️  Parent cycle detected at {model.path}; ignoring its parent.")
+        parent = None
+    else:
+        parent_path = find_parent_pom(model)
+        parent = _resolve(parent_path, visiting | {model.path}) if parent_path else None
+
+    # load_pom returns the same PomModel until the file changes, and a parent that has not
+    # changed resolves to the same EffectivePom, so identity checks validate the entry
+    with _cache_lock:
+        cached = _cache.get(model.path)
+    if cached and cached[0] is model and cached[1] is parent:
+        return cached[2]
+
+    effective = _merge(model, parent)
+    with _cache_lock:
+        _cache[model.path] = (model, parent, effective)
+    return effective
+
+
+def resolve_effective_pom(pom_path):
+    """
+    Returns the EffectivePom for pom_path. Each POM in the parent chain is resolved
+    once and memoized, so the modules of a reactor share a single resolved parent;
+    entries are rebuilt only when a POM in the chain changes on disk.
+    """
+    return _resolve(pom_path, frozenset())
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -1,12 +1,22 @@
 import os
 import time
-from dotenv import load_dotenv
-import openai
-
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, generated_build_gradle: str, error_log: str) -> str:
+from agent import config
+from agent.utils import llm_cache
+from agent.utils.concurrency import stage_limit
+from agent.utils.tracing import span
+from agent.log_analyzer import summarize_error_log, report_prompt_reduction
+from agent.utils.log_utils import read_log_tail, ANALYSIS_TAIL_LINES
+
+config.load()
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4-0125-preview")
+
+def _openai():
+    """Imported on first use, as in agent.fixer."""
+    import openai
+    openai.api_key = os.getenv("OPENAI_API_KEY")
+    return openai
+
+def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, generated_build_gradle: str, error_log: str, bypass_cache: bool = None) -> str:
     """
     Use OpenAI to fix the gradle_writer.py code so it generates correct build.gradle files.
 
@@ -15,11 +25,13 @@ def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, generated_build_gra
         gradle_writer_code (str): Contents of gradle_writer.py.
         generated_build_gradle (str): The build.gradle file generated by the code.
         error_log (str): Gradle error log caused by the generated build.gradle.
+        bypass_cache (bool): Skip the response cache lookup (defaults to LLM_CACHE_BYPASS).
 
     Returns:
         str: Updated gradle_writer.py content.
     """
     truncated_error_log = "\n".join(error_log.splitlines()[-300:])
+    error_signature = summarize_error_log(error_log)
 
     prompt = f"""
 You are a Gradle and Python build tooling expert.
@@ -47,23 +59,31 @@ The generated build.gradle is:
 The generated build.gradle causes the following Gradle build error:
 
 <error>
-{truncated_error_log}
+{error_signature}
 </error>
 
 Please modify the Python code to ensure it generates a valid build.gradle.
 Only return the full updated gradle_writer.py content, no explanations or markdown.
 """
 
+    messages = [
+        {"role": "system", "content": "You are a Gradle and Python build assistant."},
+        {"role": "user", "content": prompt}
+    ]
+    cached = llm_cache.get(MODEL, messages, bypass=bypass_cache)
+    if cached is not None:
+        print("♻️ gradle_writer.py fix served from cache")
+        return cached
+    report_prompt_reduction(prompt, truncated_error_log, error_signature)
+
     for attempt in range(3):
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4-0125-preview",
-                messages=[
-                    {"role": "system", "content": "You are a Gradle and Python build assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-            )
+            with stage_limit("llm"), span("openai", "llm", model=MODEL, attempt=attempt + 1):
+                response = _openai().chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    temperature=0.2,
+                )
             content = response.choices[0].message.content.strip()
             if content.startswith("```"):
                 lines = content.splitlines()
@@ -71,6 +91,7 @@ Only return the full updated gradle_writer.py content, no explanations or markdo
                 lines = lines[:-1] if lines and lines[-1].endswith("```") else lines
                 content = "\n".join(lines).strip()
             print(f"✅ gradle_writer.py fix received (attempt {attempt + 1})")
+            llm_cache.put(MODEL, messages, content)
             return content
 
         except Exception as e:
@@ -98,8 +119,7 @@ def attempt_fix_gradle_writer(repo_dir: str, agent_dir: str):
     with open(pom_path, "r") as f:
         pom_xml = f.read()
 
-    with open(log_path, "r") as f:
-        error_log = f.read()
+    error_log = read_log_tail(log_path, ANALYSIS_TAIL_LINES)
 
     with open(writer_path, "r") as f:
         gradle_writer_code = f.read()
@@ -0,0 +1,270 @@
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from agent.gradle_writer import FALLBACK_VERSION
+from agent.log_analyzer import analyze_log, failing_projects, format_signature, project_dir
+from agent.pom_model import load_pom
+from agent.utils.output_utils import write_if_changed
+
+# Registered rules, in the order they are tried: (name, function)
+RULES = []
+
+_stats = {"failures": 0, "fixed": 0, "hits": Counter()}
+_stats_lock = threading.Lock()
+
+BOOT_PLUGIN_RE = re.compile(r"^\s*id\s+'org\.springframework\.boot'(?:\s+version\s+'(?P<version>[^']+)')?\s*$", re.MULTILINE)
+SPRING_BOOT_BLOCK_RE = re.compile(r"\n*^springBoot\s*\{[^{}]*\}[ \t]*\n?", re.MULTILINE)
+DEPENDENCIES_BLOCK_RE = re.compile(r"^dependencies\s*\{[ \t]*\n", re.MULTILINE)
+TEST_BLOCK_RE = re.compile(r"^test\s*\{[ \t]*\n", re.MULTILINE)
+BOOT_DEP_VERSION_RE = re.compile(r"'org\.springframework\.boot:[\w.\-]+:(?P<version>\d[\w.\-]*)'")
+# Test task failures caused by JUnit 5 tests not being run on the JUnit Platform
+DISCOVERY_FAILURES = ("did not discover any tests", "No tests found for given includes")
+
+
+@dataclass
+class FixContext:
+    """
+    What a rule sees: the failing log and the build files it may patch.
+    Rules read files with read() and stage edits with write(); nothing touches
+    disk until every rule has run.
+    """
+    repo_dir: str
+    build_gradle_path: str
+    error_log: str
+    signature: object
+    changes: dict = field(default_factory=dict)
+
+    def read(self, path):
+        if path in self.changes:
+            return self.changes[path]
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write(self, path, content):
+        self.changes[path] = content
+
+    @property
+    def build_gradle(self):
+        return self.read(self.build_gradle_path) or ""
+
+    @property
+    def settings_gradle_path(self):
+        return os.path.join(self.repo_dir, "settings.gradle")
+
+
+def rule(name):
+    """
+    Registers a fix rule. A rule takes a FixContext, stages its edits through
+    ctx.write() and returns True when it matched and changed something.
+    """
+    def register(func):
+        RULES.append((name, func))
+        return func
+    return register
+
+
+@rule("spring-boot-block-without-plugin")
+def fix_spring_boot_block(ctx):
+    """The springBoot {} extension only exists once the Boot plugin is applied."""
+    content = ctx.build_gradle
+    if "springBoot" not in ctx.error_log or not SPRING_BOOT_BLOCK_RE.search(content):
+        return False
+    if BOOT_PLUGIN_RE.search(content):
+        return False
+    ctx.write(ctx.build_gradle_path, SPRING_BOOT_BLOCK_RE.sub("\n", content))
+    return True
+
+
+@rule("spring-boot-plugin-without-version")
+def fix_spring_boot_plugin_version(ctx):
+    """`id 'org.springframework.boot'` needs a version unless a parent build supplies it."""
+    if "Plugin [id: 'org.springframework.boot']" not in ctx.error_log:
+        return False
+    content = ctx.build_gradle
+    plugin = BOOT_PLUGIN_RE.search(content)
+    version = BOOT_DEP_VERSION_RE.search(content)
+    if not plugin or plugin.group("version") or not version or version.group("version") == FALLBACK_VERSION:
+        return False
+    line = plugin.group(0)
+    ctx.write(ctx.build_gradle_path, content.replace(line, f"{line.rstrip()} version '{version.group('version')}'", 1))
+    return True
+
+
+@rule("fallback-version-managed-by-boot")
+def fix_fallback_versions(ctx):
+    """
+    Artifacts written with the placeholder fallback version cannot resolve. When the
+    Boot plugin is applied, let the Spring Boot BOM pick their versions instead.
+    """
+    missing = set(re.findall(rf"Could not (?:find|resolve) ([\w.\-]+:[\w.\-]+):{re.escape(FALLBACK_VERSION)}\b", ctx.error_log))
+    missing = {ga for ga in missing if not ga.startswith("org.springframework.boot:")}
+    if not missing:
+        return False
+
+    content = ctx.build_gradle
+    plugin = BOOT_PLUGIN_RE.search(content)
+    if not plugin or not plugin.group("version"):
+        return False
+
+    updated = content
+    for ga in sorted(missing):
+        updated = updated.replace(f"'{ga}:{FALLBACK_VERSION}'", f"'{ga}'")
+    bom = f"platform('org.springframework.boot:spring-boot-dependencies:{plugin.group('version')}')"
+    if bom not in updated:
+        updated = DEPENDENCIES_BLOCK_RE.sub(lambda m: f"{m.group(0)}    implementation {bom}\n", updated, count=1)
+
+    if updated == content:
+        return False
+    ctx.write(ctx.build_gradle_path, updated)
+    return True
+
+
+def _module_dir_for_artifact(repo_dir, artifact_id):
+    """Finds the first-level module directory whose pom.xml declares artifact_id."""
+    try:
+        entries = sorted(os.scandir(repo_dir), key=lambda e: e.name)
+    except OSError:
+        return None
+    for entry in entries:
+        pom = os.path.join(entry.path, "pom.xml")
+        if entry.is_dir() and os.path.exists(pom):
+            try:
+                if load_pom(pom).artifact_id == artifact_id:
+                    return entry.name
+            except Exception:
+                continue
+    return None
+
+
+@rule("project-missing-from-settings")
+def fix_missing_project(ctx):
+    """`project(':x')` must name a project included in settings.gradle."""
+    missing = re.findall(r"Project with path '(:[\w.\-:]+)' could not be found", ctx.error_log)
+    if not missing:
+        return False
+
+    changed = False
+    for project_path in dict.fromkeys(missing):
+        name = project_path.lstrip(":")
+        module_dir = os.path.join(ctx.repo_dir, *name.split(":"))
+        settings = ctx.read(ctx.settings_gradle_path)
+
+        if os.path.isdir(module_dir) and settings is not None:
+            include = f"include('{name}')"
+            if include not in settings:
+                ctx.write(ctx.settings_gradle_path, settings.rstrip("\n") + f"\n{include}\n")
+                changed = True
+            continue
+
+        # Projects are named after directories, but POM dependencies use artifactIds
+        content = ctx.build_gradle
+        reference = f"project('{project_path}')"
+        if reference not in content:
+            continue
+        directory = _module_dir_for_artifact(ctx.repo_dir, name)
+        if directory:
+            ctx.write(ctx.build_gradle_path, content.replace(reference, f"project(':{directory}')"))
+        else:
+            lines = [line for line in content.splitlines() if reference not in line]
+            ctx.write(ctx.build_gradle_path, "\n".join(lines) + "\n")
+        changed = True
+    return changed
+
+
+@rule("missing-junit-platform")
+def fix_junit_platform(ctx):
+    """JUnit 5 tests are silently skipped (or fail discovery) without useJUnitPlatform()."""
+    content = ctx.build_gradle
+    if "useJUnitPlatform" in content:
+        return False
+    # Only the failure itself counts: a --debug log of any JUnit 5 build mentions junit-platform
+    failure = format_signature(ctx.signature)
+    if not any(symptom in failure for symptom in DISCOVERY_FAILURES):
+        return False
+
+    if TEST_BLOCK_RE.search(content):
+        updated = TEST_BLOCK_RE.sub(lambda m: f"{m.group(0)}    useJUnitPlatform()\n", content, count=1)
+    else:
+        updated = content.rstrip("\n") + "\n\ntest {\n    useJUnitPlatform()\n}\n"
+    ctx.write(ctx.build_gradle_path, updated)
+    return True
+
+
+def _failing_build_file(repo_dir, signature):
+    """Returns the build.gradle Gradle blamed (from "Where"/locations), if inside repo_dir."""
+    repo_root = os.path.abspath(repo_dir)
+    for location in signature.locations:
+        path = re.split(r":\d+", location, maxsplit=1)[0]
+        if path.endswith(".gradle") and os.path.abspath(path).startswith(repo_root) and os.path.exists(path):
+            return path
+    return None
+
+
+def _failing_project_build_file(repo_dir, signature):
+    """Returns the build.gradle of the first failing project other than the root, if it exists."""
+    for project in failing_projects(signature):
+        path = os.path.join(project_dir(repo_dir, project), "build.gradle")
+        if project != ":" and os.path.exists(path):
+            return path
+    return None
+
+
+def apply_rules(repo_dir, error_log, build_gradle_path=None):
+    """
+    Runs every registered rule against a failed build and writes the patched files.
+
+    Args:
+        repo_dir (str): Root of the Gradle build.
+        error_log (str): Gradle output of the failed build.
+        build_gradle_path (str): File to patch; defaults to the build file named in
+            the error, else that of the failing project, else the root build.gradle.
+
+    Returns:
+        tuple: (names of the rules that fixed something, paths relative to repo_dir
+        whose content actually changed); both empty when no rule matched.
+    """
+    signature = analyze_log(error_log)
+    target = (build_gradle_path or _failing_build_file(repo_dir, signature)
+              or _failing_project_build_file(repo_dir, signature) or os.path.join(repo_dir, "build.gradle"))
+    ctx = FixContext(repo_dir=repo_dir, build_gradle_path=target, error_log=error_log or "", signature=signature)
+
+    applied = []
+    for name, func in RULES:
+        try:
+            if func(ctx):
+                applied.append(name)
+        except Exception as e:
+            print(f"⚠️ Fix rule {name} failed: {e}")
+
+    changed = [path for path, content in ctx.changes.items() if write_if_changed(path, content.strip() + "\n")]
+
+    with _stats_lock:
+        _stats["failures"] += 1
+        if applied:
+            _stats["fixed"] += 1
+            _stats["hits"].update(applied)
+
+    if applied:
+        print(f"🧩 Rule-based fix applied: {', '.join(applied)}")
+    else:
+        print("ℹ️ No fix rule matched this failure.")
+    return applied, [os.path.relpath(path, start=repo_dir) for path in changed]
+
+
+def get_rule_stats():
+    with _stats_lock:
+        return {"failures": _stats["failures"], "fixed": _stats["fixed"], "hits": dict(_stats["hits"])}
+
+
+def print_rule_stats():
+    stats = get_rule_stats()
+    if not stats["failures"]:
+        return
+    print(f"🧩 Fix rules resolved {stats['fixed']}/{stats['failures']} failure(s) "
+          f"({stats['fixed'] / stats['failures']:.0%} hit rate)")
+    for name, _ in RULES:
+        print(f"   - {name}: {stats['hits'].get(name, 0)} hit(s)")
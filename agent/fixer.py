@@ -1,25 +1,29 @@
 import os
 import time
-from dotenv import load_dotenv
-import openai
+from agent import config
+from agent.utils import llm_cache
+from agent.utils.concurrency import stage_limit
+from agent.utils.tracing import span
+from agent.log_analyzer import summarize_error_log, report_prompt_reduction, project_dir
+from agent.utils.log_utils import read_log_tail, ANALYSIS_TAIL_LINES
+from agent.utils.output_utils import write_if_changed
 
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+config.load()
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4-0125-preview")
+# Sampling temperature for speculative candidates: high enough that they differ
+CANDIDATE_TEMPERATURE = float(os.getenv("OPENAI_CANDIDATE_TEMPERATURE", "0.7"))
 
 
-def fix_build_gradle(pom_xml: str, build_gradle: str, error_log: str) -> str:
-    """
-    Use OpenAI to fix a broken build.gradle file based on the pom.xml and error logs.
+def _openai():
+    """The openai client library, imported on first use: it takes longer to import than the rest of the agent."""
+    import openai
+    openai.api_key = os.getenv("OPENAI_API_KEY")
+    return openai
 
-    Args:
-        pom_xml (str): Contents of the pom.xml file.
-        build_gradle (str): Current contents of the build.gradle file.
-        error_log (str): Output of the failed gradle build.
 
-    Returns:
-        str: Updated build.gradle content (or original if retries fail).
-    """
-    truncated_error_log = "\n".join(error_log.splitlines()[-300:])
+def _fix_messages(pom_xml: str, build_gradle: str, error_log: str) -> list:
+    """Builds the chat messages asking for a corrected build.gradle."""
+    error_signature = summarize_error_log(error_log)
 
     prompt = f"""
 You are a Gradle and Java build expert.
@@ -38,32 +42,67 @@ And the current build.gradle:
 The following Gradle build error occurred:
 
 <error>
-{truncated_error_log}
+{error_signature}
 </error>
 
 Please return the corrected build.gradle content to resolve the issue.
 Only return the fixed build.gradle file content. No explanations or markdown formatting.
 """
 
+    return [
+        {"role": "system", "content": "You are a Gradle and Maven build assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _report_reduction(messages: list, error_log: str):
+    """Reports the prompt savings of a request that is actually sent (not served from cache)."""
+    truncated_error_log = "\n".join(error_log.splitlines()[-300:])
+    report_prompt_reduction(messages[-1]["content"], truncated_error_log, summarize_error_log(error_log))
+
+
+def _strip_fences(content: str) -> str:
+    content = content.strip()
+    if content.startswith("```"):
+        lines = content.splitlines()
+        lines = lines[1:] if lines[0].startswith("```") else lines
+        lines = lines[:-1] if lines and lines[-1].endswith("```") else lines
+        content = "\n".join(lines).strip()
+    return content
+
+
+def fix_build_gradle(pom_xml: str, build_gradle: str, error_log: str, bypass_cache: bool = None) -> str:
+    """
+    Use OpenAI to fix a broken build.gradle file based on the pom.xml and error logs.
+
+    Args:
+        pom_xml (str): Contents of the pom.xml file.
+        build_gradle (str): Current contents of the build.gradle file.
+        error_log (str): Output of the failed gradle build.
+        bypass_cache (bool): Skip the response cache lookup (defaults to LLM_CACHE_BYPASS).
+
+    Returns:
+        str: Updated build.gradle content (or original if retries fail).
+    """
+    messages = _fix_messages(pom_xml, build_gradle, error_log)
+    cached = llm_cache.get(MODEL, messages, bypass=bypass_cache)
+    if cached is not None:
+        print("♻️ Gradle fix served from cache")
+        return cached
+    _report_reduction(messages, error_log)
+
     for attempt in range(3):
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4-0125-preview",
-                messages=[
-                    {"role": "system", "content": "You are a Gradle and Maven build assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-            )
-            content = response.choices[0].message.content.strip()
-
-            if content.startswith("```"):
-                lines = content.splitlines()
-                lines = lines[1:] if lines[0].startswith("```") else lines
-                lines = lines[:-1] if lines and lines[-1].endswith("```") else lines
-                content = "\n".join(lines).strip()
+            with stage_limit("llm"), span("openai", "llm", model=MODEL, attempt=attempt + 1):
+                response = _openai().chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    temperature=0.2,
+                )
+            content = _strip_fences(response.choices[0].message.content)
 
             print(f"✅ Gradle fix received (attempt {attempt + 1})")
+            llm_cache.put(MODEL, messages, content)
             return content
 
         except Exception as e:
@@ -74,19 +113,82 @@ Only return the fixed build.gradle file content. No explanations or markdown for
     return build_gradle
 
 
-def attempt_fix(repo_dir: str):
+def fix_build_gradle_candidates(pom_xml: str, build_gradle: str, error_log: str, count: int,
+                                bypass_cache: bool = None) -> list:
     """
-    Attempts to fix the root build.gradle file using OpenAI if Gradle build fails.
+    Like fix_build_gradle, but asks for `count` alternative fixes in one request
+    (sampled at CANDIDATE_TEMPERATURE so they differ) for speculative verification.
+
+    Returns:
+        list: Distinct candidate build.gradle contents, best first; empty if every attempt failed.
     """
-    print("🔍 Attempting fix using OpenAI...")
+    messages = _fix_messages(pom_xml, build_gradle, error_log)
+    # The candidate list is cached separately from single answers to the same prompt
+    cache_model = f"{MODEL}:n={count}"
+    cached = llm_cache.get(cache_model, messages, bypass=bypass_cache)
+    if cached is not None:
+        print(f"♻️ {len(cached)} Gradle fix candidate(s) served from cache")
+        return cached
+    _report_reduction(messages, error_log)
 
-    pom_path = os.path.join(repo_dir, "pom.xml")
-    gradle_path = os.path.join(repo_dir, "build.gradle")
+    for attempt in range(3):
+        try:
+            with stage_limit("llm"), span("openai", "llm", model=MODEL, attempt=attempt + 1, n=count):
+                response = _openai().chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    temperature=CANDIDATE_TEMPERATURE,
+                    n=count,
+                )
+            candidates = list(dict.fromkeys(
+                _strip_fences(choice.message.content) for choice in response.choices if choice.message.content))
+            print(f"✅ {len(candidates)} distinct Gradle fix candidate(s) received (attempt {attempt + 1})")
+            llm_cache.put(cache_model, messages, candidates)
+            return candidates
+
+        except Exception as e:
+            print(f"⚠️ OpenAI API attempt {attempt + 1} failed: {e}")
+            time.sleep(2 ** attempt)
+
+    print("❌ All attempts to get build.gradle fix candidates failed.")
+    return []
+
+
+def reject_fix(pom_xml: str, build_gradle: str, error_log: str, count: int = None):
+    """
+    Forgets the cached fix for these inputs after it failed verification (the build
+    still failed, or the fix changed nothing), so a rerun samples a new one.
+    `count` selects the candidate list of fix_build_gradle_candidates instead.
+    """
+    model = MODEL if count is None else f"{MODEL}:n={count}"
+    if llm_cache.invalidate(model, _fix_messages(pom_xml, build_gradle, error_log)):
+        print("🗑️ Dropped the failed Gradle fix from the LLM cache")
+
+
+def attempt_fix(repo_dir: str, project: str = ":", applied: list = None) -> bool:
+    """
+    Attempts to fix a project's build.gradle file using OpenAI if Gradle build fails.
+
+    Args:
+        repo_dir (str): Root of the Gradle build (holds gradle_build.log).
+        project (str): Gradle path of the failing project (e.g. ':core'); its
+            build.gradle is fixed against its own pom.xml. Defaults to the root project.
+        applied (list): If given, receives the (pom_xml, build_gradle, error_log)
+            inputs of a fix that was written, for reject_fix() if the rebuild fails.
+
+    Returns:
+        bool: True if build.gradle was modified.
+    """
+    print(f"🔍 Attempting fix using OpenAI{'' if project == ':' else f' for {project}'}...")
+
+    module_dir = project_dir(repo_dir, project)
+    pom_path = os.path.join(module_dir, "pom.xml")
+    gradle_path = os.path.join(module_dir, "build.gradle")
     log_path = os.path.join(repo_dir, "gradle_build.log")
 
     if not (os.path.exists(pom_path) and os.path.exists(gradle_path) and os.path.exists(log_path)):
         print("⚠️ Required files missing for fix attempt. Skipping.")
-        return
+        return False
 
     with open(pom_path, "r") as f:
         pom_xml = f.read()
@@ -94,20 +196,21 @@ def attempt_fix(repo_dir: str):
     with open(gradle_path, "r") as f:
         gradle_content = f.read()
 
-    with open(log_path, "r") as f:
-        error_log = f.read()
+    error_log = read_log_tail(log_path, ANALYSIS_TAIL_LINES)
 
     fixed_content = fix_build_gradle(pom_xml, gradle_content, error_log)
 
-    if fixed_content != gradle_content:
-        with open(gradle_path, "w") as f:
-            f.write(fixed_content.strip() + "\n")
+    if write_if_changed(gradle_path, fixed_content.strip() + "\n"):
         print("✅ build.gradle updated with AI fix.")
-    else:
-        print("ℹ️ No change detected from the fixer.")
+        if applied is not None:
+            applied.append((pom_xml, gradle_content, error_log))
+        return True
+    print("ℹ️ No change detected from the fixer.")
+    reject_fix(pom_xml, gradle_content, error_log)
+    return False
 
 
-def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, error_log: str) -> str:
+def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, error_log: str, bypass_cache: bool = None) -> str:
     """
     Use OpenAI to fix the gradle_writer.py code so it generates correct build.gradle files.
 
@@ -115,11 +218,13 @@ def fix_gradle_writer(pom_xml: str, gradle_writer_code: str, error_log: str) ->
         pom_xml (str): Original pom.xml.
         gradle_writer_code (str): Contents of gradle_writer.py.
         error_log (str): Gradle error log caused by the generated build.gradle.
+        bypass_cache (bool): Skip the response cache lookup (defaults to LLM_CACHE_BYPASS).
 
     Returns:
         str: Updated gradle_writer.py content.
     """
     truncated_error_log = "\n".join(error_log.splitlines()[-300:])
+    error_signature = summarize_error_log(error_log)
 
     prompt = f"""
 You are a Gradle and Python build tooling expert.
@@ -141,23 +246,31 @@ The current Python code is:
 The generated build.gradle causes the following Gradle build error:
 
 <error>
-{truncated_error_log}
+{error_signature}
 </error>
 
 Please modify the Python code to ensure it generates a valid build.gradle.
 Only return the full updated gradle_writer.py content, no explanations or markdown.
 """
 
+    messages = [
+        {"role": "system", "content": "You are a Gradle and Python build assistant."},
+        {"role": "user", "content": prompt}
+    ]
+    cached = llm_cache.get(MODEL, messages, bypass=bypass_cache)
+    if cached is not None:
+        print("♻️ gradle_writer.py fix served from cache")
+        return cached
+    report_prompt_reduction(prompt, truncated_error_log, error_signature)
+
     for attempt in range(3):
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4-0125-preview",
-                messages=[
-                    {"role": "system", "content": "You are a Gradle and Python build assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-            )
+            with stage_limit("llm"), span("openai", "llm", model=MODEL, attempt=attempt + 1):
+                response = _openai().chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    temperature=0.2,
+                )
             content = response.choices[0].message.content.strip()
             if content.startswith("```"):
                 lines = content.splitlines()
@@ -165,6 +278,7 @@ Only return the full updated gradle_writer.py content, no explanations or markdo
                 lines = lines[:-1] if lines[-1].endswith("```") else lines
                 content = "\n".join(lines).strip()
             print(f"✅ gradle_writer.py fix received (attempt {attempt + 1})")
+            llm_cache.put(MODEL, messages, content)
             return content
 
         except Exception as e:
@@ -192,8 +306,7 @@ def attempt_fix_gradle_writer(repo_dir: str, agent_dir: str):
     with open(pom_path, "r") as f:
         pom_xml = f.read()
 
-    with open(log_path, "r") as f:
-        error_log = f.read()
+    error_log = read_log_tail(log_path, ANALYSIS_TAIL_LINES)
 
     with open(writer_path, "r") as f:
         gradle_writer_code = f.read()
@@ -0,0 +1,159 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from agent.utils.cache_utils import save_json
+from agent.utils.concurrency import configure_limits
+
+DEFAULT_JOBS = int(os.getenv("FLEET_JOBS", "4"))
+DEFAULT_LIMITS = {
+    "clone": int(os.getenv("FLEET_CLONE_LIMIT", "4")),
+    "build": int(os.getenv("FLEET_BUILD_LIMIT", "2")),
+    "llm": int(os.getenv("FLEET_LLM_LIMIT", "4"))
+}
+SUMMARY_FILE = "summary.json"
+LOG_FILE = "migration.log"
+# owner/repo of an https or ssh GitHub clone URL
+GITHUB_URL = re.compile(r"github\.com[:/]([^/]+/[^/]+?)(?:\.git)?/?$")
+
+
+def load_manifest(manifest_path):
+    """
+    Reads a fleet manifest: a JSON list of repositories, each either a clone URL or
+    {"url": ..., "name": ..., "full_name": "owner/repo", "branch": ..., "base": ...}.
+    URLs may be local paths (e.g. bare repositories). full_name, the repository the
+    pull request is opened on, defaults to the owner/repo of a GitHub URL; entries
+    with neither get no pull request. Names default to the URL's basename and are
+    made unique, since they name the workspace directories.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        raw_entries = json.load(f)
+
+    entries = []
+    seen = set()
+    for raw in raw_entries:
+        entry = {"url": raw} if isinstance(raw, str) else dict(raw)
+        if not entry.get("url"):
+            raise ValueError(f"Manifest entry without url: {raw}")
+        if not entry.get("full_name"):
+            match = GITHUB_URL.search(entry["url"])
+            entry["full_name"] = match.group(1) if match else None
+        base_name = entry.get("name") or re.sub(r"\.git$", "", os.path.basename(entry["url"].rstrip("/")))
+        name = base_name
+        suffix = 2
+        while name in seen:
+            name = f"{base_name}-{suffix}"
+            suffix += 1
+        seen.add(name)
+        entry["name"] = name
+        entries.append(entry)
+    return entries
+
+
+def migrate_repository(entry, workspace, resume=False):
+    """
+    Fleet worker: migrates one manifest entry inside workspace/<name>/ and writes
+    its summary.json. With resume, an interrupted migration continues from its
+    journal. Runs in its own process, so the agent's module-level state (last build
+    error, timings, configured remote) is never shared between repos.
+    """
+    # Imported here so the parent process never loads git/openai
+    from agent import builder, fix_rules, git_handler, planner
+    from agent.utils import content_manifest, llm_cache, tracing
+
+    repo_workspace = os.path.join(workspace, entry["name"])
+    os.makedirs(repo_workspace, exist_ok=True)
+    summary = {
+        "name": entry["name"],
+        "url": entry["url"],
+        "full_name": entry.get("full_name"),
+        "success": False,
+        "error": None,
+        "log": os.path.join(repo_workspace, LOG_FILE)
+    }
+
+    start = time.perf_counter()
+    with open(summary["log"], "a" if resume else "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            git_handler.configure_repo(entry["url"], entry.get("full_name"))
+            summary["success"] = bool(planner.run_migration(
+                os.path.join(repo_workspace, "repo"),
+                branch=entry.get("branch"),
+                base_branch=entry.get("base"),
+                resume=resume
+            ))
+        except Exception as e:
+            summary["error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    summary["gradle_attempts"] = builder.get_attempt_timings()
+    summary["llm_cache"] = llm_cache.get_stats()
+    summary["fix_rules"] = fix_rules.get_rule_stats()
+    summary["stages"] = tracing.summarize()
+    summary["incremental"] = content_manifest.get_summary()
+    save_json(os.path.join(repo_workspace, SUMMARY_FILE), summary)
+    return summary
+
+
+def run_fleet(manifest_path, workspace="fleet", jobs=DEFAULT_JOBS, limits=None, resume=False):
+    """
+    Migrates every repository in the manifest, up to `jobs` at a time, with separate
+    concurrency limits for the clone, build and LLM stages. With resume, repositories
+    whose migration was interrupted continue from their last completed stage.
+
+    Returns:
+        list: The per-repository summaries, in manifest order.
+    """
+    entries = load_manifest(manifest_path)
+    workspace = os.path.abspath(workspace)
+    os.makedirs(workspace, exist_ok=True)
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+
+    print(f"🚚 Migrating {len(entries)} repositories with {jobs} worker(s), stage limits {limits}")
+    context = multiprocessing.get_context("spawn")
+    semaphores = {stage: context.BoundedSemaphore(max(1, limit)) for stage, limit in limits.items()}
+
+    results = {}
+    start = time.perf_counter()
+    # One fresh process per repository: nothing leaks between migrations
+    with ProcessPoolExecutor(max_workers=max(1, jobs), mp_context=context, max_tasks_per_child=1,
+                             initializer=configure_limits, initargs=(semaphores,)) as pool:
+        futures = {pool.submit(migrate_repository, entry, workspace, resume): entry for entry in entries}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {"name": entry["name"], "url": entry["url"], "success": False,
+                           "error": f"Worker crashed: {type(e).__name__}: {e}"}
+            results[entry["name"]] = summary
+            status = "✅" if summary["success"] else "❌"
+            print(f"{status} {summary['name']} ({summary.get('seconds', 0):.1f}s) {summary.get('error') or ''}")
+
+    summaries = [results[entry["name"]] for entry in entries]
+    succeeded = sum(1 for summary in summaries if summary["success"])
+    save_json(os.path.join(workspace, "fleet_summary.json"), summaries)
+    print(f"📊 Fleet finished in {time.perf_counter() - start:.1f}s: {succeeded}/{len(summaries)} migrated. "
+          f"Summaries under {workspace}")
+    return summaries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate many Maven repositories to Gradle.")
+    parser.add_argument("manifest", help="JSON list of repositories to migrate")
+    parser.add_argument("--workspace", default="fleet", help="Directory holding one workspace per repository")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Repositories migrated concurrently")
+    parser.add_argument("--clone-limit", type=int, default=DEFAULT_LIMITS["clone"])
+    parser.add_argument("--build-limit", type=int, default=DEFAULT_LIMITS["build"])
+    parser.add_argument("--llm-limit", type=int, default=DEFAULT_LIMITS["llm"])
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted migrations from their journals")
+    args = parser.parse_args()
+
+    run_fleet(args.manifest, args.workspace, args.jobs,
+              {"clone": args.clone_limit, "build": args.build_limit, "llm": args.llm_limit}, args.resume)
@@ -0,0 +1,209 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+import requests
+from requests.adapters import HTTPAdapter
+from agent.utils.tracing import span
+
+DEFAULT_API_URL = "https://api.github.com"
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 30)
+MAX_RETRIES = 5
+# Upper bound on a single rate-limit wait; longer resets are reported, not slept through
+MAX_WAIT = int(os.getenv("GITHUB_MAX_WAIT", "900"))
+# GitHub asks integrations to wait a minute on a secondary limit without Retry-After
+SECONDARY_LIMIT_WAIT = int(os.getenv("GITHUB_SECONDARY_LIMIT_WAIT", "60"))
+# Minimum spacing between content-creating requests, per GitHub's API guidelines
+MUTATION_INTERVAL = float(os.getenv("GITHUB_MUTATION_INTERVAL", "1.0"))
+RETRY_STATUSES = {500, 502, 503, 504}
+MUTATING_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+
+
+@dataclass
+class ApiResponse:
+    """A GitHub API response with its JSON body already decoded."""
+    status_code: int
+    data: object = None
+    headers: dict = field(default_factory=dict)
+    text: str = ""
+    from_cache: bool = False
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+
+class GitHubClient:
+    """
+    GitHub REST client for PR operations at fleet scale.
+
+    One pooled requests.Session is reused for every call (no new TLS handshake per
+    request). GETs are ETag-conditional, so unchanged resources come back as 304s
+    that do not count against the rate limit. 403/429 rate-limit responses wait for
+    Retry-After / X-RateLimit-Reset, 5xx responses back off exponentially, and
+    mutating requests are spaced MUTATION_INTERVAL apart.
+    """
+
+    def __init__(self, token=None, base_url=None, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES,
+                 pool_size=16, mutation_interval=MUTATION_INTERVAL):
+        # Read at construction, after .env has been loaded; override for a local stand-in server
+        self.base_url = (base_url or os.getenv("GITHUB_API_URL", DEFAULT_API_URL)).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.mutation_interval = mutation_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "MavenToGradleAgent"
+        })
+        token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        self._etags = {}
+        self._lock = threading.Lock()
+        self._mutation_lock = threading.Lock()
+        self._last_mutation = 0.0
+
+    def _url(self, path):
+        return path if path.startswith(("http://", "https://")) else f"{self.base_url}/{path.lstrip('/')}"
+
+    def _throttle_mutation(self):
+        with self._mutation_lock:
+            wait = self._last_mutation + self.mutation_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_mutation = time.monotonic()
+
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying, or None if the response is final."""
+        headers = response.headers
+        rate_limited = response.status_code == 429 or (
+            response.status_code == 403 and (
+                "Retry-After" in headers
+                or headers.get("X-RateLimit-Remaining") == "0"
+                or "rate limit" in response.text.lower()
+            )
+        )
+        if rate_limited:
+            if "Retry-After" in headers:
+                try:
+                    return float(headers["Retry-After"])
+                except ValueError:
+                    pass
+            if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+                return max(0.0, float(headers["X-RateLimit-Reset"]) - time.time()) + 1
+            return SECONDARY_LIMIT_WAIT * (2 ** attempt)
+        if response.status_code in RETRY_STATUSES:
+            return min(2 ** attempt + random.random(), 60)
+        return None
+
+    @staticmethod
+    def _decode(response):
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def request(self, method, path, params=None, json=None):
+        """
+        Sends a request with retries and returns an ApiResponse. Network errors are
+        retried with backoff and re-raised once retries are exhausted.
+        """
+        method = method.upper()
+        url = self._url(path)
+        cache_key = (url, tuple(sorted((params or {}).items()))) if method == "GET" else None
+
+        for attempt in range(self.max_retries + 1):
+            headers = {}
+            with self._lock:
+                cached = self._etags.get(cache_key) if cache_key else None
+            if cached:
+                headers["If-None-Match"] = cached[0]
+            if method in MUTATING_METHODS:
+                self._throttle_mutation()
+
+            try:
+                with span(f"github {method}", "http", path=path, attempt=attempt + 1):
+                    response = self.session.request(method, url, params=params, json=json,
+                                                    headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(2 ** attempt + random.random(), 60)
+                print(f"⚠️ GitHub request failed ({e}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            if response.status_code == 304 and cached:
+                return ApiResponse(200, cached[1], dict(response.headers), from_cache=True)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt == self.max_retries:
+                break
+            if delay > MAX_WAIT:
+                print(f"⚠️ GitHub rate limit resets in {delay:.0f}s, beyond GITHUB_MAX_WAIT. Giving up.")
+                break
+            print(f"⏳ GitHub responded {response.status_code}. Waiting {delay:.1f}s before retrying...")
+            time.sleep(delay)
+
+        data = self._decode(response)
+        if cache_key and response.status_code == 200 and response.headers.get("ETag"):
+            with self._lock:
+                self._etags[cache_key] = (response.headers["ETag"], data)
+        return ApiResponse(response.status_code, data, dict(response.headers), response.text)
+
+    def list_pull_requests(self, repo_full_name, head=None, base=None, state="open"):
+        params = {"state": state}
+        if head:
+            params["head"] = head
+        if base:
+            params["base"] = base
+        return self.request("GET", f"/repos/{repo_full_name}/pulls", params=params)
+
+    def create_pull_request(self, repo_full_name, head, base, title, body):
+        payload = {"title": title, "head": head, "base": base, "body": body}
+        return self.request("POST", f"/repos/{repo_full_name}/pulls", json=payload)
+
+    def create_pull_requests(self, specs):
+        """
+        Creates many PRs through the shared session. Mutations are issued one at a
+        time (spaced by mutation_interval), as GitHub recommends to avoid secondary
+        rate limits; a failure is recorded and the batch continues.
+
+        Args:
+            specs (list): Dicts with repo_full_name, head, base, title and body.
+
+        Returns:
+            list: One ApiResponse (or the raised exception) per spec, in order.
+        """
+        results = []
+        for spec in specs:
+            try:
+                results.append(self.create_pull_request(**spec))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns this process's shared GitHubClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
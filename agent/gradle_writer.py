@@ -1,44 +1,108 @@
 import os
+import textwrap
 from agent.logger import log_success
+from agent.utils import version_index
+from agent.utils.output_utils import write_if_changed
+
+# Version written when nothing better is known; the rule-based fixer recognises it
+FALLBACK_VERSION = "3.2.5"
+
+DEFAULT_VERSIONS = {
+    "spring-boot-starter-web": "3.2.5",
+    "spring-boot-starter": "3.2.5",
+    "spring-boot-starter-test": "3.2.5",
+    "spring-boot-starter-data-jpa": "3.2.5",
+    "spring-boot-devtools": "3.2.5"
+}
+
+SCOPE_MAP = {
+    "compile": "implementation",
+    "runtime": "runtimeOnly",
+    "test": "testImplementation",
+    "provided": "compileOnly"
+}
+
+SPRING_BOOT_PLUGIN_ID = "org.springframework.boot"
+SPRING_BOOT_PLUGIN_KEY = "org.springframework.boot:spring-boot-gradle-plugin"
+
+# Every emitter builds its content in memory and goes through write_if_changed, which
+# never writes a BOM and leaves identical files (and their mtimes) untouched. Each
+# returns True if the file on disk changed.
 
 def remove_utf8_bom(filepath):
     with open(filepath, 'rb') as f:
         content = f.read()
     if content.startswith(b'\xef\xbb\xbf'):
         print("\u26a0\ufe0f BOM found. Removing from build.gradle.")
-        content = content[3:]
-        with open(filepath, 'wb') as f:
-            f.write(content)
+        return write_if_changed(filepath, content[3:])
+    return False
 
-def write_build_gradle(
+def resolve_version(group, artifact, version, properties, verbose=True, boot_version=None):
+    """
+    The version written for a dependency: its ${property} resolved against the module's
+    properties, else `boot_version` for Spring Boot artifacts, DEFAULT_VERSIONS, the
+    newest locally known release, and finally FALLBACK_VERSION. Local releases of
+    Spring Boot artifacts are restricted to the Boot line in use, so the output
+    does not depend on which newer Boot release happens to be in ~/.m2.
+    """
+    if version and version.startswith("${") and version.endswith("}"):
+        prop_key = version[2:-1]
+        version = properties.get(prop_key, DEFAULT_VERSIONS.get(artifact))
+        if not version and verbose:
+            print(f"\u26a0\ufe0f  Unresolved version for property {prop_key} used in {group}:{artifact}")
+
+    is_boot_artifact = group == SPRING_BOOT_PLUGIN_ID
+    if not version and is_boot_artifact and boot_version:
+        version = boot_version
+        if verbose:
+            print(f"\u2139\ufe0f  Using Spring Boot version '{version}' for {artifact}")
+
+    if not version:
+        version = DEFAULT_VERSIONS.get(artifact)
+        if version and verbose:
+            print(f"\u2139\ufe0f  Using default version '{version}' for {artifact}")
+
+    if not version:
+        # "3.2.5" -> "3.2.": any patch release of the Boot line the plugin uses
+        prefix = ".".join((boot_version or FALLBACK_VERSION).split(".")[:2]) + "." if is_boot_artifact else None
+        version = version_index.latest_release(group, artifact, prefix)
+        if version and verbose:
+            print(f"\u2139\ufe0f  Using newest locally known release '{version}' for {group}:{artifact}")
+
+    if not version:
+        version = FALLBACK_VERSION
+        if verbose:
+            print(f"\u26a0\ufe0f  No specific version for {artifact}, using fallback version: {version}")
+    return version
+
+def plan_build_gradle(
     deps,
-    output_path,
     main_class=None,
     known_modules=None,
     properties=None,
     plugin_versions=None,
-    build_plugins=None
+    build_plugins=None,
+    catalog=None,
+    reactor=None
 ):
-    known_modules = known_modules or []
+    """
+    Works out the sections of a module's build.gradle without writing it, so a reactor
+    can be compared module by module (see agent.multi_module.conventions).
+
+    Returns:
+        dict: "plugins" [(entry, plugin id, version)], "ext" [entry],
+        "repositories" [entry], "dependencies" [(entry, (configuration, group,
+        artifact, version) or None for project dependencies)], "main_class",
+        "blocks" [tuple of lines] for plugin-specific configuration, and "footer".
+
+    Sibling modules are recognised through `reactor` (a multi_module.graph.ReactorGraph,
+    matched on groupId:artifactId) or, without one, by artifactId in `known_modules`.
+    """
+    known_modules = set(known_modules or ())
     properties = properties or {}
     plugin_versions = plugin_versions or {}
     build_plugins = build_plugins or []
 
-    DEFAULT_VERSIONS = {
-        "spring-boot-starter-web": "3.2.5",
-        "spring-boot-starter": "3.2.5",
-        "spring-boot-starter-test": "3.2.5",
-        "spring-boot-starter-data-jpa": "3.2.5",
-        "spring-boot-devtools": "3.2.5"
-    }
-
-    SCOPE_MAP = {
-        "compile": "implementation",
-        "runtime": "runtimeOnly",
-        "test": "testImplementation",
-        "provided": "compileOnly"
-    }
-
     if not main_class:
         for plugin in build_plugins:
             if plugin.get("artifactId") == "maven-jar-plugin":
@@ -53,80 +117,55 @@ def write_build_gradle(
                     print(f"\u26a0\ufe0f Failed to extract mainClass from jar plugin config: {e}")
                 break
 
-    lines = ["plugins {"]
-    lines.append("    id 'java'")
+    plugins = [("id 'java'", "java", None)]
     if main_class:
-        lines.append("    id 'application'")
-
-    if "org.springframework.boot:spring-boot-gradle-plugin" in plugin_versions:
-        spring_boot_version = plugin_versions["org.springframework.boot:spring-boot-gradle-plugin"]
-        lines.append(f"    id 'org.springframework.boot' version '{spring_boot_version}'")
+        plugins.append(("id 'application'", "application", None))
+
+    if SPRING_BOOT_PLUGIN_KEY in plugin_versions:
+        spring_boot_version = plugin_versions[SPRING_BOOT_PLUGIN_KEY]
+        plugin_alias = catalog.plugin_alias(SPRING_BOOT_PLUGIN_ID, spring_boot_version) if catalog else None
+        if plugin_alias:
+            entry = f"alias(libs.plugins.{plugin_alias})"
+        else:
+            entry = f"id 'org.springframework.boot' version '{spring_boot_version}'"
+        plugins.append((entry, SPRING_BOOT_PLUGIN_ID, spring_boot_version))
     elif any(p.get("artifactId") == "spring-boot-maven-plugin" for p in build_plugins):
-        lines.append("    id 'org.springframework.boot'")
+        plugins.append(("id 'org.springframework.boot'", SPRING_BOOT_PLUGIN_ID, None))
         print("\u2139\ufe0f Detected spring-boot-maven-plugin, applying Gradle equivalent")
 
-    lines.append("}")
-
+    ext = []
     filtered_properties = {k: v for k, v in properties.items() if k not in {"version", "group", "name"}}
-    if filtered_properties:
-        lines += ["", "ext {"]
+    # Maven properties were already resolved into dependency versions, which the catalog now holds
+    if filtered_properties and not catalog:
         for k, v in filtered_properties.items():
             safe_key = k.replace(".", "_").replace("-", "_")
             if k != safe_key:
                 print(f"\u2139\ufe0f  Renamed property key: {k} → {safe_key}")
-            lines.append(f"    {safe_key} = '{v}'")
-        lines.append("}")
-
-    lines += [
-        "",
-        "repositories {",
-        "    mavenCentral()",
-        "}",
-        "",
-        "dependencies {"
-    ]
+            ext.append(f"{safe_key} = '{v}'")
 
+    dependencies = []
     for group, artifact, version, scope in deps:
-        if artifact in known_modules:
-            lines.append(f"    implementation project(':{artifact}')")
+        module = reactor.module_for(group, artifact) if reactor else None
+        if module:
+            dependencies.append((f"implementation project('{reactor.project_path(module)}')", None))
+            continue
+        if not reactor and artifact in known_modules:
+            dependencies.append((f"implementation project(':{artifact}')", None))
             continue
 
         config = SCOPE_MAP.get(scope or "compile", "implementation")
+        version = resolve_version(group, artifact, version, properties,
+                                  boot_version=plugin_versions.get(SPRING_BOOT_PLUGIN_KEY))
 
-        if version and version.startswith("${") and version.endswith("}"):
-            prop_key = version[2:-1]
-            version = properties.get(prop_key, DEFAULT_VERSIONS.get(artifact))
-            if not version:
-                print(f"\u26a0\ufe0f  Unresolved version for property {prop_key} used in {group}:{artifact}")
+        library_alias = catalog.library_alias(group, artifact, version) if catalog else None
+        if library_alias:
+            entry = f"{config} libs.{library_alias}"
+        else:
+            entry = f"{config} '{group}:{artifact}:{version}'"
+        dependencies.append((entry, (config, group, artifact, version)))
 
-        if not version:
-            version = DEFAULT_VERSIONS.get(artifact)
-            if version:
-                print(f"\u2139\ufe0f  Using default version '{version}' for {artifact}")
-            else:
-                version = "3.2.5"
-                print(f"\u26a0\ufe0f  No specific version for {artifact}, using fallback version: {version}")
-
-        lines.append(f"    {config} '{group}:{artifact}:{version}'")
-
-    lines.append("}")
-
-    if main_class:
-        lines += [
-            "",
-            "application {",
-            f"    mainClass = '{main_class}'",
-            "}",
-            "",
-            "springBoot {",
-            f"    mainClass = '{main_class}'",
-            "}"
-        ]
-
-    lines += ["", "// Plugin-specific Gradle configuration"]
+    blocks = []
     for plugin in build_plugins:
-        ga = f"{plugin.get('groupId')}:{plugin.get('artifactId')}"
-        version = plugin.get("version")
         config = plugin.get("configuration", {})
         if isinstance(config, str):
             config = {}
@@ -134,27 +173,101 @@ def write_build_gradle(
         if plugin["artifactId"] == "maven-compiler-plugin":
             source = config.get("source", properties.get("java.version", "11"))
             target = config.get("target", properties.get("java.version", "11"))
-            lines += [
+            blocks.append((
                 "tasks.withType(JavaCompile) {",
                 f"    sourceCompatibility = '{source}'",
                 f"    targetCompatibility = '{target}'",
                 "}"
-            ]
+            ))
 
         elif plugin["artifactId"] == "maven-surefire-plugin":
-            lines += [
+            blocks.append((
                 "test {",
                 "    useJUnitPlatform()",
                 "    // Additional test options can go here",
                 "}"
-            ]
+            ))
+
+    return {
+        "plugins": plugins,
+        "ext": ext,
+        "repositories": ["mavenCentral()"],
+        "dependencies": dependencies,
+        "main_class": main_class,
+        "blocks": blocks,
+        "footer": []
+    }
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write("\n".join(lines).strip() + "\n")
+def render_build_gradle(sections):
+    """Renders sections from plan_build_gradle as build.gradle text."""
+    lines = []
+    # Modules whose plugins all moved to shared conventions have none left to declare
+    if sections["plugins"]:
+        lines.append("plugins {")
+        lines += [f"    {entry}" for entry, _, _ in sections["plugins"]]
+        lines.append("}")
+
+    if sections["ext"]:
+        lines += ["", "ext {"]
+        lines += [f"    {entry}" for entry in sections["ext"]]
+        lines.append("}")
+
+    if sections["repositories"]:
+        lines += ["", "repositories {"]
+        lines += [f"    {entry}" for entry in sections["repositories"]]
+        lines.append("}")
+
+    lines += ["", "dependencies {"]
+    lines += [f"    {entry}" for entry, _ in sections["dependencies"]]
+    lines.append("}")
 
-    remove_utf8_bom(output_path)
-    log_success(f"\u2705 build.gradle written at {output_path}")
+    main_class = sections["main_class"]
+    if main_class:
+        lines += [
+            "",
+            "application {",
+            f"    mainClass = '{main_class}'",
+            "}",
+            "",
+            "springBoot {",
+            f"    mainClass = '{main_class}'",
+            "}"
+        ]
+
+    lines += ["", "// Plugin-specific Gradle configuration"]
+    for block in sections["blocks"]:
+        lines += block
+
+    lines += sections["footer"]
+    return "\n".join(lines).strip() + "\n"
+
+def write_build_gradle_sections(sections, output_path):
+    changed = write_if_changed(output_path, render_build_gradle(sections))
+    if changed:
+        log_success(f"\u2705 build.gradle written at {output_path}")
+    else:
+        print(f"\u2139\ufe0f  build.gradle unchanged at {output_path}")
+    return changed
+
+def write_build_gradle(
+    deps,
+    output_path,
+    main_class=None,
+    known_modules=None,
+    properties=None,
+    plugin_versions=None,
+    build_plugins=None,
+    catalog=None,
+    reactor=None
+):
+    """
+    Writes a module's build.gradle. With a catalog (agent.multi_module.catalog),
+    dependencies and the Spring Boot plugin are referenced as libs.<alias> entries of
+    gradle/libs.versions.toml instead of inline coordinates.
+    """
+    sections = plan_build_gradle(deps, main_class, known_modules, properties, plugin_versions,
+                                 build_plugins, catalog, reactor)
+    return write_build_gradle_sections(sections, output_path)
 
 def write_settings_gradle(modules, output_path):
     """
@@ -167,24 +280,24 @@ def write_settings_gradle(modules, output_path):
     for module in modules:
         lines.append(f"include('{module}')")
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write("\n".join(lines).strip() + "\n")
-
-    log_success(f"\u2705 settings.gradle written at {output_path} with modules: {modules}")
+    changed = write_if_changed(output_path, "\n".join(lines).strip() + "\n")
+    if changed:
+        log_success(f"\u2705 settings.gradle written at {output_path} with modules: {modules}")
+    return changed
 
 def write_fixed(path, content, backup=True):
-    if backup and os.path.exists(path):
-        os.rename(path, path + ".bak")
-        print(f"\ud83d\uddd6\ufe0f Backup created at {path + '.bak'}")
-
-    with open(path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(content.strip() + "\n")
+    changed = write_if_changed(path, content.strip() + "\n", backup=backup)
+    if not changed:
+        print("\u2139\ufe0f  Fixed build.gradle is identical to the current one.")
+        return False
 
+    if backup and os.path.exists(path + ".bak"):
+        print(f"\U0001f5d6\ufe0f Backup created at {path + '.bak'}")
     log_success("\u2705 Fixed build.gradle written.")
+    return True
 
 def write_gitignore(output_path):
-    content = """
+    content = textwrap.dedent("""
     # Gradle
     .gradle/
     build/
@@ -199,7 +312,8 @@ def write_gitignore(output_path):
 
     # Logs
     *.log
-    """
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(content.strip() + "\n")
-    log_success("\u2705 .gitignore written.")
+    """)
+    changed = write_if_changed(output_path, content.strip() + "\n")
+    if changed:
+        log_success("\u2705 .gitignore written.")
+    return changed
@@ -0,0 +1,195 @@
+import os
+import re
+from dataclasses import dataclass, field
+
+try:
+    import tiktoken
+except ImportError:  # Optional: falls back to a character-based estimate
+    tiktoken = None
+
+# Prefix Gradle adds to every line in --info/--debug output:
+# "2024-05-01T10:00:00.123+0000 [ERROR] [org.gradle.internal.buildevents.BuildExceptionReporter] ..."
+LOG_PREFIX_RE = re.compile(r"^\S+ \[(?P<level>[A-Z]+)\] \[[^\]]*\] ?")
+TASK_RE = re.compile(r"(?:Execution failed for task '(?P<quoted>[^']+)'|> Task (?P<task>\S+) FAILED)")
+# "A problem occurred evaluating project ':core'", "configuration ':core:compileClasspath'"
+PROJECT_RE = re.compile(r"\b(?P<kind>project|configuration) '(?P<path>:[^']*)'")
+LOCATION_RES = [
+    # kotlinc: "e: file:///src/App.kt:12:5 Unresolved reference: foo"
+    re.compile(r"^e: (?:file://)?(?P<loc>\S+:\d+):\d+ (?P<msg>.*)"),
+    # javac / groovyc: "/src/App.java:12: error: cannot find symbol"
+    re.compile(r"(?P<loc>(?:[A-Za-z]:)?[^\s:'\"(]+\.(?:java|kt|groovy|gradle|kts):\d+)(?::\d+)?:\s*(?:error:\s*)?(?P<msg>.*)"),
+    # Gradle script errors: "Build file '/repo/build.gradle' line: 23"
+    re.compile(r"(?:Build file|Settings file) '(?P<file>[^']+)' line: (?P<line>\d+)")
+]
+EXCEPTION_RE = re.compile(r"^(?:Caused by: )?(?P<exc>(?:[a-z_$][\w$]*\.)+[A-Z][\w$]*(?:Exception|Error|Failure))(?::\s*(?P<msg>.*))?$")
+SECTION_HEADER_RE = re.compile(r"^\* (?P<name>What went wrong|Try|Exception is|Get more help|Where)(?: at https?://\S+)?:")
+
+MAX_LOCATIONS = 20
+MAX_EXCEPTIONS = 10
+MAX_SECTION_LINES = 40
+FALLBACK_TAIL_LINES = 300
+
+
+@dataclass
+class ErrorSignature:
+    """The parts of a Gradle failure log that matter for fixing it."""
+    failing_tasks: list = field(default_factory=list)
+    what_went_wrong: list = field(default_factory=list)
+    where: list = field(default_factory=list)
+    locations: list = field(default_factory=list)
+    exceptions: list = field(default_factory=list)
+
+    def is_empty(self):
+        return not (self.failing_tasks or self.what_went_wrong or self.locations or self.exceptions)
+
+
+def _strip_prefix(line):
+    """Removes the --debug/--info log prefix; returns (level or None, message)."""
+    match = LOG_PREFIX_RE.match(line)
+    if match:
+        return match.group("level"), line[match.end():]
+    return None, line
+
+
+def _append_unique(items, value, limit):
+    if value and value not in items and len(items) < limit:
+        items.append(value)
+
+
+def analyze_log(log_text):
+    """
+    Extracts an ErrorSignature from Gradle output: failing task paths, the
+    "What went wrong" and "Where" sections, file:line locations and the
+    exception chain. DEBUG/INFO noise is ignored.
+    """
+    signature = ErrorSignature()
+    section = None
+    section_lines = []
+
+    def close_section():
+        text = "\n".join(section_lines).strip()
+        if section == "What went wrong":
+            _append_unique(signature.what_went_wrong, text, MAX_EXCEPTIONS)
+        elif section == "Where":
+            _append_unique(signature.where, text, MAX_EXCEPTIONS)
+
+    for raw_line in (log_text or "").splitlines():
+        level, line = _strip_prefix(raw_line.rstrip())
+        if level == "DEBUG" or (level and level != "ERROR" and section is None and "FAILED" not in line):
+            continue
+
+        header = SECTION_HEADER_RE.match(line)
+        if header or line.startswith("FAILURE:") or line.startswith("BUILD FAILED"):
+            close_section()
+            section = header.group("name") if header else None
+            section_lines = []
+            continue
+
+        if section in {"What went wrong", "Where"}:
+            if len(section_lines) < MAX_SECTION_LINES:
+                section_lines.append(line)
+
+        for match in TASK_RE.finditer(line):
+            _append_unique(signature.failing_tasks, match.group("quoted") or match.group("task"), MAX_LOCATIONS)
+
+        for location_re in LOCATION_RES:
+            match = location_re.search(line)
+            if match:
+                groups = match.groupdict()
+                location = groups.get("loc") or f"{groups['file']}:{groups['line']}"
+                message = (groups.get("msg") or "").strip()
+                _append_unique(signature.locations, f"{location} {message}".strip(), MAX_LOCATIONS)
+                break
+
+        stripped = line.strip()
+        if stripped.startswith("at "):
+            continue
+        match = EXCEPTION_RE.match(stripped)
+        if match:
+            entry = match.group("exc") + (f": {match.group('msg')}" if match.group("msg") else "")
+            _append_unique(signature.exceptions, entry, MAX_EXCEPTIONS)
+
+    close_section()
+    return signature
+
+
+def task_project(task_path):
+    """Project path of a task path: ':core:api:compileJava' -> ':core:api', ':test' -> ':'."""
+    project = task_path.rsplit(":", 1)[0] if ":" in task_path else ""
+    return project or ":"
+
+
+def failing_projects(signature):
+    """
+    Gradle project paths the failure belongs to, from the failing tasks and the
+    projects/configurations named under "What went wrong"; ':' is the root project.
+    """
+    projects = [task_project(task) for task in signature.failing_tasks]
+    for text in signature.what_went_wrong:
+        for match in PROJECT_RE.finditer(text):
+            path = match.group("path")
+            projects.append(task_project(path) if match.group("kind") == "configuration" else path)
+    return list(dict.fromkeys(projects))
+
+
+def project_dir(repo_dir, project_path):
+    """Directory of a Gradle project, following the include('a:b') -> a/b layout settings.gradle uses."""
+    return os.path.join(repo_dir, *[part for part in project_path.split(":") if part])
+
+
+def format_signature(signature):
+    """Renders an ErrorSignature as the compact text block sent to the LLM."""
+    parts = []
+    if signature.failing_tasks:
+        parts.append("Failing task(s): " + ", ".join(signature.failing_tasks))
+    for text in signature.what_went_wrong:
+        parts.append("What went wrong:\n" + text)
+    for text in signature.where:
+        parts.append("Where:\n" + text)
+    if signature.locations:
+        parts.append("Locations:\n" + "\n".join(f"- {loc}" for loc in signature.locations))
+    if signature.exceptions:
+        parts.append("Exception chain:\n" + "\n".join(f"- {exc}" for exc in signature.exceptions))
+    return "\n\n".join(parts)
+
+
+def _filtered_tail(log_text, max_lines=FALLBACK_TAIL_LINES):
+    lines = []
+    for raw_line in (log_text or "").splitlines():
+        level, line = _strip_prefix(raw_line)
+        if level != "DEBUG":
+            lines.append(line)
+    return "\n".join(lines[-max_lines:])
+
+
+def summarize_error_log(log_text):
+    """
+    Returns the error text to put in a fixer prompt: the formatted signature, or
+    the last non-DEBUG lines when no signature could be extracted.
+    """
+    signature = analyze_log(log_text)
+    if signature.is_empty():
+        return _filtered_tail(log_text)
+    return format_signature(signature)
+
+
+def count_tokens(text, model="gpt-4"):
+    """Counts prompt tokens with tiktoken when installed, else estimates ~4 chars per token."""
+    if tiktoken is not None:
+        try:
+            return len(tiktoken.encoding_for_model(model).encode(text))
+        except Exception:
+            pass
+    return (len(text) + 3) // 4
+
+
+def report_prompt_reduction(prompt, raw_error, error_signature, model="gpt-4"):
+    """
+    Prints prompt token counts with the raw log tail (before) and with the
+    extracted signature (after), and returns them as a tuple.
+    """
+    after = count_tokens(prompt, model)
+    before = after - count_tokens(error_signature, model) + count_tokens(raw_error, model)
+    saved = 1 - after / before if before else 0
+    print(f"📉 Prompt tokens: {before} → {after} ({saved:.0%} smaller with error signature)")
+    return before, after
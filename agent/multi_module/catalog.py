@@ -0,0 +1,137 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from agent import gradle_writer
+from agent.utils.output_utils import write_if_changed
+
+CATALOG_PATH = os.path.join("gradle", "libs.versions.toml")
+# Gradle rejects these as catalog aliases (or as their first segment)
+RESERVED_ALIASES = {"bundles", "versions", "plugins", "extensions", "convention", "class"}
+
+
+def _camel(*parts):
+    """
+    Gradle turns '-', '_' and '.' in aliases into nested accessors, so aliases are
+    camelCase words: spring-boot-starter-web -> springBootStarterWeb.
+    """
+    words = [word for part in parts for word in re.split(r"[^A-Za-z0-9]+", part) if word]
+    if not words:
+        return "lib"
+    alias = words[0][0].lower() + words[0][1:] + "".join(word[0].upper() + word[1:] for word in words[1:])
+    if not alias[0].isalpha():
+        alias = "v" + alias
+    if alias in RESERVED_ALIASES:
+        alias += "Lib"
+    return alias
+
+
+def _unique(candidates, taken):
+    for candidate in candidates:
+        if candidate not in taken:
+            return candidate
+    base = candidates[-1]
+    suffix = 2
+    while f"{base}{suffix}" in taken:
+        suffix += 1
+    return f"{base}{suffix}"
+
+
+@dataclass
+class VersionCatalog:
+    """
+    Every external dependency and plugin of a reactor, deduplicated.
+
+    Attributes:
+        versions (dict): Version alias -> version.
+        libraries (dict): Library alias -> (groupId, artifactId, version alias).
+        plugins (dict): Plugin alias -> (plugin id, version).
+    """
+    versions: dict = field(default_factory=dict)
+    libraries: dict = field(default_factory=dict)
+    plugins: dict = field(default_factory=dict)
+    _library_aliases: dict = field(default_factory=dict, repr=False)
+    _plugin_aliases: dict = field(default_factory=dict, repr=False)
+
+    def library_alias(self, group, artifact, version):
+        return self._library_aliases.get((group, artifact, version))
+
+    def plugin_alias(self, plugin_id, version):
+        return self._plugin_aliases.get((plugin_id, version))
+
+    def to_toml(self):
+        lines = ["# Generated by MavenToGradleAgent from the Maven reactor", "", "[versions]"]
+        lines += [f"{alias} = {json.dumps(version)}" for alias, version in self.versions.items()]
+        lines += ["", "[libraries]"]
+        for alias, (group, artifact, version_ref) in self.libraries.items():
+            lines.append(f"{alias} = {{ module = {json.dumps(f'{group}:{artifact}')}, "
+                         f"version.ref = {json.dumps(version_ref)} }}")
+        if self.plugins:
+            lines += ["", "[plugins]"]
+            for alias, (plugin_id, version) in self.plugins.items():
+                lines.append(f"{alias} = {{ id = {json.dumps(plugin_id)}, version = {json.dumps(version)} }}")
+        return "\n".join(lines) + "\n"
+
+
+def build_catalog(all_data, reactor):
+    """
+    Builds the catalog in one pass over the parsed modules (as returned by
+    multi_module.parser.parse_modules); reactor modules (multi_module.graph) are skipped. Versions are resolved exactly as
+    gradle_writer.write_build_gradle resolves them, so every written dependency
+    finds its alias. A group whose artifacts all use one version shares a single
+    version entry (e.g. springframeworkBoot = "3.2.5").
+    """
+    coordinates = {}
+    group_versions = {}
+    plugin_versions = set()
+    for data in all_data.values():
+        properties = data.get("props") or {}
+        boot_version = (data.get("plugin_versions") or {}).get(gradle_writer.SPRING_BOOT_PLUGIN_KEY)
+        for group, artifact, version, _ in data.get("deps", []):
+            if reactor.module_for(group, artifact):
+                continue
+            version = gradle_writer.resolve_version(group, artifact, version, properties, verbose=False,
+                                                    boot_version=boot_version)
+            coordinates.setdefault((group, artifact, version), None)
+            group_versions.setdefault(group, set()).add(version)
+        if boot_version:
+            plugin_versions.add(boot_version)
+
+    catalog = VersionCatalog()
+    artifacts_per_group = {}
+    for group, artifact, _ in coordinates:
+        artifacts_per_group.setdefault(group, set()).add(artifact)
+
+    group_version_alias = {}
+    for group, versions in group_versions.items():
+        if len(versions) == 1 and len(artifacts_per_group[group]) > 1:
+            segments = group.split(".")
+            alias = _unique([_camel(*segments[-2:]), _camel(*segments)], catalog.versions)
+            catalog.versions[alias] = next(iter(versions))
+            group_version_alias[group] = alias
+
+    for group, artifact, version in sorted(coordinates, key=lambda c: (c[1], c[0], c[2])):
+        segments = group.split(".")
+        alias = _unique([_camel(artifact), _camel(segments[-1], artifact), _camel(group, artifact),
+                         _camel(group, artifact, version)], catalog.libraries)
+        version_alias = group_version_alias.get(group)
+        if not version_alias:
+            version_alias = _unique([alias], catalog.versions)
+            catalog.versions[version_alias] = version
+        catalog.libraries[alias] = (group, artifact, version_alias)
+        catalog._library_aliases[(group, artifact, version)] = alias
+
+    for version in sorted(plugin_versions):
+        alias = _unique(["springBoot", _camel("springBoot", version)], catalog.plugins)
+        catalog.plugins[alias] = (gradle_writer.SPRING_BOOT_PLUGIN_ID, version)
+        catalog._plugin_aliases[(gradle_writer.SPRING_BOOT_PLUGIN_ID, version)] = alias
+    return catalog
+
+
+def write_catalog(catalog, root_path):
+    """Writes gradle/libs.versions.toml under root_path; returns True if it changed."""
+    path = os.path.join(root_path, CATALOG_PATH)
+    changed = write_if_changed(path, catalog.to_toml())
+    print(f"Version catalog {'written' if changed else 'unchanged'} at {path}: "
+          f"{len(catalog.libraries)} libraries, {len(catalog.versions)} versions, {len(catalog.plugins)} plugins")
+    return changed
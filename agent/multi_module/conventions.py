@@ -0,0 +1,172 @@
+import os
+from dataclasses import dataclass, field
+from agent.utils.output_utils import write_if_changed
+
+CONVENTION_PLUGIN_ID = "migration.java-conventions"
+BUILD_SRC_DIR = "buildSrc"
+CONVENTION_SCRIPT = os.path.join(BUILD_SRC_DIR, "src", "main", "groovy", f"{CONVENTION_PLUGIN_ID}.gradle")
+MODES = ("none", "subprojects", "buildSrc")
+# Plugins that can move to the shared logic: core plugins, or external ones with a known version
+HOISTABLE_CORE_PLUGINS = {"java"}
+
+
+@dataclass
+class Conventions:
+    """
+    Build configuration every module shares, emitted once instead of per module.
+
+    Attributes:
+        mode (str): "subprojects" (a block in the root build.gradle) or "buildSrc"
+            (a precompiled convention plugin applied by every module).
+        plugins (list): (entry, plugin id, version) tuples from plan_build_gradle.
+        ext (list): Extra property entries every module defines with the same value.
+        repositories (list): Repository entries, when identical in every module.
+        dependencies (list): (entry, coordinates) tuples declared by every module.
+        blocks (list): Plugin-specific configuration blocks found in every module.
+    """
+    mode: str
+    plugins: list = field(default_factory=list)
+    ext: list = field(default_factory=list)
+    repositories: list = field(default_factory=list)
+    dependencies: list = field(default_factory=list)
+    blocks: list = field(default_factory=list)
+
+    def is_empty(self):
+        return not (self.plugins or self.ext or self.repositories or self.dependencies or self.blocks)
+
+
+def _hoistable_plugin(plugin):
+    _, plugin_id, version = plugin
+    return plugin_id in HOISTABLE_CORE_PLUGINS or bool(version)
+
+
+def _common(items_per_module):
+    """Items present in every module, in the first module's order."""
+    first, *others = items_per_module
+    shared = set(first).intersection(*others) if others else set(first)
+    return [item for item in dict.fromkeys(first) if item in shared]
+
+
+def find_conventions(module_sections, mode):
+    """
+    Intersects the planned build files of a reactor's modules (not the root).
+
+    Args:
+        module_sections (list): Sections from gradle_writer.plan_build_gradle, one per module.
+        mode (str): "subprojects" or "buildSrc".
+
+    Returns:
+        Conventions or None: None when there are fewer than two modules or nothing is shared.
+    """
+    if mode not in MODES[1:] or len(module_sections) < 2:
+        return None
+
+    conventions = Conventions(mode=mode)
+    conventions.plugins = [plugin for plugin in _common([s["plugins"] for s in module_sections])
+                           if _hoistable_plugin(plugin)]
+    conventions.ext = _common([s["ext"] for s in module_sections])
+    repositories = [tuple(s["repositories"]) for s in module_sections]
+    if len(set(repositories)) == 1:
+        conventions.repositories = list(repositories[0])
+    # Project dependencies stay in the modules; a module cannot depend on itself
+    conventions.dependencies = [dep for dep in _common([s["dependencies"] for s in module_sections])
+                                if dep[1] is not None]
+    conventions.blocks = _common([s["blocks"] for s in module_sections])
+    return None if conventions.is_empty() else conventions
+
+
+def apply_to_module(sections, conventions):
+    """Returns a copy of a module's sections with the shared configuration removed."""
+    hoisted_plugins = set(conventions.plugins)
+    plugins = [plugin for plugin in sections["plugins"] if plugin not in hoisted_plugins]
+    if conventions.mode == "buildSrc":
+        plugins.insert(0, (f"id '{CONVENTION_PLUGIN_ID}'", CONVENTION_PLUGIN_ID, None))
+    hoisted_ext = set(conventions.ext)
+    hoisted_dependencies = set(conventions.dependencies)
+    hoisted_blocks = set(conventions.blocks)
+    return {
+        **sections,
+        "plugins": plugins,
+        "ext": [entry for entry in sections["ext"] if entry not in hoisted_ext],
+        "repositories": [] if conventions.repositories else sections["repositories"],
+        "dependencies": [dep for dep in sections["dependencies"] if dep not in hoisted_dependencies],
+        "blocks": [block for block in sections["blocks"] if block not in hoisted_blocks]
+    }
+
+
+def _indent(lines, depth=1):
+    return [f"{'    ' * depth}{line}" for line in lines]
+
+
+def _apply_plugin_line(entry, plugin_id):
+    if entry.startswith("alias(libs.plugins."):
+        return f"apply plugin: {entry[len('alias('):-1]}.get().pluginId"
+    return f"apply plugin: '{plugin_id}'"
+
+
+def apply_to_root(sections, conventions):
+    """
+    Returns a copy of the root project's sections carrying the shared configuration
+    (subprojects mode): external plugins are put on the classpath with `apply false`
+    and applied to every module from a subprojects {} block.
+    """
+    if conventions.mode != "subprojects":
+        return sections
+
+    plugins = list(sections["plugins"])
+    root_entries = {entry for entry, _, _ in plugins}
+    for entry, plugin_id, version in conventions.plugins:
+        if version and entry not in root_entries:
+            plugins.append((f"{entry} apply false", plugin_id, version))
+
+    body = [_apply_plugin_line(entry, plugin_id) for entry, plugin_id, _ in conventions.plugins]
+    if conventions.ext:
+        body += ["ext {", *_indent(conventions.ext), "}"]
+    if conventions.repositories:
+        body += ["repositories {", *_indent(conventions.repositories), "}"]
+    if conventions.dependencies:
+        body += ["dependencies {", *_indent(entry for entry, _ in conventions.dependencies), "}"]
+    for block in conventions.blocks:
+        body += block
+
+    footer = ["", "// Configuration shared by every module", "subprojects {", *_indent(body), "}"]
+    return {**sections, "plugins": plugins, "footer": sections["footer"] + footer}
+
+
+def write_build_src(conventions, root_path):
+    """
+    Writes buildSrc with a precompiled `migration.java-conventions` script plugin
+    (buildSrc mode). Catalog accessors are not visible to precompiled scripts, so
+    shared dependencies are written with their coordinates.
+
+    Returns:
+        list: Paths (relative to root_path) whose content changed.
+    """
+    if conventions.mode != "buildSrc":
+        return []
+
+    classpath = [f"implementation '{plugin_id}:{plugin_id}.gradle.plugin:{version}'"
+                 for _, plugin_id, version in conventions.plugins if version]
+    build_src = ["plugins {", "    id 'groovy-gradle-plugin'", "}", "", "repositories {",
+                 "    gradlePluginPortal()", "}"]
+    if classpath:
+        build_src += ["", "dependencies {", *_indent(classpath), "}"]
+
+    script = ["plugins {", *_indent(f"id '{plugin_id}'" for _, plugin_id, _ in conventions.plugins), "}"]
+    if conventions.ext:
+        script += ["", "ext {", *_indent(conventions.ext), "}"]
+    if conventions.repositories:
+        script += ["", "repositories {", *_indent(conventions.repositories), "}"]
+    if conventions.dependencies:
+        dependencies = [f"{config} '{group}:{artifact}:{version}'"
+                        for _, (config, group, artifact, version) in conventions.dependencies]
+        script += ["", "dependencies {", *_indent(dependencies), "}"]
+    for block in conventions.blocks:
+        script += ["", *block]
+
+    changed = []
+    for relative_path, lines in ((os.path.join(BUILD_SRC_DIR, "build.gradle"), build_src),
+                                 (CONVENTION_SCRIPT, script)):
+        if write_if_changed(os.path.join(root_path, relative_path), "\n".join(lines) + "\n"):
+            changed.append(relative_path)
+    return changed
@@ -1,26 +1,11 @@
 import os
-from lxml import etree
+from agent.pom_model import load_pom
+from agent.utils.source_scanner import find_main_class
 
 
 def extract_main_class(pom_path, src_dir):
     """Attempts to extract the fully qualified main class name."""
-    if not os.path.isdir(src_dir):
-        return None
-
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(".java"):
-                path = os.path.join(root, file)
-                try:
-                    with open(path, "r") as f:
-                        content = f.read()
-                        if "public static void main" in content:
-                            rel_path = os.path.relpath(path, src_dir)
-                            class_name = rel_path.replace(os.sep, ".").replace(".java", "")
-                            return class_name
-                except Exception:
-                    continue
-    return None
+    return find_main_class(src_dir)
 
 
 def detect_modules(pom_path, return_absolute=False):
@@ -28,14 +13,7 @@ def detect_modules(pom_path, return_absolute=False):
     if not os.path.exists(pom_path):
         raise FileNotFoundError(f"Missing pom.xml: {pom_path}")
 
-    tree = etree.parse(pom_path)
-    root = tree.getroot()
-
-    ns = root.nsmap.get(None)
-    nsmap = {"m": ns} if ns else {}
-
-    modules = root.xpath("//m:modules/m:module", namespaces=nsmap)
-    mod_list = [mod.text.strip() for mod in modules if mod.text]
+    mod_list = list(load_pom(pom_path).modules)
 
     if return_absolute:
         base_dir = os.path.dirname(os.path.abspath(pom_path))
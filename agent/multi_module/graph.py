@@ -0,0 +1,146 @@
+from collections import deque
+from dataclasses import dataclass, field
+
+ROOT_MODULE = "root"
+
+
+@dataclass
+class ReactorGraph:
+    """
+    Modules of a Maven reactor and the dependencies between them.
+
+    Attributes:
+        coordinates (dict): "groupId:artifactId" -> module name.
+        upstream (dict): Module name -> modules it depends on, in POM order.
+        downstream (dict): Module name -> modules that depend on it.
+    """
+    coordinates: dict = field(default_factory=dict)
+    upstream: dict = field(default_factory=dict)
+    downstream: dict = field(default_factory=dict)
+
+    @property
+    def modules(self):
+        return list(self.upstream)
+
+    def module_for(self, group, artifact):
+        """Module name declaring groupId:artifactId, or None for external artifacts."""
+        return self.coordinates.get(f"{group}:{artifact}")
+
+    def project_path(self, module):
+        """Gradle project path of a module, as included by settings.gradle."""
+        return ":" if module == ROOT_MODULE else f":{module}"
+
+    def module_for_project(self, project_path):
+        module = project_path.lstrip(":")
+        module = module or ROOT_MODULE
+        return module if module in self.upstream else None
+
+    def dependents(self, modules):
+        """The given modules plus everything downstream of them (breadth-first order)."""
+        seen = dict.fromkeys(module for module in modules if module in self.downstream)
+        queue = deque(seen)
+        while queue:
+            for dependent in self.downstream[queue.popleft()]:
+                if dependent not in seen:
+                    seen[dependent] = None
+                    queue.append(dependent)
+        return list(seen)
+
+    def find_cycles(self):
+        """
+        Strongly connected components with more than one module (or a module that
+        depends on itself), found with an iterative Tarjan walk.
+        """
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        cycles = []
+        counter = 0
+
+        for start in self.upstream:
+            if start in index:
+                continue
+            work = [(start, iter(self.upstream[start]))]
+            index[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, edges = work[-1]
+                for target in edges:
+                    if target not in index:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.upstream[target])))
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.upstream[node]:
+                            cycles.append(component[::-1])
+        return cycles
+
+    def topological_order(self, modules=None):
+        """
+        Modules ordered so every module comes after the modules it depends on
+        (Kahn's algorithm, ties kept in reactor order). Modules on a cycle cannot be
+        ordered and are appended last, in reactor order.
+
+        Args:
+            modules (iterable): Restrict the order to these modules (default: all).
+        """
+        selected = set(self.upstream if modules is None else modules) & set(self.upstream)
+        remaining = {module: sum(1 for dep in self.upstream[module] if dep in selected)
+                     for module in self.upstream if module in selected}
+        ready = deque(module for module, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            module = ready.popleft()
+            order.append(module)
+            for dependent in self.downstream[module]:
+                if dependent in remaining:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+        placed = set(order)
+        return order + [module for module in remaining if module not in placed]
+
+
+def build_graph(all_data):
+    """
+    Builds the reactor graph from parsed modules (multi_module.parser.parse_modules
+    output, which carries each module's "coordinates"). Dependencies are matched on
+    groupId:artifactId, so an external artifact that merely shares a module's
+    artifactId is not mistaken for it.
+    """
+    graph = ReactorGraph()
+    for name, data in all_data.items():
+        group, artifact = data.get("coordinates") or (None, None)
+        if artifact:
+            graph.coordinates.setdefault(f"{group}:{artifact}", name)
+        graph.upstream[name] = []
+        graph.downstream[name] = []
+
+    for name, data in all_data.items():
+        upstream = graph.upstream[name]
+        for group, artifact, _, _ in data.get("deps", []):
+            module = graph.coordinates.get(f"{group}:{artifact}")
+            if module and module not in upstream:
+                upstream.append(module)
+                graph.downstream[module].append(name)
+    return graph
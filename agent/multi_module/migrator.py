@@ -1,25 +1,52 @@
 import os
+from dataclasses import asdict
 from agent import (
-    pom_parser,
     gradle_writer,
     git_handler,
     builder,
     detector,
-    fixer
+    fixer,
+    fix_rules
 )
+from agent.log_analyzer import analyze_log, failing_projects
+from agent.utils import content_manifest, llm_cache, stage_journal
+from agent.utils.tracing import span
 from agent.utils.xml_utils import detect_modules
-from agent.multi_module import parser as mm_parser  # Retain if mm_parser is used
+from agent.multi_module import parser as mm_parser
+from agent.multi_module import catalog as version_catalog
+from agent.multi_module import conventions as build_conventions
+from agent.multi_module.graph import ReactorGraph, build_graph
 
-print("Using gradle_writer from:", gradle_writer.__file__)
+# Reference dependencies through gradle/libs.versions.toml instead of inline coordinates
+VERSION_CATALOG = os.getenv("GRADLE_VERSION_CATALOG", "false").lower() in ("1", "true", "yes")
+# Where configuration shared by every module goes: "none", "subprojects" (root build.gradle) or "buildSrc"
+GRADLE_CONVENTIONS = os.getenv("GRADLE_CONVENTIONS", "none")
 
 
-def migrate_multi_module_project(root_path):
+def migrate_multi_module_project(root_path, workers=None, catalog=None, conventions=None, manifest=None):
     """
-    Converts a multi-module Maven project to Gradle by generating build.gradle and settings.gradle
+    Converts a multi-module Maven project to Gradle by generating build.gradle and settings.gradle.
+    Module POMs are parsed in parallel; `workers` overrides the PARSE_WORKERS process count.
+    With `catalog` (default: GRADLE_VERSION_CATALOG), every external dependency goes into
+    one gradle/libs.versions.toml and module builds refer to it as libs.<alias>.
+    `conventions` (default: GRADLE_CONVENTIONS) hoists the plugins, repositories,
+    dependencies and blocks every module shares into the root subprojects {} block
+    or a buildSrc convention plugin; module files then keep only their differences.
+    With a `manifest` (utils.content_manifest), modules whose POMs, parent POMs and
+    generated build.gradle are unchanged since the last run are not regenerated.
+
+    Returns:
+        ReactorGraph or bool: The reactor's module graph, or False if there are no submodules.
     """
+    catalog = VERSION_CATALOG if catalog is None else catalog
+    conventions = conventions or GRADLE_CONVENTIONS
+    if conventions not in build_conventions.MODES:
+        print(f"⚠️ Unknown GRADLE_CONVENTIONS '{conventions}', expected one of {build_conventions.MODES}")
+        conventions = "none"
     print("Checking for multi-module structure...")
 
-    modules = detect_modules(os.path.join(root_path, "pom.xml"))
+    with span("detect modules"):
+        modules = detect_modules(os.path.join(root_path, "pom.xml"))
     if not modules:
         print("No submodules found. Skipping multi-module migration.")
         return False
@@ -27,66 +54,133 @@ def migrate_multi_module_project(root_path):
     print(f"Detected submodules: {modules}")
 
     all_modules = {"root": root_path, **{m: os.path.join(root_path, m) for m in modules}}
-    all_data = {}
-
-    for name, path in all_modules.items():
-        pom = os.path.join(path, "pom.xml")
-        if not os.path.exists(pom):
-            print(f"Missing pom.xml in {name}. Skipping...")
-            continue
-
-        deps, props = pom_parser.parse_dependencies(pom)
-        plugins = pom_parser.parse_build_plugins(pom)
-        plugin_mgmt = pom_parser.parse_plugin_management(pom)
+    with span("parse poms", modules=len(all_modules)):
+        all_data, parse_errors = mm_parser.parse_modules(all_modules, workers)
+    if parse_errors:
+        print(f"⚠️ {len(parse_errors)} module(s) failed to parse and were skipped: {sorted(parse_errors)}")
 
-        all_data[name] = {
-            "deps": deps,
-            "props": props,
-            "plugins": plugins,
-            "plugin_versions": plugin_mgmt
-        }
+    with span("reactor graph", modules=len(all_data)):
+        reactor = build_graph(all_data)
+        cycles = reactor.find_cycles()
+    for cycle in cycles:
+        print(f"⚠️ Circular module dependency (Gradle will reject it): {' -> '.join(cycle + cycle[:1])}")
 
     # Write settings.gradle (list all submodules)
-    gradle_writer.write_settings_gradle(modules, os.path.join(root_path, "settings.gradle"))
+    with span("write gradle files"):
+        gradle_writer.write_settings_gradle(modules, os.path.join(root_path, "settings.gradle"))
     print("settings.gradle written.")
 
-    # Write build.gradle for each module
+    reactor_catalog = None
+    if catalog:
+        with span("write version catalog"):
+            reactor_catalog = version_catalog.build_catalog(all_data, reactor)
+            version_catalog.write_catalog(reactor_catalog, root_path)
+
+    main_class = None
+    if "root" in all_data:
+        with span("detect main class"):
+            main_class = detector.extract_main_class(
+                os.path.join(root_path, "pom.xml"),
+                os.path.join(root_path, "src", "main", "java")
+            )
+
+    # Everything besides a module's own POM chain that its build.gradle depends on
+    shared_options = {
+        "catalog": content_manifest.options_digest(reactor_catalog.to_toml()) if reactor_catalog else None,
+        "conventions": conventions,
+        "reactor": sorted(reactor.coordinates.items())
+    }
+    if conventions != "none":
+        # Shared configuration is derived from every module, so any POM change affects them all
+        shared_options["inputs"] = {name: [content_manifest.file_digest(path) for path in data["inputs"]]
+                                    for name, data in all_data.items()}
+
+    # Plan build.gradle for each module
+    planned = {}
+    options = {}
     for name, data in all_data.items():
-        target_path = os.path.join(all_modules[name], "build.gradle")
+        options[name] = {**shared_options, "main_class": main_class if name == "root" else None}
+        if manifest and manifest.is_current(name, data["inputs"], options[name]):
+            print(f"build.gradle up to date for {name}, skipping")
+            continue
 
         gradle_args = {
             "deps": data["deps"],
-            "output_path": target_path,
-            "known_modules": modules,
+            "reactor": reactor,
             "properties": data["props"],
             "plugin_versions": data["plugin_versions"],
-            "build_plugins": data["plugins"]
+            "build_plugins": data["plugins"],
+            "catalog": reactor_catalog,
+            "main_class": options[name]["main_class"]
         }
+        planned[name] = gradle_writer.plan_build_gradle(**gradle_args)
 
-        if name == "root":
-            gradle_args["main_class"] = detector.extract_main_class(
-                os.path.join(root_path, "pom.xml"),
-                os.path.join(root_path, "src", "main", "java")
-            )
+    shared = build_conventions.find_conventions(
+        [sections for name, sections in planned.items() if name != "root"], conventions)
+    if shared:
+        print(f"Hoisting shared configuration ({conventions}): {len(shared.plugins)} plugins, "
+              f"{len(shared.dependencies)} dependencies, {len(shared.blocks)} blocks")
+        with span("write gradle files", module="buildSrc"):
+            build_conventions.write_build_src(shared, root_path)
+        planned = {name: build_conventions.apply_to_root(sections, shared) if name == "root"
+                   else build_conventions.apply_to_module(sections, shared)
+                   for name, sections in planned.items()}
 
-        gradle_writer.write_build_gradle(**gradle_args)
+    # Write build.gradle for each module
+    for name, sections in planned.items():
+        with span("write gradle files", module=name):
+            gradle_writer.write_build_gradle_sections(sections, os.path.join(all_modules[name], "build.gradle"))
         print(f"build.gradle written for {name}")
+        if manifest:
+            outputs = [os.path.join(all_modules[name], "build.gradle")]
+            if name == "root":
+                outputs += [os.path.join(root_path, path) for path in (
+                    "settings.gradle", version_catalog.CATALOG_PATH,
+                    os.path.join(build_conventions.BUILD_SRC_DIR, "build.gradle"), build_conventions.CONVENTION_SCRIPT)]
+            manifest.record(name, all_data[name]["inputs"], outputs, options[name])
+
+    return reactor
 
-    return True
 
+def _generate(repo_dir, manifest):
+    """Stage output of migrate_multi_module_project: the reactor graph and the incremental decisions."""
+    reactor = migrate_multi_module_project(repo_dir, manifest=manifest)
+    if not reactor:
+        return None
+    output = {"reactor": asdict(reactor)}
+    if manifest:
+        manifest.save()
+        output.update(regenerated=manifest.regenerated, skipped=manifest.skipped)
+    return output
 
-def migrate(repo_dir, branch, base_branch):
+
+def migrate(repo_dir, branch, base_branch, journal=None):
     """
     Wrapper for full multi-module migration including Git, build, and PR.
+    With MIGRATION_INCREMENTAL, a rerun rebuilds only the modules whose inputs changed
+    (or whose last build failed) plus their dependents, and skips the build entirely
+    when every module is unchanged and was verified before. Stages are recorded in
+    `journal` (utils.stage_journal), so a resumed run skips the ones that completed.
+    Returns True if the Gradle build passed, the branch was pushed and the PR exists.
     """
-    git_handler.create_branch(repo_dir, branch)
+    journal = journal or stage_journal.open_journal(repo_dir, branch=branch, base_branch=base_branch)
+    if not journal.done("create branch"):
+        git_handler.create_branch(repo_dir, branch)
+        journal.complete("create branch")
 
-    success = migrate_multi_module_project(repo_dir)
-    if not success:
+    manifest = content_manifest.load(repo_dir, branch) if content_manifest.INCREMENTAL else None
+    generated = journal.run("generate gradle files", lambda: _generate(repo_dir, manifest))
+    if not generated:
         print("Failed to process multi-module project.")
-        return
+        return False
+    reactor = ReactorGraph(**generated["reactor"])
+    if manifest and journal.resumed:
+        manifest.regenerated, manifest.skipped = generated["regenerated"], generated["skipped"]
 
-    builder.ensure_gradle_wrapper(repo_dir)
+    if not journal.done("gradle wrapper"):
+        with span("gradle wrapper"):
+            builder.ensure_gradle_wrapper(repo_dir)
+        journal.complete("gradle wrapper")
 
     # Collect files to commit
     files_to_commit = [
@@ -96,6 +190,13 @@ def migrate(repo_dir, branch, base_branch):
         "gradle/wrapper/gradle-wrapper.properties"
     ]
 
+    if os.path.exists(os.path.join(repo_dir, version_catalog.CATALOG_PATH)):
+        files_to_commit.append(version_catalog.CATALOG_PATH)
+    for build_src_file in (os.path.join(build_conventions.BUILD_SRC_DIR, "build.gradle"),
+                           build_conventions.CONVENTION_SCRIPT):
+        if os.path.exists(os.path.join(repo_dir, build_src_file)):
+            files_to_commit.append(build_src_file)
+
     # Collect all submodule build.gradle paths
     modules = detect_modules(os.path.join(repo_dir, "pom.xml"))
     all_paths = [repo_dir] + [os.path.join(repo_dir, m) for m in modules]
@@ -104,20 +205,92 @@ def migrate(repo_dir, branch, base_branch):
         if os.path.exists(gradle_file):
             files_to_commit.append(os.path.relpath(gradle_file, start=repo_dir))
 
-    git_handler.commit_and_push(repo_dir, branch, "Initial multi-module Gradle build files", files_to_commit)
+    if not journal.done("commit"):
+        git_handler.commit_and_push(repo_dir, branch, "Initial multi-module Gradle build files", files_to_commit)
+        journal.complete("commit")
 
-    if builder.run_gradle_build(repo_dir):
-        if not git_handler.pull_request_exists(branch, base_branch):
-            git_handler.create_pull_request(branch, base_branch, "Migrate to Gradle (multi-module)", "Automated migration.")
-        print("Multi-module migration completed and PR created.")
-    else:
-        print("Gradle build failed for multi-module project.")
-        print("Attempting auto-fix using fixer...")
-        fixer.attempt_fix(repo_dir)
+    targets = reactor.modules
+    if manifest:
+        stale = [module for module in reactor.modules
+                 if module in manifest.regenerated or not manifest.is_verified(module)]
+        targets = reactor.topological_order(reactor.dependents(stale))
+
+    def build():
+        if not targets:
+            verification = "skipped, every module is unchanged since its last successful build"
+            print(f"Gradle build {verification}.")
+            return {"success": True, "error": "", "verification": verification}
+        # The root project (or a first run) means the whole reactor
+        projects = [] if "root" in targets else [reactor.project_path(module) for module in targets]
+        with span("build", projects=",".join(projects) or ":"):
+            success = builder.run_project_builds(repo_dir, projects)
+        return {"success": success, "error": builder.get_last_error(),
+                "verification": ", ".join(projects) if projects else "full build"}
 
-        if builder.run_gradle_build(repo_dir):
+    built = journal.run("build", build)
+    success = built["success"]
+    pr_body = "Automated migration."
+    if not success:
+        def fix_and_rebuild():
+            print("Gradle build failed for multi-module project.")
+            error_log = built["error"]
+            # Fix and re-verify only the projects the failure points at (':' is the root project)
+            projects = failing_projects(analyze_log(error_log))
+            if projects:
+                print(f"Failing project(s): {', '.join(projects)}")
+            with span("fix rules"):
+                applied, changed = fix_rules.apply_rules(repo_dir, error_log)
+            llm_fixes = []
+            if not applied:
+                print("Attempting auto-fix using fixer...")
+                with span("llm fix"):
+                    changed = False
+                    for project in projects or [":"]:
+                        changed = fixer.attempt_fix(repo_dir, project, llm_fixes) or changed
+
+            if not changed:
+                print("The fix left the build files unchanged; skipping the rebuild.")
+                return False
+            git_handler.commit_and_push(repo_dir, branch, "Fix multi-module Gradle build", files_to_commit)
+            # Re-verify the failing modules and everything downstream of them, upstream first
+            failing = [reactor.module_for_project(project) for project in projects]
+            if projects and all(failing):
+                modules_to_verify = reactor.topological_order(reactor.dependents(failing))
+                projects = [reactor.project_path(module) for module in modules_to_verify]
+            else:
+                projects = []
+            with span("build", attempt=2, projects=",".join(projects) or ":"):
+                success = builder.run_project_builds(repo_dir, projects)
+            if not success:
+                # Cached fixes that did not pass would otherwise be served again on every rerun
+                for request in llm_fixes:
+                    fixer.reject_fix(*request)
+            return success
+
+        success = journal.run("fix", fix_and_rebuild)
+        if success:
             print("Gradle build succeeded after auto-fix.")
-            if not git_handler.pull_request_exists(branch, base_branch):
-                git_handler.create_pull_request(branch, base_branch, "Migrate to Gradle (multi-module)", "Auto-fixed migration.")
+            pr_body = "Auto-fixed migration."
         else:
-            print("Auto-fix failed. Manual intervention needed.")
\ No newline at end of file
+            print("Auto-fix failed. Manual intervention needed.")
+
+    if manifest:
+        if not journal.done("record verification"):
+            manifest.mark_verified(targets, success)
+            manifest.save()
+            journal.complete("record verification")
+        manifest.print_summary(built["verification"])
+
+    # Deferred publish pushes the verified branch here, once
+    # Push and PR failures stay out of the journal, so --resume retries them
+    success = success and journal.run_until_success("publish", lambda: git_handler.publish(repo_dir, branch))
+    success = success and journal.run_until_success("pull request", lambda: git_handler.open_pull_request(
+        branch, base_branch, "Migrate to Gradle (multi-module)", pr_body))
+    if success:
+        print("Multi-module migration completed and PR created.")
+
+    builder.print_attempt_timings()
+    builder.stop_gradle_daemon(repo_dir)
+    llm_cache.print_stats()
+    fix_rules.print_rule_stats()
+    return success
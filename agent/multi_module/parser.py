@@ -1,27 +1,143 @@
 import os
-from agent.pom_parser import parse_dependencies
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from agent import pom_parser
 
+# Worker processes used to parse module POMs; 0 or unset means one per CPU
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0") or 0)
+# Below this many POMs, process start-up costs more than the parse itself
+PARALLEL_PARSE_MIN_MODULES = 16
 
-def parse_all_modules(repo_root, module_names):
-    module_deps = {}
-    for module in module_names:
-        pom_path = os.path.join(repo_root, module, "pom.xml")
-        if os.path.exists(pom_path):
+
+def parse_module(pom_path):
+    """
+    Parses everything the Gradle writer needs from one module's pom.xml.
+
+    Returns:
+        tuple: (module data dict, seconds spent parsing)
+    """
+    start = time.perf_counter()
+    deps, props = pom_parser.parse_dependencies(pom_path)
+    data = {
+        "deps": deps,
+        "props": props,
+        "plugins": pom_parser.parse_build_plugins(pom_path),
+        "plugin_versions": pom_parser.parse_plugin_management(pom_path),
+        "coordinates": pom_parser.parse_coordinates(pom_path),
+        "inputs": pom_parser.parse_input_files(pom_path)
+    }
+    return data, time.perf_counter() - start
+
+
+def _resolve_workers(workers, job_count):
+    if not workers and job_count < PARALLEL_PARSE_MIN_MODULES:
+        return 1
+    workers = workers or PARSE_WORKERS or os.cpu_count() or 1
+    return max(1, min(workers, job_count))
+
+
+def _parse_serial(jobs):
+    results, errors = {}, {}
+    for name, pom in jobs.items():
+        try:
+            results[name] = parse_module(pom)
+        except Exception as e:
+            errors[name] = str(e)
+    return results, errors
+
+
+def _parse_parallel(jobs, workers):
+    results, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parse_module, pom): name for name, pom in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
             try:
-                deps = parse_dependencies(pom_path)
-                module_deps[module] = deps
+                results[name] = future.result()
+            except BrokenProcessPool:
+                raise
             except Exception as e:
-                print(f"❌ Failed to parse {module}/pom.xml: {e}")
+                errors[name] = str(e)
+    return results, errors
+
+
+def print_timing_summary(timings, wall_time, workers):
+    """
+    Prints per-stage parse timings. The summed worker time adds up the per-module
+    parse times measured inside the workers. Those ran side by side and exclude
+    process start-up, so the sum is no serial run time and no speedup is derived.
+    """
+    worker_time = sum(timings.values())
+    print(f"⏱️ Parsed {len(timings)} module POMs with {workers} worker(s) in {wall_time:.2f}s "
+          f"(summed worker time {worker_time:.2f}s)")
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]:
+        print(f"   - {name}: {seconds * 1000:.1f} ms")
+
+
+def parse_modules(all_modules, workers=None):
+    """
+    Parses the pom.xml of every module, in parallel across processes.
+
+    Args:
+        all_modules (dict): Module name -> module directory.
+        workers (int): Worker process count; defaults to PARSE_WORKERS or the CPU count.
+
+    Returns:
+        tuple: (all_data, errors) where all_data maps module name to
+        {"deps", "props", "plugins", "plugin_versions", "coordinates", "inputs"} in
+        all_modules order, and
+        errors maps module name to the parse error message.
+    """
+    jobs = {}
+    for name, path in all_modules.items():
+        pom = os.path.join(path, "pom.xml")
+        if not os.path.exists(pom):
+            print(f"Missing pom.xml in {name}. Skipping...")
+            continue
+        jobs[name] = pom
+
+    if not jobs:
+        return {}, {}
+
+    workers = _resolve_workers(workers, len(jobs))
+    start = time.perf_counter()
+    if workers > 1:
+        try:
+            results, errors = _parse_parallel(jobs, workers)
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(f"⚠️ Parallel parse unavailable ({e}). Falling back to serial parsing.")
+            workers = 1
+            results, errors = _parse_serial(jobs)
+    else:
+        results, errors = _parse_serial(jobs)
+    wall_time = time.perf_counter() - start
+
+    for name, message in errors.items():
+        print(f"❌ Failed to parse {name}/pom.xml: {message}")
+
+    all_data = {name: results[name][0] for name in jobs if name in results}
+    print_timing_summary({name: results[name][1] for name in all_data}, wall_time, workers)
+    return all_data, errors
+
+
+def parse_all_modules(repo_root, module_names, workers=None):
+    module_dirs = {}
+    for module in module_names:
+        if os.path.exists(os.path.join(repo_root, module, "pom.xml")):
+            module_dirs[module] = os.path.join(repo_root, module)
         else:
             print(f"⚠ No pom.xml found for module: {module}")
-    return module_deps
+
+    all_data, _ = parse_modules(module_dirs, workers)
+    return {module: (data["deps"], data["props"]) for module, data in all_data.items()}
 
 
 if __name__ == "__main__":
     repo_root = "repo"
     modules = ["core", "service", "web"]  # Example
     all_deps = parse_all_modules(repo_root, modules)
-    for mod, deps in all_deps.items():
+    for mod, (deps, _) in all_deps.items():
         print(f"\n📦 Module: {mod}")
-        for group, artifact, version in deps:
-            print(f"  - {group}:{artifact}:{version or ''}")
\ No newline at end of file
+        for group, artifact, version, _ in deps:
+            print(f"  - {group}:{artifact}:{version or ''}")
@@ -1,90 +1,261 @@
 import os
-from agent import git_handler, pom_parser, gradle_writer, builder, fixer
+from agent import git_handler, pom_parser, gradle_writer, builder, fixer, fix_rules, speculative
 from agent.multi_module import detector, migrator
-from agent.utils import xml_utils
+from agent.utils import xml_utils, llm_cache, tracing, content_manifest, stage_journal
+from agent.utils.tracing import span
 
 
-def run_migration():
+def run_migration(repo_dir="repo", branch=None, base_branch=None, resume=False):
+    """
+    Migrates one repository (cloned into repo_dir) from Maven to Gradle.
+
+    Every stage is timed; the run ends by writing a Chrome trace (TRACE_FILE, default
+    migration-trace.json next to repo_dir) and printing a per-stage summary. Completed
+    stages are recorded in a journal next to repo_dir; with `resume`, a run that died
+    part-way continues from the last completed stage in the same workspace, with the
+    parsed data and fix attempts it had already spent.
+
+    Returns:
+        bool: True if the Gradle build passed, the branch was pushed and the PR exists.
+    """
+    tracing.reset()
+    try:
+        with span("migration", repo=repo_dir, resume=resume):
+            return _run_migration(repo_dir, branch, base_branch, resume)
+    finally:
+        tracing.finish(tracing.TRACE_FILE or os.path.join(
+            os.path.dirname(os.path.abspath(repo_dir)), "migration-trace.json"))
+
+
+def parse_pom(pom_path):
+    """Everything the single-module writer needs from a pom.xml (JSON-serializable)."""
+    with span("parse pom"):
+        deps, props = pom_parser.parse_dependencies(pom_path)
+        return {
+            "deps": deps,
+            "props": props,
+            "plugin_management": pom_parser.parse_plugin_management(pom_path),
+            "build_plugins": pom_parser.parse_build_plugins(pom_path),
+            "inputs": pom_parser.parse_input_files(pom_path)
+        }
+
+
+def write_gradle_files(repo_dir, parsed, main_class=None):
+    """
+    Writes build.gradle, settings.gradle and .gitignore of a single-module project.
+
+    Returns:
+        list: The paths written (or left unchanged because their content matched).
+    """
+    gradle_path = os.path.join(repo_dir, "build.gradle")
+    settings_path = os.path.join(repo_dir, "settings.gradle")
+    gitignore_path = os.path.join(repo_dir, ".gitignore")
+    with span("write gradle files"):
+        gradle_writer.write_build_gradle(
+            parsed["deps"],
+            gradle_path,
+            main_class=main_class,
+            known_modules=[],
+            properties=parsed["props"],
+            plugin_versions=parsed["plugin_management"],
+            build_plugins=parsed["build_plugins"]
+        )
+        gradle_writer.write_settings_gradle([], settings_path)
+        gradle_writer.write_gitignore(gitignore_path)
+    return [gradle_path, settings_path, gitignore_path]
+
+
+def _candidate_fixes(pom_xml, build_gradle, error):
+    """
+    Speculative fix candidates that differ from the current build.gradle. If none
+    does, the list is requested once more without the cache, since a cached list
+    would come back identical on every attempt; empty means use the serial fix.
+    """
+    for bypass_cache in (None, True):
+        candidates = fixer.fix_build_gradle_candidates(pom_xml, build_gradle, error,
+                                                       speculative.SPECULATIVE_FIXES, bypass_cache=bypass_cache)
+        candidates = [c for c in candidates if c.strip() != build_gradle.strip()]
+        if candidates or bypass_cache:
+            return candidates
+        print("ℹ️ No candidate changes build.gradle; asking again without the cache...")
+
+
+def _run_migration(repo_dir, branch, base_branch, resume):
     print("🚀 Starting Maven to Gradle AI agent...")
 
-    repo_dir = "repo"
-    branch = os.getenv("FEATURE_BRANCH_NAME", "gradle-migration")
-    base_branch = os.getenv("BASE_BRANCH_NAME", "main")
+    branch = branch or os.getenv("FEATURE_BRANCH_NAME", "gradle-migration")
+    base_branch = base_branch or os.getenv("BASE_BRANCH_NAME", "main")
+    journal = stage_journal.open_journal(repo_dir, resume, branch=branch, base_branch=base_branch)
 
     # 1. Clone the GitHub repository
-    git_handler.clone_repo(repo_dir)
+    if not journal.done("clone"):
+        git_handler.clone_repo(repo_dir)
+        journal.complete("clone")
 
     # 2. Check for multi-module project
     pom_path = os.path.join(repo_dir, "pom.xml")
-    if detector.is_multi_module(pom_path):
+
+    def detect_multi_module():
+        with span("detect modules"):
+            return detector.is_multi_module(pom_path)
+
+    if journal.run("detect modules", detect_multi_module):
         print("📦 Detected multi-module Maven project.")
-        migrator.migrate(repo_dir, branch, base_branch)
-        return
+        return migrator.migrate(repo_dir, branch, base_branch, journal=journal)
 
     # ---- Single-module logic continues here ----
     src_path = os.path.join(repo_dir, "src", "main", "java")
-    deps, props = pom_parser.parse_dependencies(pom_path)
-    plugin_mgmt = pom_parser.parse_plugin_management(pom_path)
-    dep_mgmt = pom_parser.parse_dependency_management(pom_path)
+    parsed = journal.run("parse pom", lambda: parse_pom(pom_path))
 
     # 3. Attempt to extract main class
-    main_class = detector.extract_main_class(pom_path, src_path)
+    def detect_main_class():
+        with span("detect main class"):
+            return detector.extract_main_class(pom_path, src_path)
+
+    main_class = journal.run("detect main class", detect_main_class)
 
     # 4. Create feature branch
-    git_handler.create_branch(repo_dir, branch)
+    if not journal.done("create branch"):
+        git_handler.create_branch(repo_dir, branch)
+        journal.complete("create branch")
 
     # 5. Generate Gradle files
     gradle_path = os.path.join(repo_dir, "build.gradle")
-    settings_path = os.path.join(repo_dir, "settings.gradle")
-    gitignore_path = os.path.join(repo_dir, ".gitignore")
-    project_name = os.path.basename(os.path.abspath(repo_dir))
-
-    gradle_writer.write_build_gradle(
-        deps,
-        gradle_path,
-        main_class=main_class,
-        known_modules=[],
-        properties=props,
-        dependency_mgmt=dep_mgmt,
-        plugin_mgmt=plugin_mgmt
-    )
-    gradle_writer.write_settings_gradle(settings_path, project_name)
-    gradle_writer.write_gitignore(gitignore_path)
+
+    # Unchanged POMs (and parents) with unchanged generated files need no regeneration
+    manifest = content_manifest.load(repo_dir, branch) if content_manifest.INCREMENTAL else None
+
+    def generate():
+        options = {"main_class": main_class}
+        if manifest and manifest.is_current("root", parsed["inputs"], options):
+            print("♻️ Inputs unchanged since the last run; keeping the generated Gradle files.")
+        else:
+            outputs = write_gradle_files(repo_dir, parsed, main_class)
+            if manifest:
+                manifest.record("root", parsed["inputs"], outputs, options)
+        if not manifest:
+            return {}
+        manifest.save()
+        return {"regenerated": manifest.regenerated, "skipped": manifest.skipped}
+
+    generated = journal.run("generate gradle files", generate)
+    if manifest and journal.resumed:
+        manifest.regenerated, manifest.skipped = generated["regenerated"], generated["skipped"]
 
     # 6. Generate Gradle wrapper
-    builder.ensure_gradle_wrapper(repo_dir)
+    if not journal.done("gradle wrapper"):
+        with span("gradle wrapper"):
+            builder.ensure_gradle_wrapper(repo_dir)
+        journal.complete("gradle wrapper")
 
     # 7. Commit all Gradle-related files including wrapper
     files_to_commit = [
         "build.gradle", "settings.gradle", ".gitignore",
         "gradlew", "gradlew.bat", "gradle/wrapper/gradle-wrapper.jar", "gradle/wrapper/gradle-wrapper.properties"
     ]
-    git_handler.commit_and_push(repo_dir, branch, "Initial Gradle build files", files_to_commit)
+    if not journal.done("commit"):
+        git_handler.commit_and_push(repo_dir, branch, "Initial Gradle build files", files_to_commit)
+        journal.complete("commit")
 
     # 8. Run Gradle build and retry if needed
-    success = builder.run_gradle_build(repo_dir)
-    attempts = 0
+    def build():
+        if manifest and manifest.is_verified("root") and "root" in manifest.skipped:
+            verification = "skipped, nothing changed since the last successful build"
+            print(f"✅ Gradle build {verification}.")
+            return {"success": True, "error": "", "verification": verification}
+        with span("build"):
+            success = builder.run_gradle_build(repo_dir)
+        return {"success": success, "error": builder.get_last_error(), "verification": "full build"}
+
+    built = journal.run("build", build)
+    verification = built["verification"]
+    # Fix attempts already spent by an interrupted run count towards the limit
+    success = journal.state.get("success", built["success"])
+    error = journal.state.get("error", built["error"])
+    attempts = journal.state.get("attempts", 0)
 
     while not success and attempts < 3:
-        print(f"🔁 Build failed. Attempt {attempts + 1}/3. Asking OpenAI...")
-        error = builder.get_last_error()
+        print(f"🔁 Build failed. Attempt {attempts + 1}/3.")
+        # Inputs of this attempt's LLM fix: the cached answer is dropped if it does not pass
+        llm_request = None
+
+        # Known failure patterns are patched locally before asking OpenAI
+        with span("fix rules", attempt=attempts + 1):
+            applied, changed = fix_rules.apply_rules(repo_dir, error, gradle_path)
+        if applied and changed:
+            git_handler.commit_and_push(repo_dir, branch, f"Fix build.gradle using rules: {', '.join(applied)}", changed)
+        else:
+            with open(pom_path) as f:
+                pom_xml = f.read()
+            with open(gradle_path) as f:
+                build_gradle = f.read()
+            candidates = []
+            if speculative.SPECULATIVE_FIXES > 1:
+                print(f"🤖 Asking OpenAI for {speculative.SPECULATIVE_FIXES} candidate fixes...")
+                with span("llm fix", attempt=attempts + 1, candidates=speculative.SPECULATIVE_FIXES):
+                    candidates = _candidate_fixes(pom_xml, build_gradle, error)
 
-        with open(pom_path) as f:
-            pom_xml = f.read()
-        with open(gradle_path) as f:
-            build_gradle = f.read()
+            if candidates:
+                # Candidates are verified side by side in worktrees of HEAD, which every fix above was committed to
+                winner, results = speculative.verify_candidates(repo_dir, candidates)
+                # Without a passing candidate, keep the first one, as the serial loop would have
+                chosen = winner or results[0]
+                changed = gradle_writer.write_fixed(gradle_path, chosen.content)
+                if changed:
+                    git_handler.commit_and_push(repo_dir, branch, "Fix build.gradle using AI", ["build.gradle"])
+                attempts += 1
+                # The candidate was already built in an identical worktree, so its outcome stands
+                success = winner is not None
+                if not success:
+                    fixer.reject_fix(pom_xml, build_gradle, error, speculative.SPECULATIVE_FIXES)
+                    error = chosen.error
+                journal.update(attempts=attempts, success=success, error=error)
+                continue
 
-        fixed = fixer.fix_build_gradle(pom_xml, build_gradle, error)
-        gradle_writer.write_fixed(gradle_path, fixed)
-        git_handler.commit_and_push(repo_dir, branch, "Fix build.gradle using AI", ["build.gradle"])
+            print("🤖 Asking OpenAI...")
+            with span("llm fix", attempt=attempts + 1):
+                fixed = fixer.fix_build_gradle(pom_xml, build_gradle, error)
+                changed = gradle_writer.write_fixed(gradle_path, fixed)
+                llm_request = (pom_xml, build_gradle, error)
+            if changed:
+                git_handler.commit_and_push(repo_dir, branch, "Fix build.gradle using AI", ["build.gradle"])
 
-        success = builder.run_gradle_build(repo_dir)
         attempts += 1
+        if not changed:
+            # The build inputs are identical, so a rebuild would fail the same way
+            print("ℹ️ The fix left the build files unchanged; skipping the rebuild.")
+            if llm_request:
+                fixer.reject_fix(*llm_request)
+            journal.update(attempts=attempts)
+            continue
+        with span("build", attempt=attempts + 1):
+            success = builder.run_gradle_build(repo_dir)
+        error = builder.get_last_error()
+        if llm_request and not success:
+            fixer.reject_fix(*llm_request)
+        journal.update(attempts=attempts, success=success, error=error)
+
+    if manifest and not journal.done("record verification"):
+        manifest.mark_verified(["root"], success)
+        manifest.save()
+        journal.complete("record verification")
+    if manifest:
+        manifest.print_summary(verification)
+
+    builder.print_attempt_timings()
+    builder.stop_gradle_daemon(repo_dir)
+    llm_cache.print_stats()
+    fix_rules.print_rule_stats()
 
-    # 9. Create pull request if build was successful
-    if success:
-        if not git_handler.pull_request_exists(branch, base_branch):
-            git_handler.create_pull_request(branch, base_branch, "Migrate to Gradle", "Automated migration.")
+    # 9. Publish and create pull request if build was successful
+    if not success:
+        print("❌ Migration failed after retries.")
+        return False
+    # Push and PR failures stay out of the journal, so --resume retries them
+    published = journal.run_until_success("publish", lambda: git_handler.publish(repo_dir, branch))
+    if published and journal.run_until_success("pull request", lambda: git_handler.open_pull_request(
+            branch, base_branch, "Migrate to Gradle", "Automated migration.")):
         print("✅ Migration completed and PR created.")
-    else:
-        print("❌ Migration failed after retries.")
\ No newline at end of file
+        return True
+    print("❌ Build verified, but publishing failed; rerun with --resume to retry.")
+    return False
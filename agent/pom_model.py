@@ -0,0 +1,234 @@
+import os
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+
+DEFAULT_PLUGIN_GROUP = "org.apache.maven.plugins"
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class PomModel:
+    """
+    Everything the agent reads from a single pom.xml, collected in one traversal.
+
+    Attributes:
+        path (str): Absolute path to the pom.xml.
+        group_id (str): Project groupId (None if inherited from the parent).
+        artifact_id (str): Project artifactId.
+        version (str): Project version (None if inherited from the parent).
+        parent (dict): <parent> groupId/artifactId/version/relativePath, or None.
+        dependencies (list): (groupId, artifactId, version, scope) tuples.
+        declared_dependencies (list): Only the project's own <dependencies>, with
+            versions left uninterpolated (input to agent.effective_pom).
+        properties (dict): <properties> entries in document order.
+        dependency_management (dict): "groupId:artifactId" -> version.
+        plugin_management (dict): "groupId:artifactId" -> version.
+        build_plugins (list): Plugin dicts as returned by pom_parser.parse_build_plugins.
+        modules (list): Module directory names from <modules>.
+    """
+    path: str
+    group_id: str = None
+    artifact_id: str = None
+    version: str = None
+    parent: dict = None
+    dependencies: list = field(default_factory=list)
+    declared_dependencies: list = field(default_factory=list)
+    properties: dict = field(default_factory=dict)
+    dependency_management: dict = field(default_factory=dict)
+    plugin_management: dict = field(default_factory=dict)
+    build_plugins: list = field(default_factory=list)
+    modules: list = field(default_factory=list)
+
+
+def _local(tag):
+    """Strips the XML namespace from a tag, so namespaced and plain POMs parse alike."""
+    if not isinstance(tag, str):
+        return None
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(elem, name):
+    for child in elem:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _children(elem, name):
+    return [child for child in elem if _local(child.tag) == name]
+
+
+def _child_text(elem, name, default=None):
+    """Mirrors ElementTree.findtext: '' for an empty element, default when missing."""
+    child = _child(elem, name)
+    if child is None:
+        return default
+    return child.text or ""
+
+
+def _read_dependency(dep):
+    group_id = _child(dep, "groupId")
+    artifact_id = _child(dep, "artifactId")
+    version_elem = _child(dep, "version")
+    scope_elem = _child(dep, "scope")
+
+    group = group_id.text if group_id is not None else ""
+    artifact = artifact_id.text if artifact_id is not None else ""
+    version = version_elem.text if version_elem is not None else None
+    scope = scope_elem.text if scope_elem is not None else None
+    return group, artifact, version, scope
+
+
+def _read_managed_dependency(dep):
+    group_id = _child(dep, "groupId")
+    artifact_id = _child(dep, "artifactId")
+    version_elem = _child(dep, "version")
+    if group_id is None or artifact_id is None or version_elem is None:
+        return None
+    return f"{group_id.text}:{artifact_id.text}", version_elem.text
+
+
+def _read_managed_plugin(plugin):
+    group_id = _child(plugin, "groupId")
+    artifact_id = _child(plugin, "artifactId")
+    version_elem = _child(plugin, "version")
+
+    group = group_id.text if group_id is not None else DEFAULT_PLUGIN_GROUP
+    artifact = artifact_id.text if artifact_id is not None else None
+    version = version_elem.text if version_elem is not None else None
+    if artifact and version:
+        return f"{group}:{artifact}", version
+    return None
+
+
+def _read_build_plugin(plugin):
+    plugin_data = {
+        "groupId": _child_text(plugin, "groupId", DEFAULT_PLUGIN_GROUP),
+        "artifactId": _child_text(plugin, "artifactId", ""),
+        "version": _child_text(plugin, "version", None),
+        "configuration": {},
+        "executions": []
+    }
+
+    config_elem = _child(plugin, "configuration")
+    config = {}
+    if config_elem is not None:
+        for child in config_elem:
+            tag = _local(child.tag)
+            if tag:
+                config[tag] = child.text
+
+        # Special handling for nested manifest -> mainClass in maven-jar-plugin
+        archive = _child(config_elem, "archive")
+        if archive is not None:
+            manifest = _child(archive, "manifest")
+            if manifest is not None:
+                main_class_elem = _child(manifest, "mainClass")
+                if main_class_elem is not None:
+                    config["mainClass"] = main_class_elem.text
+
+    plugin_data["configuration"] = config
+
+    executions = _child(plugin, "executions")
+    for execution in _children(executions, "execution") if executions is not None else []:
+        goals = _child(execution, "goals")
+        plugin_data["executions"].append({
+            "id": _child_text(execution, "id", ""),
+            "phase": _child_text(execution, "phase", ""),
+            "goals": [goal.text for goal in _children(goals, "goal")] if goals is not None else []
+        })
+
+    return plugin_data
+
+
+def build_pom_model(pom_path):
+    """
+    Parses a pom.xml once and walks the tree a single time, collecting every section
+    the agent needs. Selection rules match the historical XPath queries in pom_parser
+    and xml_utils, so callers see identical results.
+    """
+    root = ET.parse(pom_path).getroot()
+    model = PomModel(path=os.path.abspath(pom_path))
+    raw_deps = []
+
+    model.group_id = _child_text(root, "groupId")
+    model.artifact_id = _child_text(root, "artifactId")
+    model.version = _child_text(root, "version")
+    parent_elem = _child(root, "parent")
+    if parent_elem is not None:
+        model.parent = {
+            "groupId": _child_text(parent_elem, "groupId"),
+            "artifactId": _child_text(parent_elem, "artifactId"),
+            "version": _child_text(parent_elem, "version"),
+            "relativePath": _child_text(parent_elem, "relativePath")
+        }
+
+    # Iterative walk carrying the ancestor tags, so each element is visited exactly once
+    stack = [(root, ())]
+    while stack:
+        elem, ancestors = stack.pop()
+        tag = _local(elem.tag)
+        if tag is None:
+            continue
+        parent = ancestors[-1] if ancestors else None
+
+        if parent == "properties":
+            model.properties[tag] = elem.text
+        elif tag == "dependency" and parent == "dependencies":
+            dependency = _read_dependency(elem)
+            raw_deps.append(dependency)
+            if len(ancestors) == 2:
+                model.declared_dependencies.append(dependency)
+        elif tag == "plugin" and parent == "plugins" and len(ancestors) > 1 and ancestors[-2] == "build":
+            model.build_plugins.append(_read_build_plugin(elem))
+        elif tag == "module" and parent == "modules" and elem.text and elem.text.strip():
+            model.modules.append(elem.text.strip())
+
+        if tag == "dependency" and "dependencyManagement" in ancestors:
+            managed = _read_managed_dependency(elem)
+            if managed:
+                model.dependency_management[managed[0]] = managed[1]
+        elif tag == "plugin" and "pluginManagement" in ancestors:
+            managed = _read_managed_plugin(elem)
+            if managed:
+                model.plugin_management[managed[0]] = managed[1]
+
+        child_ancestors = ancestors + (tag,)
+        # Reversed so the stack pops children in document order
+        stack.extend((child, child_ancestors) for child in reversed(list(elem)))
+
+    for group, artifact, version, scope in raw_deps:
+        if version and version.startswith("${") and version.endswith("}"):
+            prop_key = version[2:-1]
+            version = model.properties.get(prop_key, version)
+        model.dependencies.append((group, artifact, version, scope))
+
+    return model
+
+
+def load_pom(pom_path):
+    """
+    Returns the PomModel for pom_path, parsing the file only if it is new or has
+    changed since the last call (keyed by absolute path, mtime and size).
+    """
+    abs_path = os.path.abspath(pom_path)
+    stat = os.stat(abs_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(abs_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    model = build_pom_model(abs_path)
+    with _cache_lock:
+        _cache[abs_path] = (stamp, model)
+    return model
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
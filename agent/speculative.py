@@ -0,0 +1,193 @@
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from agent import builder, git_handler
+from agent.utils import concurrency
+from agent.utils.log_utils import read_log_tail
+from agent.utils.output_utils import write_if_changed
+from agent.utils.tracing import span
+
+# Candidate fixes requested per failure; 1 keeps the serial fix loop
+SPECULATIVE_FIXES = int(os.getenv("SPECULATIVE_FIXES", "1"))
+# Upper bound on concurrent verification builds (0: derive it from CPUs and memory)
+MAX_PARALLEL_BUILDS = int(os.getenv("SPECULATIVE_MAX_BUILDS", "0"))
+# Resources one Gradle build is assumed to need
+BUILD_CPUS = int(os.getenv("SPECULATIVE_BUILD_CPUS", "2"))
+BUILD_MEMORY_MB = int(os.getenv("SPECULATIVE_BUILD_MEMORY_MB", "1536"))
+POLL_INTERVAL = 0.5
+CANCEL_TIMEOUT = 10
+
+
+@dataclass
+class Candidate:
+    """One candidate build file, verified in its own worktree."""
+    index: int
+    content: str
+    worktree: str = None
+    process: object = None
+    log_path: str = None
+    started: float = 0.0
+    seconds: float = 0.0
+    returncode: int = None
+    error: str = ""
+    has_slot: bool = False
+
+
+def available_memory_mb():
+    """MemAvailable from /proc/meminfo, else free physical pages; None if unknown."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def build_budget(candidates):
+    """How many verification builds may run at once for `candidates` candidates."""
+    limits = [candidates, (os.cpu_count() or 1) // max(1, BUILD_CPUS)]
+    memory = available_memory_mb()
+    if memory is not None:
+        limits.append(memory // max(1, BUILD_MEMORY_MB))
+    if MAX_PARALLEL_BUILDS:
+        limits.append(MAX_PARALLEL_BUILDS)
+    return max(1, min(limits))
+
+
+def _verification_args(mode):
+    # No --debug or configuration cache: only the outcome and the failure tail matter here
+    if mode == "fast":
+        return builder.FAST_TASKS + builder.FAST_FLAGS
+    return builder.FULL_TASKS + ["--stacktrace"]
+
+
+def _release_slot(candidate):
+    if candidate.has_slot:
+        concurrency.release("build")
+        candidate.has_slot = False
+
+
+def _start(candidate, repo_dir, workdir, build_file, args):
+    """Starts the candidate's build; False, with .error set, if its worktree could not be set up."""
+    candidate.has_slot = True
+    candidate.started = time.perf_counter()
+    try:
+        candidate.worktree = os.path.join(workdir, f"candidate-{candidate.index}")
+        git_handler.add_worktree(repo_dir, candidate.worktree)
+        write_if_changed(os.path.join(candidate.worktree, build_file), candidate.content.strip() + "\n")
+        candidate.log_path = os.path.join(workdir, f"candidate-{candidate.index}.log")
+        gradlew = builder.ensure_gradle_wrapper(candidate.worktree)
+        with open(candidate.log_path, "wb") as log:
+            # Own process group, so cancelling also stops the JVMs the wrapper started
+            candidate.process = subprocess.Popen([str(gradlew)] + args, cwd=candidate.worktree, stdout=log,
+                                                 stderr=subprocess.STDOUT, start_new_session=os.name != "nt")
+    except Exception as e:
+        _release_slot(candidate)
+        candidate.error = f"{type(e).__name__}: {e}"
+        print(f"❌ Candidate {candidate.index + 1} could not be started: {candidate.error}")
+        return False
+    print(f"🧪 Verifying candidate {candidate.index + 1} in {candidate.worktree}")
+    return True
+
+
+def _cancel(candidate):
+    _release_slot(candidate)
+    process = candidate.process
+    if process is None or process.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            process.terminate()
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=CANCEL_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+    print(f"🛑 Cancelled candidate {candidate.index + 1}")
+
+
+def verify_candidates(repo_dir, contents, build_file="build.gradle", mode=None):
+    """
+    Verifies candidate versions of build_file concurrently, each in a detached git
+    worktree of repo_dir's HEAD, never running more builds than build_budget()
+    allows. In a fleet each running candidate also holds one of the shared build
+    slots. The first candidate whose build passes wins and the others are cancelled.
+
+    Args:
+        repo_dir (str): Repository whose HEAD the candidates are applied to.
+        contents (list): Candidate contents of build_file, most preferred first.
+        build_file (str): Path of the file to replace, relative to repo_dir.
+        mode (str): Gradle build mode ("full" or "fast"), defaults to builder.BUILD_MODE.
+
+    Returns:
+        tuple: (winning Candidate or None, list of every Candidate in input order;
+        failed ones carry the tail of their build log, or why they could not be
+        started, in .error).
+    """
+    candidates = [Candidate(index, content) for index, content in enumerate(contents)]
+    if not candidates:
+        return None, candidates
+
+    budget = build_budget(len(candidates))
+    mode = mode or builder.BUILD_MODE
+    builder.record_build_mode(mode)
+    args = _verification_args(mode)
+    workdir = tempfile.mkdtemp(prefix="m2g-speculative-", dir=os.path.dirname(os.path.abspath(repo_dir)))
+    print(f"🔀 Verifying {len(candidates)} fix candidate(s), {budget} at a time")
+
+    pending = list(candidates)
+    running = []
+    winner = None
+    try:
+        with span("speculative builds", "subprocess", candidates=len(candidates), parallel=budget):
+            while (pending or running) and winner is None:
+                # Wait for a fleet build slot only with nothing running, else retry after the poll
+                while pending and len(running) < budget and concurrency.acquire("build", block=not running):
+                    candidate = pending.pop(0)
+                    if _start(candidate, repo_dir, workdir, build_file, args):
+                        running.append(candidate)
+                if not running:
+                    continue
+
+                time.sleep(POLL_INTERVAL)
+                for candidate in list(running):
+                    returncode = candidate.process.poll()
+                    if returncode is None:
+                        continue
+                    running.remove(candidate)
+                    _release_slot(candidate)
+                    candidate.returncode = returncode
+                    candidate.seconds = time.perf_counter() - candidate.started
+                    passed = returncode == 0
+                    print(f"{'✅' if passed else '❌'} Candidate {candidate.index + 1} "
+                          f"{'passed' if passed else 'failed'} in {candidate.seconds:.1f}s")
+                    if passed:
+                        winner = candidate
+                        break
+                    candidate.error = read_log_tail(candidate.log_path, builder.ERROR_TAIL_LINES)
+    finally:
+        for candidate in running:
+            _cancel(candidate)
+        for candidate in candidates:
+            if candidate.worktree:
+                git_handler.remove_worktree(repo_dir, candidate.worktree)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if winner is None:
+        print("❌ No fix candidate passed the build.")
+    return winner, candidates
@@ -0,0 +1,62 @@
+# agent/utils/cache_utils.py
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: cache locking is skipped
+    fcntl = None
+
+# Root for every on-disk cache the agent keeps between runs
+CACHE_ROOT = os.getenv(
+    "AGENT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "maven-to-gradle-agent")
+)
+
+
+def get_cache_dir(name):
+    """Returns (and creates) the cache sub-directory `name` under CACHE_ROOT."""
+    path = os.path.join(CACHE_ROOT, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_json(path, default=None):
+    """Reads a JSON cache file, returning `default` if it is missing or corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """Writes a JSON cache file atomically so concurrent readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on `path` (a lock file created next to the cache entry)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,36 @@
+# agent/utils/concurrency.py
+
+from contextlib import nullcontext
+
+# Stage name ("clone", "build", "llm") -> semaphore shared by every fleet worker.
+# Empty in a normal single-repo run, so stage_limit() costs nothing.
+_limits = {}
+
+
+def configure_limits(limits):
+    """
+    Installs the stage semaphores for this process. Fleet workers call it from their
+    initializer with multiprocessing semaphores created by the parent.
+    """
+    _limits.clear()
+    _limits.update(limits or {})
+
+
+def stage_limit(name):
+    """Context manager that holds a slot of the named stage while the block runs."""
+    return _limits.get(name) or nullcontext()
+
+
+def acquire(name, block=True):
+    """
+    Takes a slot of the named stage for work that does not fit a with block; True if
+    taken (always, for a stage without a limit). Each True is paired with release().
+    """
+    limit = _limits.get(name)
+    return limit is None or limit.acquire(block)
+
+
+def release(name):
+    limit = _limits.get(name)
+    if limit is not None:
+        limit.release()
@@ -0,0 +1,181 @@
+# agent/utils/content_manifest.py
+
+import hashlib
+import json
+import os
+import subprocess
+from urllib.parse import urlsplit, urlunsplit
+from agent.utils.cache_utils import get_cache_dir, load_json, save_json
+
+# Incremental re-migration: skip modules whose inputs and outputs match the manifest (opt-in)
+INCREMENTAL = os.getenv("MIGRATION_INCREMENTAL", "false").lower() in {"1", "true", "yes"}
+# Bump when generated output changes for identical inputs, to invalidate old manifests
+MANIFEST_VERSION = 2
+
+# What the last run regenerated and skipped, for summaries (see get_summary)
+_summary = {}
+
+
+def file_digest(path):
+    """sha256 of a file's content, or None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def options_digest(options):
+    """Stable digest of JSON-serializable generation options."""
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _git(repo_dir, *args):
+    """Output of a git command in repo_dir, or None if it fails (or git is missing)."""
+    try:
+        result = subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def remote_url(repo_dir):
+    """The clone's origin URL without credentials, or None."""
+    url = _git(repo_dir, "remote", "get-url", "origin")
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if parts.hostname:
+        url = urlunsplit(parts._replace(netloc=parts.hostname + (f":{parts.port}" if parts.port else "")))
+    return url
+
+
+def source_digest(module_dir):
+    """
+    git tree hash of the module's committed src/ at HEAD, "" if it has none, or None
+    when it cannot be told (no git, untracked sources).
+    """
+    digest = _git(module_dir, "rev-parse", "--verify", "-q", "HEAD:./src")
+    if digest:
+        return digest
+    if os.path.exists(os.path.join(module_dir, "src")) or not _git(module_dir, "rev-parse", "HEAD"):
+        return None
+    return ""
+
+
+def _manifest_path(repo_dir, branch=None):
+    # The clone is recreated on every run, possibly in another workspace, so the
+    # manifest lives in the agent cache under the repository's remote and branch
+    remote = remote_url(repo_dir)
+    identity = f"{remote}#{branch or ''}" if remote else os.path.abspath(repo_dir)
+    key = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:24]
+    return os.path.join(get_cache_dir("manifests"), f"{key}.json")
+
+
+class ContentManifest:
+    """
+    Content hashes of each module's inputs (its pom.xml and resolved parent POMs) and
+    generated outputs, plus whether the last build verified them and at which source
+    tree. A module whose inputs, options and outputs all still match needs no
+    regeneration; it needs no rebuild either if its sources are the verified ones.
+    """
+
+    def __init__(self, repo_dir, modules=None, branch=None):
+        self.repo_dir = os.path.abspath(repo_dir)
+        self.modules = modules or {}
+        self.branch = branch
+        self.regenerated = []
+        self.skipped = []
+        self._sources = {}
+
+    @classmethod
+    def load(cls, repo_dir, branch=None):
+        data = load_json(_manifest_path(repo_dir, branch)) or {}
+        if data.get("version") != MANIFEST_VERSION:
+            data = {}
+        return cls(repo_dir, data.get("modules"), branch)
+
+    def _key(self, path):
+        path = os.path.abspath(path)
+        relative = os.path.relpath(path, self.repo_dir)
+        return path if relative.startswith("..") else relative
+
+    def _path(self, key):
+        return key if os.path.isabs(key) else os.path.join(self.repo_dir, key)
+
+    def _matches(self, digests):
+        return all(file_digest(self._path(key)) == digest for key, digest in digests.items())
+
+    def is_current(self, module, input_paths, options):
+        """
+        True if the module's input files, generation options and generated outputs
+        all match what was recorded; records the module as skipped or regenerated.
+        """
+        entry = self.modules.get(module)
+        current = bool(entry) and entry.get("options") == options_digest(options) \
+            and set(entry.get("inputs", {})) == {self._key(path) for path in input_paths} \
+            and self._matches(entry["inputs"]) and self._matches(entry.get("outputs", {}))
+        (self.skipped if current else self.regenerated).append(module)
+        return current
+
+    def record(self, module, input_paths, output_paths, options):
+        """Stores the hashes of a regenerated module; it counts as unverified until a build passes."""
+        self.modules[module] = {
+            "inputs": {self._key(path): file_digest(path) for path in input_paths},
+            "outputs": {self._key(path): file_digest(path) for path in output_paths if os.path.exists(path)},
+            "options": options_digest(options),
+            "verified": False
+        }
+
+    def sources(self, module):
+        """source_digest of a module ("root" or its path in the reactor), once per run."""
+        if module not in self._sources:
+            self._sources[module] = source_digest(self.repo_dir if module == "root"
+                                                  else os.path.join(self.repo_dir, module))
+        return self._sources[module]
+
+    def is_verified(self, module):
+        """True if the last build passed for this module at its current sources."""
+        entry = self.modules.get(module, {})
+        sources = self.sources(module)
+        return bool(entry.get("verified")) and sources is not None and entry.get("sources") == sources
+
+    def mark_verified(self, modules, verified=True):
+        """
+        Records a build outcome. Output hashes are refreshed, so fixes applied to the
+        generated files during the build loop are what the next run compares against.
+        """
+        for module in modules:
+            entry = self.modules.get(module)
+            if entry is None:
+                continue
+            entry["verified"] = verified
+            entry["sources"] = self.sources(module)
+            entry["outputs"] = {key: file_digest(self._path(key)) for key in entry.get("outputs", {})
+                                if os.path.exists(self._path(key))}
+
+    def save(self):
+        save_json(_manifest_path(self.repo_dir, self.branch), {"version": MANIFEST_VERSION, "modules": self.modules})
+
+    def print_summary(self, verification=None):
+        """Prints (and keeps for get_summary) what this run regenerated and skipped."""
+        _summary.clear()
+        _summary.update({"regenerated": list(self.regenerated), "skipped": list(self.skipped),
+                         "verification": verification})
+        print(f"♻️ Incremental migration: regenerated {len(self.regenerated)} module(s), "
+              f"skipped {len(self.skipped)} unchanged")
+        if self.regenerated:
+            print(f"   - regenerated: {', '.join(self.regenerated)}")
+        if self.skipped:
+            print(f"   - skipped: {', '.join(self.skipped)}")
+        if verification:
+            print(f"   - verification: {verification}")
+
+
+def load(repo_dir, branch=None):
+    return ContentManifest.load(repo_dir, branch)
+
+
+def get_summary():
+    """What the last incremental run regenerated and skipped ({} if none ran)."""
+    return dict(_summary)
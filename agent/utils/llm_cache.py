@@ -0,0 +1,133 @@
+# agent/utils/llm_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from agent.utils.cache_utils import get_cache_dir, load_json, save_json
+
+# Set LLM_CACHE_BYPASS=1 to always call the API (responses are still stored)
+BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in {"1", "true", "yes"}
+MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Gradle reports durations and timestamps that differ between otherwise identical failures
+_VOLATILE_RE = re.compile(
+    r"(BUILD FAILED in [\w ]+|\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[.,\d]*|\d+(?:\.\d+)? ?(?:ms|secs?)\b)"
+)
+
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+_lock = threading.Lock()
+
+
+def normalize(text):
+    """Normalizes prompt text so cosmetic differences do not change the cache key."""
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _VOLATILE_RE.sub("<volatile>", text)
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+def cache_key(model, messages):
+    """Content address of a chat request: sha256 over the model and normalized messages."""
+    payload = {
+        "model": model,
+        "messages": [{"role": m["role"], "content": normalize(m["content"])} for m in messages]
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(get_cache_dir("llm"), f"{key}.json")
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def get(model, messages, bypass=None):
+    """
+    Returns the cached response content for this request, or None on a miss.
+    A hit refreshes the entry's mtime, which is what LRU eviction orders by.
+    """
+    if BYPASS if bypass is None else bypass:
+        return None
+
+    path = _entry_path(cache_key(model, messages))
+    entry = load_json(path)
+    if not entry or entry.get("model") != model or "response" not in entry:
+        _count("misses")
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    _count("hits")
+    return entry["response"]
+
+
+def put(model, messages, response):
+    """Stores a response and evicts least recently used entries beyond MAX_BYTES."""
+    path = _entry_path(cache_key(model, messages))
+    try:
+        save_json(path, {"model": model, "response": response})
+        _count("stores")
+        evict(MAX_BYTES)
+    except OSError as e:
+        print(f"⚠️ Could not store LLM response in cache: {e}")
+
+
+def invalidate(model, messages):
+    """
+    Drops the cached response for this request, e.g. a fix that did not make the
+    build pass, so the next identical request asks the API again.
+
+    Returns:
+        bool: True if an entry was removed.
+    """
+    try:
+        os.remove(_entry_path(cache_key(model, messages)))
+    except OSError:
+        return False
+    _count("invalidations")
+    return True
+
+
+def evict(max_bytes=MAX_BYTES):
+    """Deletes the least recently used entries until the cache fits in max_bytes."""
+    directory = get_cache_dir("llm")
+    entries = []
+    total = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            _count("evictions")
+        except OSError:
+            continue
+
+
+def get_stats():
+    """Returns hit/miss/store/eviction/invalidation counters for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def print_stats():
+    stats = get_stats()
+    lookups = stats["hits"] + stats["misses"]
+    if not lookups:
+        return
+    print(f"♻️ LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es) "
+          f"({stats['hits'] / lookups:.0%} hit rate), {stats['evictions']} eviction(s), "
+          f"{stats['invalidations']} invalidation(s)")
@@ -0,0 +1,54 @@
+# agent/utils/log_utils.py
+
+import os
+
+TAIL_LINES = 300
+# Wider window for error analysis: the FAILURE block sits above a long --stacktrace
+ANALYSIS_TAIL_LINES = 5000
+# Hard cap on bytes pulled into memory, however long the tail lines are
+TAIL_MAX_BYTES = 1024 * 1024
+_BLOCK_SIZE = 64 * 1024
+
+
+def read_log_tail(log_path, max_lines=TAIL_LINES, max_bytes=TAIL_MAX_BYTES):
+    """
+    Returns the last `max_lines` lines of a log file without reading the whole file.
+
+    Blocks are read backwards from the end of the file until enough newlines are
+    found or `max_bytes` have been read, so memory use is bounded by the tail size
+    rather than the log size.
+
+    Args:
+        log_path (str): Path to the log file.
+        max_lines (int): Number of trailing lines to return.
+        max_bytes (int): Upper bound on bytes read from the end of the file.
+
+    Returns:
+        str: The trailing lines, or "" if the file does not exist.
+    """
+    if not os.path.exists(log_path):
+        return ""
+
+    with open(log_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        blocks = []
+        newlines = 0
+        read = 0
+
+        # One extra newline so the first returned line is complete
+        while position > 0 and newlines <= max_lines and read < max_bytes:
+            size = min(_BLOCK_SIZE, position, max_bytes - read)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+            read += size
+
+    data = b"".join(reversed(blocks))
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if position > 0 and lines:
+        # The first line was cut by the seek
+        lines = lines[1:]
+    return "\n".join(lines[-max_lines:])
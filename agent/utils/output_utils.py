@@ -0,0 +1,76 @@
+# agent/utils/output_utils.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+
+def _read_umask():
+    # os.umask() can only be read by setting it, so do that once, at import
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Mode bits masked off new files, as open() would apply them
+_UMASK = _read_umask()
+
+
+def _digest(data):
+    return hashlib.sha256(data).digest()
+
+
+def _file_digest(path, size):
+    """Hash of the file at path, or None if it is missing or not `size` bytes long."""
+    try:
+        if os.path.getsize(path) != size:
+            return None
+        with open(path, "rb") as f:
+            return _digest(f.read())
+    except OSError:
+        return None
+
+
+def write_if_changed(path, content, backup=False):
+    """
+    Writes content (str, UTF-8 without BOM, or bytes) to path only if it differs from
+    what is already there. The write goes to a temporary file in the same directory
+    that then replaces path, so readers never see a partial file. Unchanged files keep
+    their mtime, which keeps Gradle's configuration cache and git's stat cache valid.
+
+    Args:
+        path (str): Target file.
+        content (str or bytes): Complete new content.
+        backup (bool): Copy the previous version to path + ".bak" before replacing it.
+
+    Returns:
+        bool: True if the file was created or modified.
+    """
+    if isinstance(content, str):
+        content = content.lstrip("\ufeff").encode("utf-8")
+    if _file_digest(path, len(content)) == _digest(content):
+        return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    exists = os.path.exists(path)
+    if backup and exists:
+        shutil.copy2(path, path + ".bak")
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        if exists:
+            shutil.copymode(path, tmp_path)
+        else:
+            # mkstemp creates 0600; give new files the usual umask-derived mode
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return True
@@ -0,0 +1,175 @@
+# agent/utils/source_scanner.py
+
+import hashlib
+import mmap
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from agent.utils.cache_utils import get_cache_dir, load_json, save_json
+
+MAIN_RE = re.compile(rb"(?:public\s+static|static\s+public)\s+void\s+main\s*\(")
+SPRING_BOOT_RE = re.compile(rb"@SpringBootApplication\b")
+PACKAGE_RE = re.compile(rb"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+
+SCAN_WORKERS = int(os.getenv("SOURCE_SCAN_WORKERS", "0") or 0) or min(32, (os.cpu_count() or 1) * 4)
+CHUNK_SIZE = 1024 * 1024
+
+# In-process cache: src_dir -> {relative path: [mtime_ns, size, has_main, is_spring_boot, package]}
+_memory_cache = {}
+_memory_lock = threading.Lock()
+
+
+def _iter_java_files(src_dir):
+    """Yields (relative path, mtime_ns, size) for every .java file, using os.scandir."""
+    stack = [src_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".java") and entry.is_file():
+                        stat = entry.stat()
+                        yield os.path.relpath(entry.path, src_dir), stat.st_mtime_ns, stat.st_size
+        except OSError:
+            continue
+
+
+def _search(data):
+    package = PACKAGE_RE.search(data)
+    return (
+        MAIN_RE.search(data) is not None,
+        SPRING_BOOT_RE.search(data) is not None,
+        package.group(1).decode("ascii", errors="ignore") if package else None
+    )
+
+
+def _scan_chunked(f):
+    has_main = is_spring_boot = False
+    package = None
+    carry = b""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        # Keep a small overlap so a match spanning two chunks is not missed
+        data = carry + chunk
+        found_main, found_boot, found_package = _search(data)
+        has_main = has_main or found_main
+        is_spring_boot = is_spring_boot or found_boot
+        package = package or found_package
+        carry = data[-256:]
+    return has_main, is_spring_boot, package
+
+
+def scan_java_file(path):
+    """
+    Scans one Java source for a main method, @SpringBootApplication and its package.
+    The file is memory-mapped (falling back to chunked reads), never read whole into a str.
+
+    Returns:
+        tuple: (has_main, is_spring_boot, package or None)
+    """
+    try:
+        with open(path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _search(data)
+            except (ValueError, OSError):
+                # Empty files cannot be mapped; some filesystems do not support mmap
+                f.seek(0)
+                return _scan_chunked(f)
+    except OSError:
+        return False, False, None
+
+
+def _cache_path(src_dir):
+    digest = hashlib.sha1(os.path.abspath(src_dir).encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir("main-class"), f"{digest}.json")
+
+
+def _load_cache(src_dir):
+    key = os.path.abspath(src_dir)
+    with _memory_lock:
+        if key in _memory_cache:
+            return _memory_cache[key]
+    return load_json(_cache_path(src_dir), default={}) or {}
+
+
+def _store_cache(src_dir, entries):
+    with _memory_lock:
+        _memory_cache[os.path.abspath(src_dir)] = entries
+    try:
+        save_json(_cache_path(src_dir), entries)
+    except OSError as e:
+        print(f"⚠️ Could not persist main class scan cache: {e}")
+
+
+def _class_name(rel_path, package):
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    if package:
+        return f"{package}.{stem}"
+    return os.path.splitext(rel_path)[0].replace(os.sep, ".").replace("/", ".")
+
+
+def find_main_class(src_dir, workers=None):
+    """
+    Finds the fully qualified main class under a Java source root.
+
+    Files are scanned in parallel and results are cached per file by mtime and size,
+    so only new or edited sources are read again on later runs. Classes annotated
+    with @SpringBootApplication are preferred; otherwise the first main class in
+    path order wins.
+
+    Args:
+        src_dir (str): Path to src/main/java.
+        workers (int): Scanner thread count; defaults to SCAN_WORKERS.
+
+    Returns:
+        str or None: Fully qualified main class name
+    """
+    if not os.path.isdir(src_dir):
+        return None
+
+    cached = _load_cache(src_dir)
+    entries = {}
+    stale = []
+    for rel_path, mtime_ns, size in _iter_java_files(src_dir):
+        entry = cached.get(rel_path)
+        if entry and entry[0] == mtime_ns and entry[1] == size:
+            entries[rel_path] = entry
+        else:
+            stale.append((rel_path, mtime_ns, size))
+
+    if stale:
+        paths = [os.path.join(src_dir, rel_path) for rel_path, _, _ in stale]
+        with ThreadPoolExecutor(max_workers=workers or SCAN_WORKERS) as pool:
+            results = pool.map(scan_java_file, paths, chunksize=64)
+            for (rel_path, mtime_ns, size), (has_main, is_boot, package) in zip(stale, results):
+                entries[rel_path] = [mtime_ns, size, has_main, is_boot, package]
+
+    if stale or len(entries) != len(cached):
+        _store_cache(src_dir, entries)
+
+    candidates = sorted(rel_path for rel_path, entry in entries.items() if entry[2])
+    if not candidates:
+        return None
+
+    preferred = [rel_path for rel_path in candidates if entries[rel_path][3]] or candidates
+    rel_path = preferred[0]
+    return _class_name(rel_path, entries[rel_path][4])
+
+
+def clear_cache(src_dir=None):
+    """Forgets cached scan results for src_dir (memory and disk), or the in-memory cache for all."""
+    with _memory_lock:
+        if src_dir is None:
+            _memory_cache.clear()
+            return
+        _memory_cache.pop(os.path.abspath(src_dir), None)
+    try:
+        os.remove(_cache_path(src_dir))
+    except FileNotFoundError:
+        pass
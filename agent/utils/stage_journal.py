@@ -0,0 +1,91 @@
+# agent/utils/stage_journal.py
+
+import json
+import os
+import time
+from agent.utils.cache_utils import load_json, save_json
+
+JOURNAL_VERSION = 1
+
+
+def journal_path(repo_dir):
+    """The journal sits beside the workspace (like the trace), since the clone step deletes repo_dir."""
+    repo_dir = os.path.abspath(repo_dir)
+    return os.path.join(os.path.dirname(repo_dir), f"{os.path.basename(repo_dir)}-journal.json")
+
+
+class StageJournal:
+    """
+    On-disk record of a migration's completed stages and their (JSON) outputs, plus
+    loop state such as fix attempts already spent. Every update is written atomically,
+    so after a crash a --resume run skips what finished and continues from there.
+    """
+
+    def __init__(self, path, params, stages=None, state=None, resumed=False):
+        self.path = path
+        self.params = params
+        self.stages = stages or {}
+        self.state = state or {}
+        self.resumed = resumed
+
+    def save(self):
+        save_json(self.path, {"version": JOURNAL_VERSION, "params": self.params,
+                              "stages": self.stages, "state": self.state})
+
+    def done(self, name):
+        return name in self.stages
+
+    def output(self, name):
+        return self.stages[name]["output"]
+
+    def complete(self, name, output=None):
+        """Records a finished stage; returns its output as a resumed run will see it."""
+        # The JSON round trip gives fresh and resumed runs identical data (lists, not tuples)
+        output = json.loads(json.dumps(output))
+        self.stages[name] = {"output": output, "finished": time.time()}
+        self.save()
+        return output
+
+    def run(self, name, func):
+        """Runs func() as stage `name` unless the journal already holds its output."""
+        if self.done(name):
+            print(f"⏭️ Resuming: stage '{name}' already completed")
+            return self.output(name)
+        return self.complete(name, func())
+
+    def run_until_success(self, name, func):
+        """
+        Like run(), for stages that can fail transiently (push, pull request): only a
+        truthy result completes the stage, so a resumed run tries a failed one again.
+        """
+        if self.done(name):
+            print(f"⏭️ Resuming: stage '{name}' already completed")
+            return self.output(name)
+        result = func()
+        if result:
+            self.complete(name, result)
+        return result
+
+    def update(self, **state):
+        """Persists loop state (e.g. attempts=2) so a resumed run does not spend it again."""
+        self.state.update(state)
+        self.save()
+
+
+def open_journal(repo_dir, resume=False, **params):
+    """
+    Returns the journal for repo_dir. With resume, the existing journal is continued
+    if its params (branch names, ...) match and the workspace still exists; otherwise,
+    and always without resume, a new empty journal is started.
+    """
+    path = journal_path(repo_dir)
+    if resume:
+        data = load_json(path) or {}
+        if data.get("version") == JOURNAL_VERSION and data.get("params") == params and os.path.isdir(repo_dir):
+            print(f"⏯️ Resuming migration from {path} ({len(data.get('stages', {}))} stage(s) completed)")
+            return StageJournal(path, params, data.get("stages"), data.get("state"), resumed=True)
+        print("ℹ️ Nothing to resume (no matching journal or workspace); starting from scratch.")
+
+    journal = StageJournal(path, params)
+    journal.save()
+    return journal
@@ -0,0 +1,127 @@
+# agent/utils/tracing.py
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Where run_migration writes the Chrome trace; defaults to migration-trace.json beside the repo
+TRACE_FILE = os.getenv("TRACE_FILE")
+
+_events = []
+_events_lock = threading.Lock()
+_origin_ns = time.perf_counter_ns()
+
+
+def reset():
+    """Drops recorded spans and restarts the trace clock."""
+    global _origin_ns
+    with _events_lock:
+        _events.clear()
+        _origin_ns = time.perf_counter_ns()
+
+
+@contextmanager
+def span(name, category="stage", **args):
+    """
+    Times the enclosed block as one span. Spans nest (a build inside a fix attempt) and
+    may be opened from any thread; each becomes a Chrome "complete" event. Exceptions
+    propagate and are recorded on the span.
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end = time.perf_counter_ns()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - _origin_ns) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {key: str(value) for key, value in args.items()}
+        }
+        with _events_lock:
+            _events.append(event)
+
+
+def traced(name=None, category="stage"):
+    """Decorator form of span(); the span is named after the function by default."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name or func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def get_events():
+    with _events_lock:
+        return list(_events)
+
+
+def summarize():
+    """
+    Aggregates spans by name.
+
+    Returns:
+        list: Dicts with name, category, count, total, mean and max (seconds),
+        slowest total first.
+    """
+    stages = {}
+    for event in get_events():
+        stage = stages.setdefault(event["name"], {"name": event["name"], "category": event["cat"],
+                                                  "count": 0, "total": 0.0, "max": 0.0})
+        seconds = event["dur"] / 1e6
+        stage["count"] += 1
+        stage["total"] += seconds
+        stage["max"] = max(stage["max"], seconds)
+    for stage in stages.values():
+        stage["mean"] = stage["total"] / stage["count"]
+        for key in ("total", "mean", "max"):
+            stage[key] = round(stage[key], 3)
+    return sorted(stages.values(), key=lambda stage: stage["total"], reverse=True)
+
+
+def write_trace(path):
+    """Writes the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+    events = get_events()
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"migration ({pid})"}}
+                for pid in sorted({event["pid"] for event in events})]
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def print_summary():
+    stages = summarize()
+    if not stages:
+        return
+    # Nested spans overlap, so shares are relative to the longest (outermost) span
+    longest = max(stage["max"] for stage in stages) or 1
+    width = max(len(stage["name"]) for stage in stages)
+    print("⏱️ Time per stage:")
+    print(f"   {'stage':<{width}}  {'count':>5}  {'total s':>8}  {'mean s':>8}  {'max s':>8}  {'share':>6}")
+    for stage in stages:
+        print(f"   {stage['name']:<{width}}  {stage['count']:>5}  {stage['total']:>8.3f}  "
+              f"{stage['mean']:>8.3f}  {stage['max']:>8.3f}  {stage['total'] / longest:>6.0%}")
+
+
+def finish(path):
+    """Writes the trace to path and prints the per-stage summary."""
+    try:
+        write_trace(path)
+        print(f"🧭 Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)")
+    except OSError as e:
+        print(f"⚠️ Could not write trace {path}: {e}")
+    print_summary()
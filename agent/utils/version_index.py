@@ -0,0 +1,369 @@
+# agent/utils/version_index.py
+
+import argparse
+import functools
+import hashlib
+import mmap
+import os
+import random
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from agent.utils.cache_utils import file_lock, get_cache_dir, load_json, save_json
+
+M2_REPOSITORY = os.getenv("M2_REPOSITORY", os.path.join(os.path.expanduser("~"), ".m2", "repository"))
+# Seconds before get_index() rescans the repository; 0 rescans on every run, -1 never does
+MAX_AGE = int(os.getenv("VERSION_INDEX_MAX_AGE", "86400"))
+
+# Index file: header, one uint32 offset per record, then "group:artifact\tnewest\tv1,v2,...\n"
+# records sorted by key, so lookups binary-search the memory-mapped file without loading it.
+MAGIC = b"MVIDX001"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+
+METADATA_RE = re.compile(r"^maven-metadata(?:-[\w.\-]+)?\.xml$")
+TOKEN_RE = re.compile(r"\d+|[a-z]+")
+# Qualifier order used by Maven's ComparableVersion; unknown qualifiers sort after releases
+QUALIFIERS = {"alpha": -5, "a": -5, "beta": -4, "b": -4, "milestone": -3, "m": -3,
+              "rc": -2, "cr": -2, "snapshot": -1, "": 0, "ga": 0, "final": 0, "release": 0, "sp": 1}
+PRE_RELEASE = {"alpha", "a", "beta", "b", "milestone", "m", "rc", "cr", "snapshot", "preview", "ea", "dev", "pre"}
+_RELEASE = (1, 0, "")
+
+_index = None
+_index_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=65536)
+def version_key(version):
+    """Sort key approximating Maven's ComparableVersion (1.0-rc1 < 1.0 = 1.0.0 < 1.0.1)."""
+    items = []
+    for token in TOKEN_RE.findall(version.lower()):
+        if token.isdigit():
+            items.append((2, int(token), ""))
+        else:
+            # Zeros before a qualifier are insignificant: 1.0-rc1 == 1-rc1
+            while items and items[-1] == (2, 0, ""):
+                items.pop()
+            rank = QUALIFIERS.get(token)
+            items.append((1, rank, "") if rank is not None else (1, 2, token))
+    while items and items[-1] in ((2, 0, ""), _RELEASE):
+        items.pop()
+    items.append(_RELEASE)
+    return tuple(items)
+
+
+@functools.lru_cache(maxsize=65536)
+def is_release(version):
+    return not any(token in PRE_RELEASE for token in TOKEN_RE.findall(version.lower()))
+
+
+def _parse_metadata(path):
+    """Returns ("group:artifact", [versions]) from a maven-metadata*.xml, or (None, [])."""
+    try:
+        root = ET.parse(path).getroot()
+    except (ET.ParseError, OSError):
+        return None, []
+    group = root.findtext("groupId")
+    artifact = root.findtext("artifactId")
+    # Group-level (plugin prefix) and snapshot-level metadata carry no <versions>
+    versions = [v.text.strip() for v in root.findall("versioning/versions/version") if v.text and v.text.strip()]
+    if not group or not artifact or not versions:
+        return None, []
+    return f"{group.strip()}:{artifact.strip()}", versions
+
+
+def _scan(root, previous):
+    """
+    Walks the repository and returns ({source: [mtime_ns, size, ga, versions]}, parsed).
+    Sources are metadata files, plus version directories holding <artifact>-<version>.pom
+    for artifacts installed without metadata. A metadata file whose mtime and size match
+    the previous scan is not parsed again.
+    """
+    entries = {}
+    parsed = 0
+    prefix_length = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            iterator = os.scandir(directory)
+        except OSError:
+            continue
+        metadata = []
+        poms = set()
+        with iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif METADATA_RE.match(entry.name):
+                    metadata.append(entry)
+                elif entry.name.endswith(".pom"):
+                    poms.add(entry.name)
+
+        for entry in metadata:
+            source = entry.path[prefix_length:]
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            cached = previous.get(source)
+            if cached and cached[:2] == stamp:
+                entries[source] = cached
+                continue
+            ga, versions = _parse_metadata(entry.path)
+            entries[source] = stamp + [ga, versions]
+            parsed += 1
+
+        if poms:
+            relative = directory[prefix_length:]
+            parts = relative.split(os.sep)
+            if len(parts) >= 3 and f"{parts[-2]}-{parts[-1]}.pom" in poms:
+                ga = f"{'.'.join(parts[:-2])}:{parts[-2]}"
+                entries[relative] = [0, 0, ga, [parts[-1]]]
+    return entries, parsed
+
+
+def _write_index(index_path, entries):
+    artifacts = {}
+    for _, _, ga, versions in entries.values():
+        if ga:
+            artifacts.setdefault(ga, set()).update(versions)
+
+    offsets = []
+    data = bytearray()
+    for ga in sorted(artifacts, key=lambda key: key.encode("utf-8")):
+        versions = sorted(artifacts[ga], key=version_key)
+        releases = [v for v in versions if is_release(v)]
+        newest = releases[-1] if releases else ""
+        offsets.append(len(data))
+        data += f"{ga}\t{newest}\t{','.join(versions)}\n".encode("utf-8")
+
+    directory = os.path.dirname(index_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(offsets)))
+            f.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+            f.write(data)
+        # Readers keep their mapping of the old file; new opens see the new one
+        os.replace(tmp_path, index_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(offsets)
+
+
+def index_paths(root=None):
+    """Returns (index file, scan state file) for the repository at root."""
+    root = os.path.abspath(root or M2_REPOSITORY)
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+    directory = get_cache_dir("version-index")
+    return os.path.join(directory, f"{digest}.idx"), os.path.join(directory, f"{digest}.json")
+
+
+def refresh_index(root=None):
+    """
+    Scans a local Maven repository (or any tree of maven-metadata*.xml files) and
+    rewrites its index. Only metadata files changed since the last scan are parsed.
+
+    Returns:
+        dict: Scan statistics (sources, parsed, artifacts, seconds, index path).
+    """
+    root = os.path.abspath(root or M2_REPOSITORY)
+    index_path, state_path = index_paths(root)
+    start = time.perf_counter()
+    with file_lock(index_path + ".lock"):
+        previous = (load_json(state_path, {}) or {}).get("entries", {})
+        entries, parsed = _scan(root, previous)
+        if parsed or entries.keys() != previous.keys() or not os.path.exists(index_path):
+            artifacts = _write_index(index_path, entries)
+            save_json(state_path, {"root": root, "entries": entries})
+        else:
+            # Nothing changed: keep the index, but restart its max-age clock
+            os.utime(index_path)
+            with open(index_path, "rb") as f:
+                artifacts = HEADER.unpack(f.read(HEADER.size))[1]
+    return {
+        "sources": len(entries),
+        "parsed": parsed,
+        "artifacts": artifacts,
+        "seconds": round(time.perf_counter() - start, 3),
+        "index": index_path
+    }
+
+
+class VersionIndex:
+    """Read-only, memory-mapped view of an index written by refresh_index()."""
+
+    def __init__(self, index_path):
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a version index: {index_path}")
+        self._data_start = HEADER.size + self._count * OFFSET.size
+        # Offsets are little-endian uint32; read them through a typed view where that is native
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._mm)[HEADER.size:self._data_start].cast("I")
+        else:
+            self._offsets = [OFFSET.unpack_from(self._mm, HEADER.size + i * OFFSET.size)[0]
+                             for i in range(self._count)]
+
+    def __len__(self):
+        return self._count
+
+    def _find(self, ga):
+        key = ga.encode("utf-8")
+        mm, offsets, data_start = self._mm, self._offsets, self._data_start
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = data_start + offsets[middle]
+            record_key = mm[start:mm.find(b"\t", start)]
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return start
+        return None
+
+    def _fields(self, group, artifact):
+        start = self._find(f"{group}:{artifact}")
+        if start is None:
+            return None
+        line = self._mm[start:self._mm.find(b"\n", start)].decode("utf-8")
+        _, newest, versions = line.split("\t")
+        return newest, versions.split(",") if versions else []
+
+    def versions(self, group, artifact):
+        """All known versions of group:artifact, oldest first."""
+        fields = self._fields(group, artifact)
+        return fields[1] if fields else []
+
+    def latest_release(self, group, artifact, prefix=None):
+        """
+        Newest non-prerelease version of group:artifact, optionally restricted to
+        versions starting with prefix (e.g. "3.2."), or None if none is known.
+        """
+        fields = self._fields(group, artifact)
+        if not fields:
+            return None
+        if not prefix:
+            return fields[0] or None
+        for version in reversed(fields[1]):
+            if version.startswith(prefix) and is_release(version):
+                return version
+        return None
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+
+
+def open_index(root=None, max_age=MAX_AGE):
+    """
+    Opens the index for root, (re)building it first if it is missing or older than
+    max_age seconds. Returns None if the repository does not exist.
+    """
+    root = os.path.abspath(root or M2_REPOSITORY)
+    index_path, _ = index_paths(root)
+    exists = os.path.exists(index_path)
+    if not exists and not os.path.isdir(root):
+        return None
+    if not exists or (max_age >= 0 and time.time() - os.path.getmtime(index_path) > max_age):
+        stats = refresh_index(root)
+        print(f"📇 Indexed {stats['artifacts']} artifacts from {root} in {stats['seconds']}s "
+              f"({stats['parsed']} metadata file(s) parsed)")
+    return VersionIndex(index_path)
+
+
+def get_index():
+    """Returns this process's index of M2_REPOSITORY, or None if it is unavailable."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = open_index() or False
+            except Exception as e:
+                print(f"⚠️ Local version index unavailable: {e}")
+                _index = False
+        return _index or None
+
+
+def latest_release(group, artifact, prefix=None):
+    """Newest locally known release of group:artifact, or None."""
+    index = get_index()
+    return index.latest_release(group, artifact, prefix) if index else None
+
+
+def _generate_repository(root, artifacts, versions_per_artifact=5):
+    for i in range(artifacts):
+        group = f"org.bench.g{i % 1000}"
+        artifact = f"artifact-{i}"
+        directory = os.path.join(root, *group.split("."), artifact)
+        os.makedirs(directory, exist_ok=True)
+        versions = [f"{major}.{i % 7}.{patch}" for major in range(1, 4) for patch in range(3)]
+        versions = "".join(f"<version>{v}</version>" for v in versions[:versions_per_artifact])
+        with open(os.path.join(directory, "maven-metadata-local.xml"), "w", encoding="utf-8") as f:
+            f.write(f"<metadata><groupId>{group}</groupId><artifactId>{artifact}</artifactId>"
+                    f"<versioning><versions>{versions}<version>9.0.0-RC1</version></versions></versioning></metadata>")
+
+
+def benchmark(artifacts=100_000, lookups=100_000):
+    """Builds a synthetic repository and times full scan, no-op refresh, 1% refresh and lookups."""
+    root = tempfile.mkdtemp(prefix="m2-bench-")
+    try:
+        start = time.perf_counter()
+        _generate_repository(root, artifacts)
+        print(f"Generated {artifacts} artifacts in {time.perf_counter() - start:.1f}s under {root}")
+
+        print("full scan:      ", refresh_index(root))
+        print("no-op refresh:  ", refresh_index(root))
+        for i in range(0, artifacts, 100):
+            path = os.path.join(root, "org", "bench", f"g{i % 1000}", f"artifact-{i}", "maven-metadata-local.xml")
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+        print("1% refresh:     ", refresh_index(root))
+
+        index = VersionIndex(index_paths(root)[0])
+        keys = [(f"org.bench.g{i % 1000}", f"artifact-{i}") for i in random.sample(range(artifacts), min(lookups, artifacts))]
+        start = time.perf_counter()
+        for group, artifact in keys:
+            index.latest_release(group, artifact)
+        elapsed = time.perf_counter() - start
+        print(f"lookups:         {len(keys)} in {elapsed:.3f}s ({elapsed / len(keys) * 1e6:.1f} µs each), "
+              f"index {os.path.getsize(index_paths(root)[0]) / 1024 / 1024:.1f} MiB")
+        index.close()
+    finally:
+        for path in index_paths(root):
+            for leftover in (path, path + ".lock"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index a local Maven repository's artifact versions.")
+    parser.add_argument("--root", default=M2_REPOSITORY, help="Repository to index")
+    parser.add_argument("--lookup", help="groupId:artifactId to look up after refreshing")
+    parser.add_argument("--benchmark", type=int, metavar="ARTIFACTS", help="Benchmark on a synthetic repository")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        print(refresh_index(args.root))
+        if args.lookup:
+            group, _, artifact = args.lookup.partition(":")
+            index = VersionIndex(index_paths(args.root)[0])
+            print(f"{args.lookup}: newest release {index.latest_release(group, artifact)}, "
+                  f"versions {index.versions(group, artifact)}")
@@ -1,7 +1,7 @@
 # agent/utils/xml_utils.py
 
 import os
-from lxml import etree
+from agent.pom_model import load_pom
 
 def detect_modules(pom_path, return_absolute=False):
     """
@@ -17,15 +17,8 @@ def detect_modules(pom_path, return_absolute=False):
     if not os.path.exists(pom_path):
         raise FileNotFoundError(f"Missing pom.xml: {pom_path}")
 
-    tree = etree.parse(pom_path)
-    root = tree.getroot()
-
-    # Handle default namespace
-    ns = root.nsmap.get(None)
-    nsmap = {"m": ns} if ns else {}
-
-    modules = root.xpath("//m:modules/m:module", namespaces=nsmap)
-    mod_list = [mod.text.strip() for mod in modules if mod.text]
+    # Shared, memoized model: namespaced and plain POMs are handled alike
+    mod_list = list(load_pom(pom_path).modules)
 
     if return_absolute:
         base_dir = os.path.dirname(os.path.abspath(pom_path))
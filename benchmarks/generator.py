@@ -0,0 +1,161 @@
+"""
+Generates synthetic Maven reactors for the benchmark suite.
+
+A generated project has a root POM (Spring Boot parent, a chain of properties each
+referring to the previous one, dependencyManagement and pluginManagement), any number
+of child modules inheriting from it, and a src/main/java tree with one
+@SpringBootApplication class hidden among ordinary sources.
+"""
+
+import argparse
+import os
+
+GROUP_ID = "org.bench"
+ROOT_ARTIFACT = "bench-root"
+VERSION = "1.0.0"
+BOOT_VERSION = "3.2.5"
+LIBRARY_GROUPS = 50
+SCOPES = [None, None, None, "test", "runtime", "provided"]
+
+
+def module_name(index):
+    return f"module-{index:04d}"
+
+
+def _library(k):
+    return f"org.bench.lib{k % LIBRARY_GROUPS}", f"lib-{k}"
+
+
+def _dependency(group, artifact, version=None, scope=None):
+    xml = f"<dependency><groupId>{group}</groupId><artifactId>{artifact}</artifactId>"
+    if version:
+        xml += f"<version>{version}</version>"
+    if scope:
+        xml += f"<scope>{scope}</scope>"
+    return xml + "</dependency>"
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+
+
+def _root_pom(modules, managed, chain_depth):
+    properties = ["<java.version>17</java.version>", "<chain.0>1.0.0</chain.0>"]
+    properties += [f"<chain.{i}>${{chain.{i - 1}}}</chain.{i}>" for i in range(1, chain_depth + 1)]
+    properties += [f"<lib{k}.version>${{chain.{chain_depth}}}</lib{k}.version>" for k in range(managed)]
+    managed_deps = "".join(_dependency(*_library(k), f"${{lib{k}.version}}") for k in range(managed))
+    module_list = "".join(f"<module>{module_name(i)}</module>" for i in range(modules))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>{BOOT_VERSION}</version>
+    <relativePath/>
+  </parent>
+  <groupId>{GROUP_ID}</groupId>
+  <artifactId>{ROOT_ARTIFACT}</artifactId>
+  <version>{VERSION}</version>
+  <packaging>pom</packaging>
+  <modules>{module_list}</modules>
+  <properties>{"".join(properties)}</properties>
+  <dependencyManagement><dependencies>{managed_deps}</dependencies></dependencyManagement>
+  <dependencies>{_dependency("org.springframework.boot", "spring-boot-starter")}</dependencies>
+  <build>
+    <pluginManagement><plugins>
+      <plugin><groupId>org.springframework.boot</groupId><artifactId>spring-boot-maven-plugin</artifactId><version>{BOOT_VERSION}</version></plugin>
+    </plugins></pluginManagement>
+    <plugins>
+      <plugin><artifactId>maven-compiler-plugin</artifactId><version>3.11.0</version>
+        <configuration><source>${{java.version}}</source><target>${{java.version}}</target></configuration></plugin>
+    </plugins>
+  </build>
+</project>
+"""
+
+
+def _module_pom(index, dependencies, managed, chain_depth):
+    deps = []
+    if index > 0:
+        deps.append(_dependency(GROUP_ID, module_name(index - 1), "${project.version}"))
+    for j, k in enumerate(dependencies):
+        group, artifact = _library(k)
+        scope = SCOPES[k % len(SCOPES)]
+        if k < managed:
+            deps.append(_dependency(group, artifact, scope=scope))
+        elif j % 2:
+            deps.append(_dependency(group, artifact, f"${{chain.{chain_depth}}}", scope))
+        else:
+            deps.append(_dependency(group, artifact, f"2.{k % 10}.{k % 7}", scope))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <parent>
+    <groupId>{GROUP_ID}</groupId>
+    <artifactId>{ROOT_ARTIFACT}</artifactId>
+    <version>{VERSION}</version>
+  </parent>
+  <artifactId>{module_name(index)}</artifactId>
+  <dependencies>{"".join(deps)}</dependencies>
+</project>
+"""
+
+
+def _write_sources(src_dir, java_files, package_depth):
+    for i in range(java_files):
+        package = ".".join(["org", "bench"] + [f"p{(i >> (3 * level)) % 8}" for level in range(package_depth)])
+        path = os.path.join(src_dir, *package.split("."), f"Source{i}.java")
+        body = "\n".join(f"    public int method{m}(int x) {{ return x * {m}; }}" for m in range(20))
+        _write(path, f"package {package};\n\npublic class Source{i} {{\n{body}\n}}\n")
+    _write(os.path.join(src_dir, "org", "bench", "zz", "Application.java"),
+           "package org.bench.zz;\n\n@SpringBootApplication\npublic class Application {\n"
+           "    public static void main(String[] args) {\n    }\n}\n")
+
+
+def generate_project(root, modules=10, dependencies=200, chain_depth=5, java_files=100, package_depth=4):
+    """
+    Writes a synthetic reactor under root.
+
+    Args:
+        root (str): Target directory (created if needed).
+        modules (int): Child modules (1-5000).
+        dependencies (int): Library dependencies across all modules (up to 10k);
+            a quarter are version-managed by the root POM.
+        chain_depth (int): Length of the chain.N -> chain.N-1 property chain.
+        java_files (int): Ordinary Java sources under the root src/main/java.
+        package_depth (int): Package nesting below org.bench.
+
+    Returns:
+        dict: The parameters used, plus the root pom path.
+    """
+    modules = max(1, modules)
+    managed = dependencies // 4
+    _write(os.path.join(root, "pom.xml"), _root_pom(modules, managed, chain_depth))
+    for index in range(modules):
+        own = range(index, dependencies, modules)
+        _write(os.path.join(root, module_name(index), "pom.xml"), _module_pom(index, own, managed, chain_depth))
+    _write_sources(os.path.join(root, "src", "main", "java"), java_files, package_depth)
+    return {
+        "modules": modules,
+        "dependencies": dependencies,
+        "chain_depth": chain_depth,
+        "java_files": java_files,
+        "package_depth": package_depth,
+        "pom": os.path.join(root, "pom.xml")
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic multi-module Maven project.")
+    parser.add_argument("root")
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--dependencies", type=int, default=200)
+    parser.add_argument("--chain-depth", type=int, default=5)
+    parser.add_argument("--java-files", type=int, default=100)
+    parser.add_argument("--package-depth", type=int, default=4)
+    args = parser.parse_args()
+    print(generate_project(args.root, args.modules, args.dependencies, args.chain_depth,
+                           args.java_files, args.package_depth))
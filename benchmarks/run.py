@@ -0,0 +1,233 @@
+"""
+Benchmark suite for the parser, writer and detectors on synthetic reactors.
+
+    python -m benchmarks.run --preset medium
+    python -m benchmarks.run --modules 5000 --dependencies 10000 --chain-depth 50 --java-files 50000
+    python -m benchmarks.run --preset medium --compare benchmarks/results/<older>.json
+
+Each benchmark runs --repeat times; "cold" variants clear the agent's in-process and
+on-disk caches first. Results are saved as JSON (with the commit they were measured
+on) so runs can be compared between commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from benchmarks.generator import generate_project, module_name
+
+PRESETS = {
+    "small": {"modules": 1, "dependencies": 50, "chain_depth": 3, "java_files": 50},
+    "medium": {"modules": 100, "dependencies": 2000, "chain_depth": 10, "java_files": 2000},
+    "large": {"modules": 1000, "dependencies": 10000, "chain_depth": 25, "java_files": 20000},
+    "xl": {"modules": 5000, "dependencies": 10000, "chain_depth": 50, "java_files": 50000}
+}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Slowdown (new median / old median) reported as a regression by --compare
+REGRESSION_THRESHOLD = 1.10
+# Differences below this many seconds are timer noise, whatever the ratio
+REGRESSION_MIN_SECONDS = 0.001
+
+
+def _git_commit():
+    try:
+        root = os.path.dirname(RESULTS_DIR)
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def _measure(func, repeat, setup=None):
+    runs = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            with redirect_stdout(devnull):
+                if setup:
+                    setup()
+                start = time.perf_counter()
+                func()
+                runs.append(time.perf_counter() - start)
+    return {
+        "runs": [round(run, 6) for run in runs],
+        "median": round(statistics.median(runs), 6),
+        "min": round(min(runs), 6),
+        "max": round(max(runs), 6)
+    }
+
+
+def run_suite(config, repeat=3, workdir=None):
+    """
+    Generates a project from config and times every benchmark on it.
+
+    Returns:
+        dict: Benchmark name -> {"runs", "median", "min", "max"} (seconds).
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="m2g-bench-")
+    project = os.path.join(workdir, "project")
+    # Isolate the agent's caches and keep the real ~/.m2 out of the measurements;
+    # both are read when the agent modules are first imported below
+    os.environ["AGENT_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["M2_REPOSITORY"] = os.path.join(workdir, "m2")
+    os.makedirs(os.environ["M2_REPOSITORY"], exist_ok=True)
+
+    from agent import detector, effective_pom, gradle_writer, pom_model, pom_parser
+    from agent.multi_module import graph, migrator
+    from agent.multi_module import parser as mm_parser
+    from agent.utils import source_scanner, xml_utils
+
+    start = time.perf_counter()
+    generate_project(project, **config)
+    print(f"🏗️ Generated {config} in {time.perf_counter() - start:.1f}s under {project}")
+
+    root_pom = os.path.join(project, "pom.xml")
+    src_dir = os.path.join(project, "src", "main", "java")
+    poms = [root_pom] + [os.path.join(project, module_name(i), "pom.xml") for i in range(config["modules"])]
+    modules = [module_name(i) for i in range(config["modules"])]
+
+    def clear_pom_caches():
+        pom_model.clear_cache()
+        effective_pom.clear_cache()
+
+    def clear_all_caches():
+        clear_pom_caches()
+        source_scanner.clear_cache(src_dir)
+
+    def parse_all():
+        for pom in poms:
+            pom_parser.parse_dependencies(pom)
+            pom_parser.parse_dependency_management(pom)
+            pom_parser.parse_plugin_management(pom)
+            pom_parser.parse_build_plugins(pom)
+
+    parsed = {}
+
+    def parse_for_writer():
+        for pom in poms:
+            deps, props = pom_parser.parse_dependencies(pom)
+            parsed[pom] = (deps, props, pom_parser.parse_plugin_management(pom), pom_parser.parse_build_plugins(pom))
+
+    def write_all():
+        for pom, (deps, props, plugin_versions, plugins) in parsed.items():
+            gradle_writer.write_build_gradle(deps, os.path.join(os.path.dirname(pom), "build.gradle"),
+                                             known_modules=modules, properties=props,
+                                             plugin_versions=plugin_versions, build_plugins=plugins)
+
+    reactor_data = {}
+
+    def parse_reactor():
+        all_modules = {"root": project, **{m: os.path.join(project, m) for m in modules}}
+        reactor_data.update(mm_parser.parse_modules(all_modules, workers=1)[0])
+
+    def reactor_graph():
+        reactor = graph.build_graph(reactor_data)
+        reactor.find_cycles()
+        reactor.topological_order()
+        reactor.dependents([modules[0]])
+
+    results = {}
+    benchmarks = [
+        ("pom_parser.all.cold", parse_all, clear_pom_caches),
+        ("pom_parser.all.warm", parse_all, None),
+        ("pom_parser.parse_dependencies.root.cold", lambda: pom_parser.parse_dependencies(root_pom), clear_pom_caches),
+        ("xml_utils.detect_modules.cold", lambda: xml_utils.detect_modules(root_pom), clear_pom_caches),
+        ("xml_utils.detect_modules.warm", lambda: xml_utils.detect_modules(root_pom), None),
+        ("detector.extract_main_class.cold", lambda: detector.extract_main_class(root_pom, src_dir),
+         lambda: source_scanner.clear_cache(src_dir)),
+        ("detector.extract_main_class.warm", lambda: detector.extract_main_class(root_pom, src_dir), None),
+        ("gradle_writer.write_build_gradle.all", write_all, parse_for_writer),
+        ("graph.reactor_graph", reactor_graph, parse_reactor),
+        ("migrate_multi_module_project.cold", lambda: migrator.migrate_multi_module_project(project), clear_all_caches),
+        ("migrate_multi_module_project.warm", lambda: migrator.migrate_multi_module_project(project), None)
+    ]
+    for name, func, setup in benchmarks:
+        results[name] = _measure(func, repeat, setup)
+        print(f"   {name:<45} median {results[name]['median']:.4f}s  min {results[name]['min']:.4f}s")
+    return results
+
+
+def compare(old_path, new_results):
+    """Prints old vs new medians and returns the names of benchmarks that regressed."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    print(f"📊 Against {old_path} (commit {old.get('commit')}):")
+    regressions = []
+    for name, result in new_results.items():
+        before = old.get("results", {}).get(name)
+        if not before or not before["median"]:
+            print(f"   {name:<45} new")
+            continue
+        ratio = result["median"] / before["median"]
+        flag = ""
+        if ratio > REGRESSION_THRESHOLD and result["median"] - before["median"] > REGRESSION_MIN_SECONDS:
+            flag = "  ⚠️ regression"
+            regressions.append(name)
+        print(f"   {name:<45} {before['median']:.4f}s -> {result['median']:.4f}s  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent on a synthetic Maven reactor.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--modules", type=int, help="Child modules (1-5000)")
+    parser.add_argument("--dependencies", type=int, help="Library dependencies across the reactor (up to 10k)")
+    parser.add_argument("--chain-depth", type=int, help="Length of the property chain")
+    parser.add_argument("--java-files", type=int, help="Java sources under src/main/java")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>-<preset>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated project")
+    args = parser.parse_args()
+
+    config = dict(PRESETS[args.preset])
+    for key in ("modules", "dependencies", "chain_depth", "java_files"):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    if not 1 <= config["modules"] <= 5000 or not 0 <= config["dependencies"] <= 10000:
+        parser.error("--modules must be 1-5000 and --dependencies 0-10000")
+
+    workdir = tempfile.mkdtemp(prefix="m2g-bench-")
+    try:
+        results = run_suite(config, args.repeat, workdir)
+    finally:
+        if args.keep:
+            print(f"📁 Project kept under {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    commit, dirty = _git_commit()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "preset": args.preset,
+        "config": config,
+        "repeat": args.repeat,
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}-{args.preset}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    if args.compare and compare(args.compare, results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
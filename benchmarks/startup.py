@@ -0,0 +1,96 @@
+"""
+Startup benchmark for the command-line entry point (agent.cli).
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 100 --repeat 10
+
+Each command runs under `python -X importtime` against a small synthetic reactor.
+Its import time, less that of a bare interpreter, must stay within the budget, and
+commands that never call OpenAI, git or GitHub must not import their libraries.
+Exits with status 1 if either check fails, so it can gate CI.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from benchmarks.generator import generate_project
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import time (ms) a command may add on top of the bare interpreter
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "150"))
+# Libraries only the git, GitHub and OpenAI stages may load
+HEAVY_MODULES = {"openai", "git", "requests", "agent.github_client"}
+COMMANDS = [
+    ("--help", ["--help"]),
+    ("detect", ["detect"]),
+    ("parse", ["parse"]),
+    ("generate", ["generate"])
+]
+
+
+def import_times(args, cwd=None):
+    """
+    Runs `python -X importtime <args>` and returns (total self time in ms, names of
+    the imported modules).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd or ROOT,
+                            capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ROOT})
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stdout}{result.stderr}")
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            total_us += int(self_us)
+            modules.add(name.strip())
+    return total_us / 1000, modules
+
+
+def measure(args, repeat):
+    """Fastest of `repeat` runs (import time only grows with noise), and the modules imported."""
+    runs = [import_times(args) for _ in range(repeat)]
+    return min(ms for ms, _ in runs), runs[0][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the CLI's startup import time against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Import time a command may add to the bare interpreter (default: STARTUP_BUDGET_MS)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="m2g-startup-")
+    try:
+        repo_dir = os.path.join(workdir, "repo")
+        generate_project(repo_dir, modules=5, dependencies=50, chain_depth=3, java_files=10)
+        baseline, _ = measure(["-c", "pass"], args.repeat)
+        print(f"🐍 Bare interpreter: {baseline:.1f} ms of imports")
+
+        failures = []
+        for label, command in COMMANDS:
+            repo_args = [] if command[0].startswith("-") else ["--repo-dir", repo_dir]
+            total, modules = measure(["-m", "agent.cli", *command, *repo_args], args.repeat)
+            added = total - baseline
+            heavy = sorted(HEAVY_MODULES & modules)
+            ok = added <= args.budget_ms and not heavy
+            print(f"{'✅' if ok else '❌'} {label:<10} +{added:6.1f} ms (budget {args.budget_ms:.0f} ms)"
+                  + (f", imports {', '.join(heavy)}" if heavy else ""))
+            if not ok:
+                failures.append(label)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        print(f"❌ Startup budget exceeded by: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ All commands start within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from agent.planner import run_migration
+import sys
+from agent.cli import main
 
 if __name__ == "__main__":
-    run_migration()
\ No newline at end of file
+    sys.exit(main())
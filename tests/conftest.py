@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubApi:
+    """
+    Local stand-in for the GitHub REST API. Routes map (method, path) to a list of
+    responses served in order (the last one repeats) or to a function of the request;
+    a response is (status, body, headers). Every request is recorded.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def route(self, method, path, *responses):
+        self.routes[(method, path)] = list(responses)
+
+    def respond(self, request):
+        with self._lock:
+            self.requests.append(request)
+            handler = self.routes.get((request["method"], request["path"]))
+            if handler is None:
+                return 404, {"message": "Not Found"}, {}
+            if callable(handler):
+                return handler(request)
+            return handler.pop(0) if len(handler) > 1 else handler[0]
+
+    def calls(self, method, path):
+        return [r for r in self.requests if r["method"] == method and r["path"] == path]
+
+
+def _handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            path, _, query = self.path.partition("?")
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, data, headers = api.respond({
+                "method": self.command, "path": path, "query": query,
+                "headers": dict(self.headers), "json": json.loads(body) if body else None
+            })
+            payload = b"" if data is None else json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, str(value))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PATCH = _serve
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub_api():
+    """A StubApi served on localhost; its base URL is stub_api.url."""
+    api = StubApi()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(api))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    api.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield api
+    server.shutdown()
+    server.server_close()
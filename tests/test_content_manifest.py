@@ -0,0 +1,66 @@
+import subprocess
+
+import pytest
+
+from agent.utils import cache_utils, content_manifest
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+
+
+def clone(remote, path):
+    subprocess.run(["git", "clone", "-q", str(remote), str(path)], check=True, capture_output=True)
+    return path
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """A repository with a pom.xml and a source file, plus a cache of its own."""
+    monkeypatch.setattr(cache_utils, "CACHE_ROOT", str(tmp_path / "cache"))
+    for key, value in (("NAME", "Test"), ("EMAIL", "test@example.com")):
+        monkeypatch.setenv(f"GIT_AUTHOR_{key}", value)
+        monkeypatch.setenv(f"GIT_COMMITTER_{key}", value)
+    work = tmp_path / "remote"
+    (work / "src").mkdir(parents=True)
+    (work / "pom.xml").write_text("<project/>")
+    (work / "src" / "App.java").write_text("class App {}")
+    git("init", "-q", "-b", "main", cwd=work)
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "-m", "initial", cwd=work)
+    return work
+
+
+def verified_manifest(repo_dir, branch="gradle-migration"):
+    manifest = content_manifest.load(repo_dir, branch)
+    manifest.record("root", [repo_dir / "pom.xml"], [], {})
+    manifest.mark_verified(["root"])
+    manifest.save()
+    return manifest
+
+
+def test_manifest_follows_remote_and_branch_across_workspaces(remote, tmp_path):
+    verified_manifest(clone(remote, tmp_path / "first"))
+
+    second = clone(remote, tmp_path / "second")
+    assert content_manifest.load(second, "gradle-migration").is_verified("root")
+    assert not content_manifest.load(second, "other-branch").is_verified("root")
+
+
+def test_source_change_needs_a_rebuild(remote, tmp_path):
+    verified_manifest(clone(remote, tmp_path / "first"))
+    (remote / "src" / "App.java").write_text("class App { int broken }")
+    git("commit", "-q", "-am", "change a source file", cwd=remote)
+
+    second = clone(remote, tmp_path / "second")
+    manifest = content_manifest.load(second, "gradle-migration")
+    assert manifest.is_current("root", [second / "pom.xml"], {})
+    assert not manifest.is_verified("root")
+
+
+def test_unknown_sources_are_never_verified(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, "CACHE_ROOT", str(tmp_path / "cache"))
+    (tmp_path / "src").mkdir()
+    (tmp_path / "pom.xml").write_text("<project/>")
+
+    assert not verified_manifest(tmp_path).is_verified("root")
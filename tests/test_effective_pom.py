@@ -0,0 +1,152 @@
+import pytest
+
+from agent import effective_pom, pom_model
+from agent.effective_pom import resolve_effective_pom
+
+
+def pom(artifact, body="", parent=None, relative_path=None, group="com.acme", version="1.0.0"):
+    """A minimal pom.xml; parent is (groupId, artifactId, version)."""
+    parent_xml = ""
+    if parent:
+        relative = "" if relative_path is None else f"<relativePath>{relative_path}</relativePath>"
+        parent_xml = (f"<parent><groupId>{parent[0]}</groupId><artifactId>{parent[1]}</artifactId>"
+                      f"<version>{parent[2]}</version>{relative}</parent>")
+    coordinates = f"<groupId>{group}</groupId>" if group else ""
+    coordinates += f"<artifactId>{artifact}</artifactId>"
+    coordinates += f"<version>{version}</version>" if version else ""
+    return f"""<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  {parent_xml}
+  {coordinates}
+  {body}
+</project>
+"""
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(tmp_path, monkeypatch):
+    """An empty local repository and no POMs memoized from other tests."""
+    monkeypatch.setattr(effective_pom, "M2_REPOSITORY", str(tmp_path / "m2"))
+    effective_pom.clear_cache()
+    pom_model.clear_cache()
+    yield
+    effective_pom.clear_cache()
+    pom_model.clear_cache()
+
+
+def test_property_chain_across_parent_and_child(tmp_path):
+    write(tmp_path / "pom.xml", pom("parent", """
+  <packaging>pom</packaging>
+  <properties>
+    <base.version>6.1</base.version>
+    <spring.version>${base.version}.${patch}</spring.version>
+    <patch>0</patch>
+  </properties>"""))
+    child = write(tmp_path / "core" / "pom.xml", pom("core", """
+  <properties>
+    <patch>5</patch>
+  </properties>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework</groupId>
+      <artifactId>spring-core</artifactId>
+      <version>${spring.version}</version>
+    </dependency>
+  </dependencies>""", parent=("com.acme", "parent", "1.0.0"), group=None, version=None))
+
+    effective = resolve_effective_pom(child)
+
+    # The parent's property is interpolated against the child's override
+    assert effective.properties["spring.version"] == "6.1.5"
+    assert effective.dependencies == [("org.springframework", "spring-core", "6.1.5", None)]
+    assert (effective.group_id, effective.version) == ("com.acme", "1.0.0")
+    assert effective.parent_chain == [str(tmp_path / "pom.xml")]
+
+
+def test_property_cycle_is_left_unresolved(tmp_path):
+    path = write(tmp_path / "pom.xml", pom("app", """
+  <properties>
+    <a>${b}</a>
+    <b>${a}</b>
+    <c>plain-${a}</c>
+    <d>fine</d>
+  </properties>"""))
+
+    effective = resolve_effective_pom(path)
+
+    assert effective.properties["a"] == "${b}"
+    assert effective.properties["b"] == "${a}"
+    assert effective.properties["c"] == "plain-${a}"
+    assert effective.properties["d"] == "fine"
+
+
+def test_managed_version_inherited_from_parent(tmp_path):
+    write(tmp_path / "pom.xml", pom("parent", """
+  <packaging>pom</packaging>
+  <properties>
+    <guava.version>33.0.0-jre</guava.version>
+  </properties>
+  <dependencyManagement>
+    <dependencies>
+      <dependency>
+        <groupId>com.google.guava</groupId>
+        <artifactId>guava</artifactId>
+        <version>${guava.version}</version>
+      </dependency>
+    </dependencies>
+  </dependencyManagement>"""))
+    child = write(tmp_path / "app" / "pom.xml", pom("app", """
+  <dependencies>
+    <dependency>
+      <groupId>com.google.guava</groupId>
+      <artifactId>guava</artifactId>
+    </dependency>
+  </dependencies>""", parent=("com.acme", "parent", "1.0.0"), version=None))
+
+    effective = resolve_effective_pom(child)
+
+    assert effective.dependency_management == {"com.google.guava:guava": "33.0.0-jre"}
+    assert effective.dependencies == [("com.google.guava", "guava", "33.0.0-jre", None)]
+
+
+def test_parent_from_relative_path(tmp_path):
+    write(tmp_path / "build" / "parent" / "pom.xml", pom("parent", """
+  <properties><from>relativePath</from></properties>"""))
+    write(tmp_path / "m2" / "com" / "acme" / "parent" / "1.0.0" / "parent-1.0.0.pom", pom("parent", """
+  <properties><from>m2</from></properties>"""))
+    child = write(tmp_path / "app" / "pom.xml", pom("app", parent=("com.acme", "parent", "1.0.0"),
+                                                    relative_path="../build/parent"))
+
+    assert resolve_effective_pom(child).properties["from"] == "relativePath"
+
+
+def test_parent_from_local_repository(tmp_path):
+    installed = write(tmp_path / "m2" / "com" / "acme" / "parent" / "1.0.0" / "parent-1.0.0.pom",
+                      pom("parent", "<properties><from>m2</from></properties>"))
+    # ../pom.xml is another project's POM, so Maven falls back to the local repository
+    write(tmp_path / "pom.xml", pom("unrelated", "<properties><from>unrelated</from></properties>"))
+    child = write(tmp_path / "app" / "pom.xml", pom("app", parent=("com.acme", "parent", "1.0.0")))
+    # An empty <relativePath/> skips the filesystem lookup, even of a matching ../pom.xml
+    write(tmp_path / "libs" / "pom.xml", pom("parent", "<properties><from>libs</from></properties>"))
+    pinned = write(tmp_path / "libs" / "lib" / "pom.xml",
+                   pom("lib", parent=("com.acme", "parent", "1.0.0"), relative_path=""))
+
+    for path in (child, pinned):
+        effective = resolve_effective_pom(path)
+        assert effective.properties["from"] == "m2"
+        assert effective.parent_chain == [installed]
+
+
+def test_missing_parent_is_skipped(tmp_path):
+    child = write(tmp_path / "app" / "pom.xml", pom("app", parent=("com.acme", "absent", "1.0.0")))
+
+    effective = resolve_effective_pom(child)
+
+    assert effective.parent_chain == []
+    assert (effective.group_id, effective.artifact_id) == ("com.acme", "app")
@@ -0,0 +1,160 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+from agent import fleet
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>com.acme</groupId>
+  <artifactId>{name}</artifactId>
+  <version>1.0.0</version>
+  <dependencies>
+    <dependency>
+      <groupId>com.google.guava</groupId>
+      <artifactId>guava</artifactId>
+      <version>33.0.0-jre</version>
+    </dependency>
+  </dependencies>
+</project>
+"""
+# Stands in for Gradle: logs when each build starts and ends, and fails until the
+# (stubbed) LLM fix has marked build.gradle when REQUIRE_FIX is set
+GRADLEW = """#!/bin/sh
+echo "start $(date +%s%N)" >> "$FLEET_TEST_BUILDS"
+sleep 0.2
+echo "end $(date +%s%N)" >> "$FLEET_TEST_BUILDS"
+if [ -n "{require_fix}" ] && ! grep -q "fixed by stub" build.gradle; then
+    echo "FAILURE: Build failed with an exception."
+    echo "* What went wrong:"
+    echo "Execution failed for task ':compileJava'."
+    exit 1
+fi
+echo "BUILD SUCCESSFUL"
+"""
+FIXED_BUILD = "plugins {\n    id 'java'\n}\n\n// fixed by stub\n"
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+
+
+def make_bare_repo(root, name, require_fix=False):
+    """A bare repository holding a Maven project and a stub gradlew, like a GitHub remote."""
+    work = root / f"{name}-work"
+    work.mkdir()
+    (work / "pom.xml").write_text(POM.format(name=name))
+    gradlew = work / "gradlew"
+    gradlew.write_text(GRADLEW.replace("{require_fix}", "1" if require_fix else ""))
+    gradlew.chmod(0o755)
+    git("init", "-q", "-b", "main", cwd=work)
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "-m", "Maven project", cwd=work)
+    bare = root / f"{name}.git"
+    git("clone", "-q", "--bare", str(work), str(bare))
+    return str(bare)
+
+
+@pytest.fixture
+def fleet_env(tmp_path, stub_api, monkeypatch):
+    """Environment the spawned fleet workers inherit: local caches, stub GitHub and OpenAI."""
+    for key in ("NAME", "EMAIL"):
+        monkeypatch.setenv(f"GIT_AUTHOR_{key}", "Fleet Test" if key == "NAME" else "fleet@example.com")
+        monkeypatch.setenv(f"GIT_COMMITTER_{key}", "Fleet Test" if key == "NAME" else "fleet@example.com")
+    monkeypatch.setenv("AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GITHUB_API_URL", stub_api.url)
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    monkeypatch.setenv("GITHUB_USERNAME", "acme-bot")
+    monkeypatch.setenv("GITHUB_REPO_FULL_NAME", "acme/env-repo")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", stub_api.url + "/v1")
+    monkeypatch.setenv("GITHUB_MUTATION_INTERVAL", "0")
+    monkeypatch.setenv("FLEET_TEST_BUILDS", str(tmp_path / "builds.log"))
+    monkeypatch.setenv("MIGRATION_INCREMENTAL", "false")
+    return tmp_path
+
+
+def chat_completion(request):
+    return 200, {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": request["json"]["model"],
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": FIXED_BUILD}}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }, {}
+
+
+def test_manifest_full_name_from_github_url(tmp_path):
+    manifest_path = tmp_path / "fleet.json"
+    manifest_path.write_text(json.dumps([
+        "https://github.com/acme/app.git",
+        "git@github.com:acme/lib.git",
+        {"url": "https://github.com/acme/svc", "full_name": "other/svc"},
+        str(tmp_path / "local.git")
+    ]))
+
+    entries = fleet.load_manifest(str(manifest_path))
+
+    assert [e["full_name"] for e in entries] == ["acme/app", "acme/lib", "other/svc", None]
+    assert [e["name"] for e in entries] == ["app", "lib", "svc", "local"]
+
+
+def test_fleet_migrates_local_repositories(fleet_env, stub_api):
+    repos = fleet_env / "remotes"
+    repos.mkdir()
+    manifest = [
+        {"url": make_bare_repo(repos, "alpha"), "full_name": "acme/alpha"},
+        {"url": make_bare_repo(repos, "beta", require_fix=True), "full_name": "acme/beta"},
+        {"url": str(repos / "missing.git"), "full_name": "acme/missing"},
+        # URL only: no GitHub repository to open a pull request on
+        make_bare_repo(repos, "gamma")
+    ]
+    manifest_path = fleet_env / "fleet.json"
+    manifest_path.write_text(json.dumps(manifest))
+    for name in ("alpha", "beta"):
+        stub_api.route("GET", f"/repos/acme/{name}/pulls", (200, [], {}))
+        stub_api.route("POST", f"/repos/acme/{name}/pulls", (201, {"html_url": f"https://example.com/{name}/1"}, {}))
+    stub_api.routes[("POST", "/v1/chat/completions")] = chat_completion
+
+    workspace = fleet_env / "fleet"
+    summaries = fleet.run_fleet(str(manifest_path), str(workspace), jobs=3,
+                                limits={"clone": 1, "build": 1, "llm": 1})
+
+    assert [s["name"] for s in summaries] == ["alpha", "beta", "missing", "gamma"]
+    on_disk = {}
+    for name in ("alpha", "beta", "missing", "gamma"):
+        with open(workspace / name / fleet.SUMMARY_FILE, encoding="utf-8") as f:
+            on_disk[name] = json.load(f)
+    alpha, beta, missing, gamma = on_disk["alpha"], on_disk["beta"], on_disk["missing"], on_disk["gamma"]
+
+    assert alpha["success"] and alpha["error"] is None
+    assert [a["success"] for a in alpha["gradle_attempts"]] == [True]
+    assert alpha["llm_cache"]["misses"] == 0
+    assert {"clone", "build"} <= {stage["name"] for stage in alpha["stages"]}
+
+    # beta fails its first build, gets the stubbed LLM fix, and passes the rebuild
+    assert beta["success"], open(beta["log"], encoding="utf-8").read()
+    assert [a["success"] for a in beta["gradle_attempts"]][-1] is True
+    assert beta["llm_cache"]["misses"] == 1 and beta["llm_cache"]["stores"] == 1
+    assert len(stub_api.calls("POST", "/v1/chat/completions")) == 1
+
+    assert not missing["success"] and missing["error"]
+    assert os.path.exists(missing["log"])
+
+    assert gamma["success"] and gamma["full_name"] is None
+
+    # One PR per repository with a full_name, created through the stub API; the
+    # head owner comes from full_name, and none goes to the .env repository
+    assert len(stub_api.calls("POST", "/repos/acme/alpha/pulls")) == 1
+    assert stub_api.calls("POST", "/repos/acme/beta/pulls")[0]["json"]["head"] == "gradle-migration"
+    assert "head=acme%3Agradle-migration" in stub_api.calls("GET", "/repos/acme/alpha/pulls")[0]["query"]
+    assert {r["path"] for r in stub_api.requests if r["path"].startswith("/repos/")} == {
+        f"/repos/acme/{name}/pulls" for name in ("alpha", "beta")}
+    with open(workspace / "fleet_summary.json", encoding="utf-8") as f:
+        assert [s["success"] for s in json.load(f)] == [True, True, False, True]
+
+    # The build limit of 1 kept the repositories' Gradle runs from overlapping
+    with open(fleet_env / "builds.log", encoding="utf-8") as f:
+        events = [line.split()[0] for line in f if line.strip()]
+    assert events == ["start", "end"] * (len(events) // 2)
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+
+from agent import github_client
+from agent.github_client import GitHubClient
+
+PULLS = "/repos/acme/app/pulls"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records the client's waits instead of sleeping through them."""
+    waits = []
+    monkeypatch.setattr(github_client.time, "sleep", waits.append)
+    return waits
+
+
+def make_client(stub_api, **kwargs):
+    kwargs.setdefault("mutation_interval", 0)
+    return GitHubClient(token="test-token", base_url=stub_api.url, **kwargs)
+
+
+def test_base_url_from_environment(stub_api, monkeypatch):
+    monkeypatch.setenv("GITHUB_API_URL", stub_api.url + "/")
+    stub_api.route("GET", PULLS, (200, [], {}))
+
+    response = GitHubClient(token="test-token").list_pull_requests("acme/app", head="me:branch")
+
+    assert response.ok and response.data == []
+    request = stub_api.calls("GET", PULLS)[0]
+    assert request["headers"]["Authorization"] == "Bearer test-token"
+    assert "head=me%3Abranch" in request["query"]
+
+
+def test_etag_304_reuses_cached_body(stub_api, sleeps):
+    prs = [{"html_url": "https://github.com/acme/app/pull/1"}]
+
+    def pulls(request):
+        if request["headers"].get("If-None-Match") == '"v1"':
+            return 304, None, {"ETag": '"v1"'}
+        return 200, prs, {"ETag": '"v1"'}
+
+    stub_api.routes[("GET", PULLS)] = pulls
+    client = make_client(stub_api)
+
+    first = client.list_pull_requests("acme/app")
+    second = client.list_pull_requests("acme/app")
+
+    assert not first.from_cache and first.data == prs
+    assert second.from_cache and second.status_code == 200 and second.data == prs
+    calls = stub_api.calls("GET", PULLS)
+    assert "If-None-Match" not in calls[0]["headers"]
+    assert calls[1]["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_retry_after_is_honoured(stub_api, sleeps):
+    stub_api.route("POST", PULLS,
+                   (403, {"message": "You have exceeded a secondary rate limit"}, {"Retry-After": "7"}),
+                   (201, {"html_url": "https://github.com/acme/app/pull/2"}, {}))
+
+    response = make_client(stub_api).create_pull_request("acme/app", "feature", "main", "Title", "Body")
+
+    assert response.status_code == 201
+    assert sleeps == [7.0]
+    assert len(stub_api.calls("POST", PULLS)) == 2
+
+
+def test_rate_limit_reset_is_waited_for(stub_api, sleeps):
+    reset = int(time.time()) + 30
+    stub_api.route("GET", PULLS,
+                   (403, {"message": "API rate limit exceeded"},
+                    {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}),
+                   (200, [], {}))
+
+    response = make_client(stub_api).list_pull_requests("acme/app")
+
+    assert response.status_code == 200
+    assert len(sleeps) == 1 and 28 <= sleeps[0] <= 32
+
+
+def test_rate_limit_reset_beyond_max_wait_gives_up(stub_api, sleeps, monkeypatch):
+    monkeypatch.setattr(github_client, "MAX_WAIT", 60)
+    stub_api.route("GET", PULLS,
+                   (403, {"message": "API rate limit exceeded"},
+                    {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)}))
+
+    response = make_client(stub_api).list_pull_requests("acme/app")
+
+    assert response.status_code == 403
+    assert sleeps == []
+
+
+def test_server_errors_are_retried_with_backoff(stub_api, sleeps):
+    stub_api.route("GET", PULLS, (502, None, {}), (503, None, {}), (200, [], {}))
+
+    response = make_client(stub_api).list_pull_requests("acme/app")
+
+    assert response.status_code == 200
+    assert len(stub_api.calls("GET", PULLS)) == 3
+    assert len(sleeps) == 2 and 1 <= sleeps[0] < 2 and 2 <= sleeps[1] < 3
+
+
+def test_server_errors_stop_after_max_retries(stub_api, sleeps):
+    stub_api.route("GET", PULLS, (500, {"message": "boom"}, {}))
+
+    response = make_client(stub_api, max_retries=2).list_pull_requests("acme/app")
+
+    assert response.status_code == 500 and not response.ok
+    assert len(stub_api.calls("GET", PULLS)) == 3
+
+
+def test_create_pull_requests_in_order_and_spaced(stub_api, sleeps):
+    stub_api.route("POST", "/repos/acme/one/pulls", (201, {"number": 1}, {}))
+    stub_api.route("POST", "/repos/acme/two/pulls", (422, {"message": "A pull request already exists"}, {}))
+    stub_api.route("POST", "/repos/acme/three/pulls", (201, {"number": 3}, {}))
+    specs = [{"repo_full_name": f"acme/{name}", "head": "gradle-migration", "base": "main",
+              "title": "Migrate to Gradle", "body": "Automated migration."} for name in ("one", "two", "three")]
+
+    results = make_client(stub_api, mutation_interval=10).create_pull_requests(specs)
+
+    assert [r.status_code for r in results] == [201, 422, 201]
+    assert [r["path"] for r in stub_api.requests] == [f"/repos/acme/{n}/pulls" for n in ("one", "two", "three")]
+    assert stub_api.requests[0]["json"]["head"] == "gradle-migration"
+    # Mutations after the first wait out the interval (sleep is recorded, not slept)
+    assert len(sleeps) == 2 and all(9 < wait <= 10 for wait in sleeps)
+
+
+def test_create_pull_requests_records_exceptions(stub_api, sleeps):
+    stub_api.route("POST", "/repos/acme/one/pulls", (201, {"number": 1}, {}))
+    specs = [{"repo_full_name": "acme/one", "head": "b", "base": "main", "title": "t", "body": ""},
+             {"repo_full_name": "acme/two", "head": "b", "base": "main", "title": "t"}]
+
+    results = make_client(stub_api).create_pull_requests(specs)
+
+    assert results[0].status_code == 201
+    assert isinstance(results[1], TypeError)
@@ -0,0 +1,68 @@
+import subprocess
+import threading
+
+import pytest
+
+from agent import git_handler, speculative
+from agent.utils import concurrency
+
+# Stands in for Gradle: logs when each build starts and ends, and passes only for
+# the build file that says so
+GRADLEW = """#!/bin/sh
+echo start >> "$SPECULATIVE_TEST_BUILDS"
+sleep 0.3
+echo end >> "$SPECULATIVE_TEST_BUILDS"
+grep -q "passes" build.gradle
+"""
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for key, value in (("NAME", "Test"), ("EMAIL", "test@example.com")):
+        monkeypatch.setenv(f"GIT_AUTHOR_{key}", value)
+        monkeypatch.setenv(f"GIT_COMMITTER_{key}", value)
+    monkeypatch.setenv("SPECULATIVE_TEST_BUILDS", str(tmp_path / "builds.log"))
+    monkeypatch.setattr(speculative, "POLL_INTERVAL", 0.05)
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    (repo_dir / "build.gradle").write_text("// fails\n")
+    (repo_dir / "gradlew").write_text(GRADLEW)
+    (repo_dir / "gradlew").chmod(0o755)
+    for args in (["init", "-q", "-b", "main"], ["add", "-A"], ["commit", "-q", "-m", "initial"]):
+        subprocess.run(["git", *args], cwd=repo_dir, check=True, capture_output=True)
+    yield repo_dir
+    concurrency.configure_limits({})
+
+
+def build_events(tmp_path):
+    return (tmp_path / "builds.log").read_text().split()
+
+
+def test_candidate_without_worktree_fails_alone(repo, monkeypatch):
+    add_worktree = git_handler.add_worktree
+
+    def flaky_add_worktree(repo_path, worktree_path, ref="HEAD"):
+        if worktree_path.endswith("candidate-0"):
+            raise OSError("No space left on device")
+        return add_worktree(repo_path, worktree_path, ref)
+
+    monkeypatch.setattr(git_handler, "add_worktree", flaky_add_worktree)
+
+    winner, candidates = speculative.verify_candidates(str(repo), ["// passes", "// passes too"], mode="fast")
+
+    assert winner is candidates[1]
+    assert candidates[0].error == "OSError: No space left on device"
+
+
+def test_each_running_candidate_holds_a_fleet_build_slot(repo, tmp_path, monkeypatch):
+    slots = threading.Semaphore(1)
+    concurrency.configure_limits({"build": slots})
+    monkeypatch.setattr(speculative, "build_budget", lambda candidates: candidates)
+
+    winner, candidates = speculative.verify_candidates(str(repo), ["// fails", "// fails", "// passes"],
+                                                       mode="fast")
+
+    assert winner is candidates[2]
+    assert build_events(tmp_path) == ["start", "end"] * 3
+    # Every slot was given back
+    assert slots.acquire(blocking=False)